@@ -3,8 +3,8 @@ from .models import *
 
 @admin.register(PincodeMapping)
 class PincodeMappingAdmin(admin.ModelAdmin):
-    list_display = ('main_pincode', 'nearby_pincode', 'created_at')
-    list_filter = ('main_pincode', 'created_at')
+    list_display = ('main_pincode', 'nearby_pincode', 'radius_km', 'distance_km', 'created_at')
+    list_filter = ('radius_km', 'created_at')
     search_fields = ('main_pincode', 'nearby_pincode')
     ordering = ('main_pincode', 'nearby_pincode')
 
@@ -37,4 +37,22 @@ class AdminBrandAdmin(admin.ModelAdmin):
 @admin.register(AdminModel)
 class AdminModelAdmin(admin.ModelAdmin):
     list_display = ('name', 'brand', 'created_at')
-    list_filter = ('brand__category__group',)
\ No newline at end of file
+    list_filter = ('brand__category__group',)
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'locked_by', 'created_at')
+    list_filter = ('name', 'status')
+    ordering = ('run_after',)
+
+@admin.register(DeadJob)
+class DeadJobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'attempts', 'queued_at', 'failed_at')
+    list_filter = ('name',)
+    search_fields = ('error',)
+    ordering = ('-failed_at',)
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'refs', 'updated_at')
+    search_fields = ('name', 'sha256')
+    ordering = ('-updated_at',)
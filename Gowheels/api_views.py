@@ -1,12 +1,17 @@
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from .models import Vehicle, UserProfile
+from .pagination import CursorPaginator, InvalidCursor
 import json
 
 @csrf_exempt
 def api_vehicles(request):
     if request.method == 'GET':
-        vehicles = Vehicle.objects.all().values()
-        return JsonResponse({'vehicles': list(vehicles)})
+        try:
+            page = CursorPaginator(request).paginate(Vehicle.objects.all().values())
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse({'vehicles': page.items, **page.meta()})
     
     elif request.method == 'POST':
         data = json.loads(request.body)
@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 class GowheelsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'gowheels'
\ No newline at end of file
+    name = 'gowheels'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from . import media_jobs  # noqa: F401  registers the media job handlers
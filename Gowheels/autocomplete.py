@@ -0,0 +1,386 @@
+"""
+Catalog autocomplete for GoWheels
+In-memory prefix tries over category, brand and model names, drawn from
+the admin catalog (AdminCategory/AdminBrand/AdminModel) and from the
+names used by approved listings.
+
+Every trie node keeps its own top-k suggestions, so a lookup walks
+len(prefix) nodes and returns a ready list - no subtree search. Catalog
+admin writes and vehicle saves are applied to this process's tries in
+place by signal receivers. Other workers check the shared cache versions
+at most once per REFRESH_INTERVAL: a catalog change rebuilds at once,
+while vehicle changes only refresh listing counts, so that rebuild runs
+in a background thread and requests keep reading the current index.
+"""
+
+import heapq
+import logging
+import threading
+import time
+
+from django.db import connection
+from django.db.models import Count
+
+from .cache import CATALOG, VEHICLES
+from .models import AdminCategory, AdminBrand, AdminModel, Vehicle
+
+logger = logging.getLogger('gowheels.autocomplete')
+
+KINDS = ('category', 'brand', 'model')
+
+# Vehicle fields that decide which entries a listing counts towards
+LISTING_FIELDS = ('category_name', 'brand_name', 'model_name', 'approval_status', 'available')
+
+# Suggestions stored per trie node; also the largest k a client may ask for
+MAX_SUGGESTIONS = 10
+
+# Seconds between checks of the shared cache versions
+REFRESH_INTERVAL = 30
+
+
+def normalize(text):
+    """Lower-case and collapse whitespace"""
+    return ' '.join(str(text or '').lower().split())
+
+
+def _keys(name):
+    """Index a name under every word start, so "alt" finds "Corolla Altis" """
+    words = normalize(name).split(' ')
+    return {' '.join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+class _Node:
+    __slots__ = ('children', 'entries', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = set()
+        self.top = []
+
+
+class PrefixTrie:
+    """
+    Character trie with cached top-k entry ids per node
+
+    Entries are ranked by rank(entry_id), smallest first; the owner
+    supplies the ranking and must remove/re-insert an entry whose rank
+    changes.
+    """
+
+    def __init__(self, rank, k=MAX_SUGGESTIONS):
+        self.rank = rank
+        self.k = k
+        self.root = _Node()
+
+    def _path(self, key, create=False):
+        nodes = [self.root]
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = _Node()
+            nodes.append(child)
+            node = child
+        return nodes
+
+    def insert(self, entry_id, key):
+        path = self._path(key, create=True)
+        path[-1].entries.add(entry_id)
+        rank = self.rank(entry_id)
+        for node in path:
+            if entry_id in node.top:
+                continue
+            if len(node.top) < self.k or rank < self.rank(node.top[-1]):
+                node.top.append(entry_id)
+                node.top.sort(key=self.rank)
+                del node.top[self.k:]
+
+    def remove(self, entry_id, key):
+        path = self._path(key)
+        if path is None:
+            return
+        path[-1].entries.discard(entry_id)
+        # Bottom-up so each parent merges its children's corrected lists
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            if entry_id in node.top:
+                candidates = set(node.entries)
+                for child in node.children.values():
+                    candidates.update(child.top)
+                node.top = heapq.nsmallest(self.k, candidates, key=self.rank)
+            if depth and not node.entries and not node.children:
+                del path[depth - 1].children[key[depth - 1]]
+
+    def top(self, prefix, k=None):
+        path = self._path(prefix)
+        if path is None:
+            return []
+        return path[-1].top[:k or self.k]
+
+
+class AutocompleteIndex:
+    """
+    One trie per kind plus the suggestion data behind each entry
+
+    An entry is identified by (kind, parent, name) in normalized form, so
+    "Toyota" under "Car" is one entry however many catalog rows and
+    listings use it. Categories have no parent. An entry stays indexed
+    while anything references it.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.catalog_rows = {}
+        self.tries = {kind: PrefixTrie(self._rank) for kind in KINDS}
+
+    def _rank(self, entry_id):
+        entry = self.entries[entry_id]
+        return (-(entry['listings'] + entry['catalog']), entry['key'], entry_id)
+
+    def _change(self, kind, name, parent, catalog=0, listings=0):
+        key = normalize(name)
+        if not key:
+            return None
+        if kind == 'category':
+            parent = ''
+        entry_id = (kind, normalize(parent), key)
+        entry = self.entries.get(entry_id)
+        trie = self.tries[kind]
+        if entry is not None:
+            for index_key in _keys(entry['name']):
+                trie.remove(entry_id, index_key)
+        else:
+            entry = self.entries[entry_id] = {
+                'name': name, 'parent': parent, 'key': key, 'catalog': 0, 'listings': 0,
+            }
+        entry['catalog'] += catalog
+        entry['listings'] += listings
+        if catalog > 0:
+            # Admin spelling wins over whatever sellers typed
+            entry['name'], entry['parent'] = name, parent
+
+        if entry['catalog'] <= 0 and entry['listings'] <= 0:
+            del self.entries[entry_id]
+            return None
+        for index_key in _keys(entry['name']):
+            trie.insert(entry_id, index_key)
+        return entry_id
+
+    def add_catalog_row(self, row_key, kind, name, parent):
+        """Index one admin catalog row; row_key identifies it for removal"""
+        self.remove_catalog_row(row_key)
+        if self._change(kind, name, parent, catalog=1):
+            self.catalog_rows[row_key] = (kind, name, parent)
+
+    def remove_catalog_row(self, row_key):
+        row = self.catalog_rows.pop(row_key, None)
+        if row is not None:
+            self._change(*row, catalog=-1)
+
+    def add_listings(self, kind, name, parent, count):
+        self._change(kind, name, parent, listings=count)
+
+    def add_listing(self, listing, count=1):
+        """Count a (category, brand, model) listing; count=-1 takes it back"""
+        if listing is None:
+            return
+        category, brand, model = listing
+        self.add_listings('category', category, '', count)
+        self.add_listings('brand', brand, category, count)
+        self.add_listings('model', model, brand, count)
+
+    def suggest(self, prefix, kind=None, k=MAX_SUGGESTIONS):
+        """Top-k suggestions for prefix, optionally of one kind"""
+        prefix = normalize(prefix)
+        k = max(1, min(k, MAX_SUGGESTIONS))
+        if kind is not None:
+            ids = self.tries[kind].top(prefix, k)
+        else:
+            ids = heapq.nsmallest(
+                k, (entry_id for trie in self.tries.values() for entry_id in trie.top(prefix, k)),
+                key=self._rank,
+            )
+        suggestions = []
+        for entry_id in ids:
+            entry = self.entries[entry_id]
+            suggestions.append({
+                'text': entry['name'],
+                'type': entry_id[0],
+                'parent': entry['parent'],
+                'listings': entry['listings'],
+            })
+        return suggestions
+
+
+def build_index():
+    """Full build: three catalog queries and one grouped listing query"""
+    index = AutocompleteIndex()
+
+    for pk, name in AdminCategory.objects.values_list('id', 'name'):
+        index.add_catalog_row(('category', pk), 'category', name, '')
+    for pk, name, category in AdminBrand.objects.values_list('id', 'name', 'category__name'):
+        index.add_catalog_row(('brand', pk), 'brand', name, category)
+    for pk, name, brand in AdminModel.objects.values_list('id', 'name', 'brand__name'):
+        index.add_catalog_row(('model', pk), 'model', name, brand)
+
+    listings = (
+        Vehicle.objects.filter(approval_status='approved', available=True)
+        .values_list('category_name', 'brand_name', 'model_name')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for category, brand, model, count in listings:
+        index.add_listing((category, brand, model), count)
+    return index
+
+
+def listing_of(values):
+    """(category, brand, model) a vehicle counts towards, None while it is not listed"""
+    if values['approval_status'] != 'approved' or not values['available']:
+        return None
+    return (values['category_name'], values['brand_name'], values['model_name'])
+
+
+class _IndexHolder:
+    """
+    Process-wide index
+
+    Keyed on the catalog version: a catalog change in another worker
+    rebuilds before answering. A moved vehicle version only starts a
+    background refresh of the listing counts.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.index = None
+        self.catalog_version = None
+        self.vehicles_version = None
+        self.checked_at = 0.0
+        self.refreshing = False
+
+    def get(self):
+        now = time.monotonic()
+        with self.lock:
+            if self.index is not None and now - self.checked_at < REFRESH_INTERVAL:
+                return self.index
+            self.checked_at = now
+            catalog_version = CATALOG.version()
+            if self.index is None or catalog_version != self.catalog_version:
+                vehicles_version = VEHICLES.version()
+                self.index = build_index()
+                self.catalog_version, self.vehicles_version = catalog_version, vehicles_version
+            elif VEHICLES.version() != self.vehicles_version and not self.refreshing:
+                self.refreshing = True
+                self.start_refresh()
+            return self.index
+
+    def start_refresh(self):
+        def run():
+            try:
+                self.refresh()
+            finally:
+                connection.close()
+
+        threading.Thread(target=run, name='autocomplete-refresh', daemon=True).start()
+
+    def refresh(self):
+        """Rebuild off the request path and swap in, unless the catalog moved meanwhile"""
+        try:
+            catalog_version, vehicles_version = CATALOG.version(), VEHICLES.version()
+            index = build_index()
+            with self.lock:
+                if self.index is not None and catalog_version == self.catalog_version:
+                    self.index = index
+                    self.vehicles_version = vehicles_version
+        except Exception:
+            logger.exception('Autocomplete refresh failed')
+        finally:
+            with self.lock:
+                self.refreshing = False
+
+    def apply(self, change):
+        """Run change(index) on the live index, if one is built"""
+        with self.lock:
+            if self.index is None:
+                return
+            change(self.index)
+            self.catalog_version, self.vehicles_version = CATALOG.version(), VEHICLES.version()
+
+    def invalidate(self):
+        with self.lock:
+            self.index = None
+
+
+_holder = _IndexHolder()
+
+
+def get_index():
+    return _holder.get()
+
+
+def suggest(prefix, kind=None, k=MAX_SUGGESTIONS):
+    with _holder.lock:
+        return get_index().suggest(prefix, kind, k)
+
+
+def catalog_row_saved(kind, instance, parent_name, created):
+    """
+    Signal hook for catalog writes
+
+    New rows are added in place. Edits may rename a parent that child
+    entries display, so they drop the index for a full rebuild instead.
+    """
+    if not created:
+        _holder.invalidate()
+        return
+    _holder.apply(lambda index: index.add_catalog_row((kind, instance.pk), kind, instance.name, parent_name))
+
+
+def catalog_row_deleted(kind, instance):
+    _holder.apply(lambda index: index.remove_catalog_row((kind, instance.pk)))
+
+
+_NOT_TRACKED = object()
+
+
+def vehicle_saving(instance, update_fields=None):
+    """
+    pre_save hook: remember what the stored row counts towards
+
+    Skipped while no index is built (the next build reads the database)
+    and for saves that touch none of LISTING_FIELDS.
+    """
+    instance._autocomplete_listing = _NOT_TRACKED
+    if _holder.index is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(LISTING_FIELDS):
+        return
+    previous = None
+    if instance.pk is not None and not instance._state.adding:
+        row = Vehicle.objects.filter(pk=instance.pk).values(*LISTING_FIELDS).first()
+        previous = listing_of(row) if row else None
+    instance._autocomplete_listing = previous
+
+
+def vehicle_saved(instance):
+    """post_save hook: move one listing count from the old entries to the new ones"""
+    previous = getattr(instance, '_autocomplete_listing', _NOT_TRACKED)
+    if previous is _NOT_TRACKED:
+        return
+    current = listing_of({field: getattr(instance, field) for field in LISTING_FIELDS})
+    if current == previous:
+        return
+
+    def change(index):
+        index.add_listing(previous, -1)
+        index.add_listing(current)
+
+    _holder.apply(change)
+
+
+def vehicle_deleted(instance):
+    listing = listing_of({field: getattr(instance, field) for field in LISTING_FIELDS})
+    if listing is not None:
+        _holder.apply(lambda index: index.add_listing(listing, -1))
@@ -0,0 +1,109 @@
+"""
+Caching helpers for GoWheels
+Namespaced, versioned keys on top of Django's cache framework plus a
+cache_response decorator for read-only JSON endpoints.
+
+Every key lives under a namespace ("vehicles", "media", "catalog", ...).
+Each namespace has its own version counter in the cache; bumping it makes
+every key written under the old version unreachable, so a model signal can
+invalidate a whole family of cached responses in one O(1) write. With the
+shared Redis backend (CACHE_BACKEND=redis) the bump is seen by every
+gunicorn worker at once.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import caches
+from django.http import HttpResponse
+
+
+class CacheNamespace:
+    """A group of cache keys that can be invalidated together"""
+
+    def __init__(self, name, alias='default'):
+        self.name = name
+        self.alias = alias
+        self.version_key = f"ns:{name}:version"
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def version(self):
+        """Current version; seeded from the clock so evictions never reuse an old number"""
+        version = self.cache.get(self.version_key)
+        if version is None:
+            self.cache.add(self.version_key, int(time.time() * 1000), None)
+            version = self.cache.get(self.version_key, int(time.time() * 1000))
+        return version
+
+    def bump(self, **kwargs):
+        """Invalidate every key in the namespace; safe to use as a signal receiver"""
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            self.cache.set(self.version_key, int(time.time() * 1000), None)
+
+    def key(self, *parts):
+        """Build a key scoped to the namespace's current version"""
+        suffix = ':'.join(str(part) for part in parts)
+        return f"{self.name}:v{self.version()}:{suffix}"
+
+    def get(self, key, default=None):
+        return self.cache.get(key, default)
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, timeout)
+
+
+VEHICLES = CacheNamespace('vehicles')
+MEDIA = CacheNamespace('media')
+CATALOG = CacheNamespace('catalog')
+PINCODES = CacheNamespace('pincodes')
+
+
+def _query_signature(request, vary_on):
+    """Stable digest of the query params the response depends on"""
+    if vary_on is None:
+        items = sorted(request.GET.lists())
+    else:
+        items = [(name, request.GET.getlist(name)) for name in sorted(vary_on) if name in request.GET]
+    raw = '&'.join(f"{name}={','.join(values)}" for name, values in items)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def cache_response(namespace, timeout=60, vary_on=None):
+    """
+    Cache successful GET responses of a view under a namespace
+
+    Args:
+        namespace: CacheNamespace whose bump() invalidates these responses
+        timeout: seconds a cached response may be served
+        vary_on: query param names that change the response; None means
+                 all of them. Params outside the list share one entry.
+
+    Responses carry X-Cache: HIT or MISS. Only 200 responses are stored.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            key = namespace.key(request.path, _query_signature(request, vary_on))
+            cached = namespace.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not getattr(response, 'streaming', False):
+                namespace.set(key, (response.content, response['Content-Type']), timeout)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
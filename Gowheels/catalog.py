@@ -0,0 +1,95 @@
+"""
+Catalog tree for GoWheels
+Builds the AdminGroup > AdminCategory > AdminBrand > AdminModel hierarchy
+with one flat query per table and caches the serialized JSON under a
+version number that every catalog write bumps.
+"""
+
+import json
+from collections import defaultdict
+
+from .cache import CATALOG
+from .models import AdminGroup, AdminCategory, AdminBrand, AdminModel
+
+# Upper bound on staleness if a version bump is lost (e.g. per-process cache)
+CATALOG_CACHE_TIMEOUT = 300
+
+
+def _image_url(image):
+    return f'/media/{image}' if image else ''
+
+
+def build_catalog_tree():
+    """
+    Assemble the nested catalog in memory from four flat queries
+
+    Returns the same structure get_all_admin_data has always served:
+        categories: {group: [{name, image}]}
+        brands:     {"group_category": [{name, image}]}
+        models:     {"group_category_brand": [{name, image}]}
+    """
+    groups = list(AdminGroup.objects.order_by('id').values_list('id', 'name'))
+
+    categories_by_group = defaultdict(list)
+    for row in AdminCategory.objects.order_by('id').values_list('id', 'name', 'image', 'group_id'):
+        categories_by_group[row[3]].append(row)
+
+    brands_by_category = defaultdict(list)
+    for row in AdminBrand.objects.order_by('id').values_list('id', 'name', 'image', 'category_id'):
+        brands_by_category[row[3]].append(row)
+
+    models_by_brand = defaultdict(list)
+    for row in AdminModel.objects.order_by('id').values_list('name', 'image', 'brand_id'):
+        models_by_brand[row[2]].append(row)
+
+    categories = {}
+    brands = {}
+    models = {}
+
+    for group_id, group_name in groups:
+        categories[group_name] = []
+        for category_id, category_name, category_image, _ in categories_by_group[group_id]:
+            categories[group_name].append({
+                'name': category_name,
+                'image': _image_url(category_image)
+            })
+
+            brand_key = f"{group_name}_{category_name}"
+            brands[brand_key] = []
+            for brand_id, brand_name, brand_image, _ in brands_by_category[category_id]:
+                brands[brand_key].append({
+                    'name': brand_name,
+                    'image': _image_url(brand_image)
+                })
+
+                model_key = f"{group_name}_{category_name}_{brand_name}"
+                models[model_key] = [{
+                    'name': model_name,
+                    'image': _image_url(model_image)
+                } for model_name, model_image, _ in models_by_brand[brand_id]]
+
+    return {
+        'categories': categories,
+        'brands': brands,
+        'models': models
+    }
+
+
+def get_catalog_version():
+    """Current catalog version"""
+    return CATALOG.version()
+
+
+def bump_catalog_version(**kwargs):
+    """Invalidate the cached tree; safe to call from signal receivers"""
+    CATALOG.bump()
+
+
+def get_catalog_json():
+    """Serialized get_all_admin_data payload, built at most once per version"""
+    key = CATALOG.key('tree')
+    blob = CATALOG.get(key)
+    if blob is None:
+        blob = json.dumps({'success': True, **build_catalog_tree()})
+        CATALOG.set(key, blob, CATALOG_CACHE_TIMEOUT)
+    return blob
@@ -0,0 +1,169 @@
+"""
+Chat fan-out bus
+Lets a long-poll request sleep until send_message publishes a new message
+for its chat, instead of clients re-polling the database every few seconds.
+
+Backends:
+    inprocess  threading.Condition per chat; single-process servers and dev.
+               A publish in one gunicorn worker cannot wake a long-poll in
+               another, so waits are capped at CHAT_BUS_INPROCESS_MAX_WAIT
+               seconds (the old poll interval) and clients re-poll.
+    redis      Redis pub/sub + a "latest id" key; shared by every gunicorn
+               worker. Any redis-py compatible client works, so tests can
+               pass a fakeredis.FakeRedis instance.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+class MessageBus(ABC):
+    """Publish/wait interface used by chat_views"""
+
+    # Longest wait() worth making, in seconds; None means any timeout
+    max_wait = None
+
+    @abstractmethod
+    def publish(self, chat_id: int, message_id: int):
+        """Announce that message_id was stored in chat_id"""
+        pass
+
+    @abstractmethod
+    def wait(self, chat_id: int, after_id: int, timeout: float):
+        """
+        Block until a message newer than after_id is published for chat_id
+
+        Returns:
+            int: newest published message id, or None on timeout
+        """
+        pass
+
+
+class InProcessMessageBus(MessageBus):
+    """Condition-variable bus; only wakes waiters in the same process"""
+
+    def __init__(self, max_wait=None):
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._conditions = {}
+        self._waiters = {}
+
+    def publish(self, chat_id, message_id):
+        with self._lock:
+            if message_id > self._latest.get(chat_id, 0):
+                self._latest[chat_id] = message_id
+            condition = self._conditions.get(chat_id)
+            if condition is not None:
+                condition.notify_all()
+
+    def wait(self, chat_id, after_id, timeout):
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            condition = self._conditions.get(chat_id)
+            if condition is None:
+                condition = self._conditions[chat_id] = threading.Condition(self._lock)
+            self._waiters[chat_id] = self._waiters.get(chat_id, 0) + 1
+            try:
+                while True:
+                    latest = self._latest.get(chat_id, 0)
+                    if latest > after_id:
+                        return latest
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    condition.wait(remaining)
+            finally:
+                self._waiters[chat_id] -= 1
+                if not self._waiters[chat_id]:
+                    del self._waiters[chat_id]
+                    del self._conditions[chat_id]
+
+
+class RedisMessageBus(MessageBus):
+    """Redis pub/sub bus shared by all worker processes"""
+
+    KEY_PREFIX = 'gowheels:chat:'
+
+    def __init__(self, redis_client, ttl=86400):
+        self.redis = redis_client
+        self.ttl = ttl
+
+    def _key(self, chat_id):
+        return f"{self.KEY_PREFIX}{chat_id}"
+
+    def publish(self, chat_id, message_id):
+        key = self._key(chat_id)
+        pipe = self.redis.pipeline()
+        pipe.set(key, message_id, ex=self.ttl)
+        pipe.publish(key, message_id)
+        pipe.execute()
+
+    def wait(self, chat_id, after_id, timeout):
+        key = self._key(chat_id)
+        deadline = time.monotonic() + timeout
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(key)
+        try:
+            # Read the latest id only after subscribing, so a publish that
+            # lands in between is seen either here or on the channel
+            latest = int(self.redis.get(key) or 0)
+            if latest > after_id:
+                return latest
+
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                event = pubsub.get_message(timeout=remaining)
+                if event and event.get('type') == 'message':
+                    message_id = int(event['data'])
+                    if message_id > after_id:
+                        return message_id
+        finally:
+            pubsub.close()
+
+
+class MessageBusFactory:
+    """Factory for creating the configured message bus"""
+
+    @staticmethod
+    def create(backend: str, redis_url: str = '', inprocess_max_wait=None):
+        if backend == 'inprocess':
+            return InProcessMessageBus(max_wait=inprocess_max_wait or None)
+        elif backend == 'redis':
+            try:
+                import redis
+            except ImportError:
+                raise ImproperlyConfigured("CHAT_BUS_BACKEND='redis' requires the redis package")
+            return RedisMessageBus(redis.Redis.from_url(redis_url))
+        else:
+            raise ValueError(f"Unknown chat bus backend: {backend}")
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_message_bus():
+    """Return the process-wide bus configured by CHAT_BUS_BACKEND"""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = MessageBusFactory.create(
+                    getattr(settings, 'CHAT_BUS_BACKEND', 'inprocess'),
+                    getattr(settings, 'REDIS_URL', ''),
+                    getattr(settings, 'CHAT_BUS_INPROCESS_MAX_WAIT', 3),
+                )
+    return _bus
+
+
+def set_message_bus(bus):
+    """Swap the process-wide bus (tests, benchmarks)"""
+    global _bus
+    _bus = bus
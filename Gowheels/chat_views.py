@@ -2,8 +2,29 @@ from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
 from .models import Chat, Message, Vehicle
+from .chat_bus import get_message_bus
 import json
+import logging
+
+logger = logging.getLogger('gowheels.chat')
+
+# Upper bound for one long-poll; stays under proxy/gunicorn timeouts
+LONG_POLL_TIMEOUT = 25
+
+def serialize_message(msg, phone):
+    """Message as rendered by chat.html"""
+    return {
+        'id': msg.id,
+        'sender': msg.sender_phone,
+        'message': msg.message,
+        'time': msg.created_at.strftime('%H:%M'),
+        'is_mine': msg.sender_phone == phone
+    }
 
 def inbox(request):
     """Show all chats for logged-in user"""
@@ -52,20 +73,16 @@ def chat_detail(request, chat_id):
         chat.unread_seller = 0
     chat.save()
     
-    messages = chat.messages.all()
+    messages = chat.messages.order_by('id')
     
-    msg_list = [{
-        'sender': msg.sender_phone,
-        'message': msg.message,
-        'time': msg.created_at.strftime('%H:%M'),
-        'is_mine': msg.sender_phone == phone
-    } for msg in messages]
+    msg_list = [serialize_message(msg, phone) for msg in messages]
     
     return render(request, 'chat.html', {
         'chat_id': chat_id,
         'vehicle_name': f"{chat.vehicle.brand_name} {chat.vehicle.model_name}",
         'other_phone': chat.seller_phone if is_buyer else chat.buyer_phone,
-        'messages': msg_list
+        'messages': msg_list,
+        'last_message_id': msg_list[-1]['id'] if msg_list else 0
     })
 
 @csrf_exempt
@@ -106,7 +123,7 @@ def send_message(request):
         )
     
     # Create message
-    Message.objects.create(
+    message = Message.objects.create(
         chat=chat,
         sender_phone=phone,
         message=message_text
@@ -120,11 +137,23 @@ def send_message(request):
         chat.unread_buyer += 1
     chat.save()
     
+    # Wake any long-poll waiting on this chat; pollers still catch up if this fails
+    try:
+        get_message_bus().publish(chat.id, message.id)
+    except Exception as e:
+        logger.warning(f"Chat bus publish failed for chat {chat.id}: {e}")
+    
     return JsonResponse({'success': True, 'chat_id': chat.id})
 
 @csrf_exempt
 def get_messages(request, chat_id):
-    """Get new messages (for polling)"""
+    """
+    Get new messages (for polling)
+    
+    Pass ?since_id=<last id seen> (or ?since=<ISO timestamp>) to receive only
+    the delta. Responses carry an ETag on the newest message id, so a poll
+    that finds nothing new is answered with 304 before any rows are loaded.
+    """
     phone = request.session.get('phone')
     if not phone:
         return JsonResponse({'error': 'Not logged in'}, status=401)
@@ -134,13 +163,77 @@ def get_messages(request, chat_id):
     if phone not in [chat.buyer_phone, chat.seller_phone]:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    messages = chat.messages.all()
+    messages = chat.messages.order_by('id')
+    
+    since_id = request.GET.get('since_id')
+    since = request.GET.get('since')
+    try:
+        if since_id:
+            messages = messages.filter(id__gt=int(since_id))
+        elif since:
+            since_time = parse_datetime(since)
+            if since_time is None:
+                raise ValueError(since)
+            if timezone.is_naive(since_time):
+                since_time = timezone.make_aware(since_time)
+            messages = messages.filter(created_at__gt=since_time)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid since_id/since'}, status=400)
+    
+    # Newest id in the chat identifies this representation; one indexed lookup
+    latest_id = chat.messages.order_by('-id').values_list('id', flat=True).first() or 0
+    role = 'b' if phone == chat.buyer_phone else 's'
+    etag = quote_etag(f'chat-{chat.id}-{latest_id}-{role}')
+    
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is None:
+        msg_list = [serialize_message(msg, phone) for msg in messages]
+        response = JsonResponse({'messages': msg_list, 'last_id': latest_id})
+        response['ETag'] = etag
+    else:
+        response = not_modified
+    
+    # Let the browser cache the delta but revalidate it on every poll
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Cookie'])
+    return response
+
+@csrf_exempt
+def wait_messages(request, chat_id):
+    """
+    Long-poll for new messages
+    
+    Returns immediately when messages newer than ?since_id= exist; otherwise
+    blocks on the chat bus until send_message publishes one, or answers with
+    an empty list after ?timeout= seconds (max LONG_POLL_TIMEOUT).
+    """
+    phone = request.session.get('phone')
+    if not phone:
+        return JsonResponse({'error': 'Not logged in'}, status=401)
     
-    msg_list = [{
-        'sender': msg.sender_phone,
-        'message': msg.message,
-        'time': msg.created_at.strftime('%H:%M'),
-        'is_mine': msg.sender_phone == phone
-    } for msg in messages]
+    chat = get_object_or_404(Chat, id=chat_id)
+    
+    if phone not in [chat.buyer_phone, chat.seller_phone]:
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    return JsonResponse({'messages': msg_list})
+    try:
+        since_id = int(request.GET.get('since_id', 0))
+        timeout = max(0.0, min(float(request.GET.get('timeout', LONG_POLL_TIMEOUT)), LONG_POLL_TIMEOUT))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid since_id/timeout'}, status=400)
+    
+    messages = chat.messages.filter(id__gt=since_id).order_by('id')
+    msg_list = [serialize_message(msg, phone) for msg in messages]
+    
+    bus = get_message_bus()
+    if bus.max_wait is not None:
+        # The bus can't see publishes from other workers; answer early so the client re-polls
+        timeout = min(timeout, bus.max_wait)
+    if not msg_list and timeout > 0:
+        if bus.wait(chat.id, since_id, timeout) is not None:
+            msg_list = [serialize_message(msg, phone) for msg in messages.all()]
+    
+    last_id = msg_list[-1]['id'] if msg_list else since_id
+    response = JsonResponse({'messages': msg_list, 'last_id': last_id})
+    patch_cache_control(response, private=True, no_store=True)
+    return response
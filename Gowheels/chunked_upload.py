@@ -0,0 +1,210 @@
+"""
+Resumable chunked video uploads for GoWheels
+Large phone videos are sent as a series of short requests instead of one
+long multipart POST, so no request holds a worker for the whole upload
+and a dropped connection only costs the chunk in flight.
+
+Protocol (see upload_views.py):
+
+    POST   /api/uploads/videos/                   {vehicle_id, filename, size}
+           -> {upload_id, offset: 0, chunk_size}
+    PUT    /api/uploads/videos/<id>/              raw bytes, Upload-Offset: <n>
+           -> {offset, size, complete}
+    GET    /api/uploads/videos/<id>/              -> {offset, size, complete}
+    POST   /api/uploads/videos/<id>/finalize/     -> {video_id}
+    DELETE /api/uploads/videos/<id>/              abort
+
+Chunks are appended to a partial file under CHUNKED_UPLOAD_DIR, copied
+from the request stream in COPY_BUFFER_BYTES pieces. The partial file's
+size is the authoritative offset. A client resuming after a dropped
+connection asks for the offset and continues from there. Finalizing
+moves the file into storage (a rename on the same filesystem) and
+creates the VehicleVideo, whose signals queue duration/poster jobs.
+Unfinished uploads are removed by a media.expire_upload job once
+UPLOAD_EXPIRY_HOURS have passed.
+"""
+
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no advisory locks
+    fcntl = None
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.m4v', '.3gp', '.webm', '.mkv')
+
+# Bytes read from the request stream per write
+COPY_BUFFER_BYTES = 64 * 1024
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def max_upload_bytes():
+    return _setting('MAX_VIDEO_UPLOAD_BYTES', 500 * 1024 * 1024)
+
+
+def chunk_bytes():
+    """Suggested chunk size: small enough for a slow mobile link to finish well inside the worker timeout"""
+    return _setting('UPLOAD_CHUNK_BYTES', 1024 * 1024)
+
+
+def max_chunk_bytes():
+    return _setting('MAX_UPLOAD_CHUNK_BYTES', 8 * 1024 * 1024)
+
+
+def upload_dir():
+    return _setting('CHUNKED_UPLOAD_DIR', '') or os.path.join(settings.MEDIA_ROOT, 'uploads', 'partial')
+
+
+def part_path(upload_id):
+    return os.path.join(upload_dir(), f'{upload_id}.part')
+
+
+class UploadError(Exception):
+    """A request the upload cannot accept; status is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def start_upload(vehicle, phone, filename, size):
+    """
+    Open an upload session for a video of size bytes
+
+    Returns:
+        VideoUpload
+
+    Raises:
+        UploadError: bad filename or size
+    """
+    from .jobs import enqueue
+    from .models import VideoUpload
+
+    filename = os.path.basename(str(filename or '')).strip()
+    if not filename.lower().endswith(VIDEO_EXTENSIONS):
+        raise UploadError(f"filename must end with one of {', '.join(VIDEO_EXTENSIONS)}")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError('size must be a whole number of bytes')
+    if not 0 < size <= max_upload_bytes():
+        raise UploadError(f'size must be between 1 and {max_upload_bytes()} bytes', status=413)
+
+    os.makedirs(upload_dir(), exist_ok=True)
+    expires_at = timezone.now() + timedelta(hours=_setting('UPLOAD_EXPIRY_HOURS', 24))
+    with transaction.atomic():
+        upload = VideoUpload.objects.create(
+            vehicle=vehicle, uploader_phone=phone, filename=filename[:255], size=size, expires_at=expires_at,
+        )
+        enqueue('media.expire_upload', upload_id=str(upload.pk), run_after=expires_at)
+    open(part_path(upload.pk), 'wb').close()
+    return upload
+
+
+def received_bytes(upload):
+    """Bytes on disk so far; 0 if the partial file is gone"""
+    try:
+        return os.path.getsize(part_path(upload.pk))
+    except FileNotFoundError:
+        return 0
+
+
+def append_chunk(upload, offset, stream, length):
+    """
+    Append length bytes from stream at offset
+
+    offset must equal the bytes already received; anything else is a
+    409 carrying the real offset so the client can resume from it. If the
+    stream ends early the bytes that did arrive are kept.
+
+    Returns:
+        int: the new offset
+    """
+    from .models import VideoUpload
+
+    if length is None or length <= 0:
+        raise UploadError('Content-Length is required', status=411)
+    if length > max_chunk_bytes():
+        raise UploadError(f'chunks may be at most {max_chunk_bytes()} bytes', status=413)
+
+    path = part_path(upload.pk)
+    if not os.path.exists(path):
+        raise UploadError('upload has expired', status=404)
+    with open(path, 'ab') as handle:
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadError('another chunk is being written', status=409, offset=received_bytes(upload))
+        current = os.fstat(handle.fileno()).st_size
+        if offset != current:
+            raise UploadError(f'expected offset {current}', status=409, offset=current)
+        if current + length > upload.size:
+            raise UploadError('chunk runs past the declared size', status=413, offset=current)
+
+        remaining = length
+        while remaining:
+            data = stream.read(min(COPY_BUFFER_BYTES, remaining))
+            if not data:
+                break
+            handle.write(data)
+            remaining -= len(data)
+        handle.flush()
+        offset = current + length - remaining
+
+    VideoUpload.objects.filter(pk=upload.pk).update(received=offset, updated_at=timezone.now())
+    upload.received = offset
+    return offset
+
+
+class _PartialFile(File):
+    """A finished partial file; temporary_file_path lets FileSystemStorage move it rather than copy"""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def finish_upload(upload):
+    """
+    Turn a complete upload into a VehicleVideo
+
+    Returns:
+        VehicleVideo
+
+    Raises:
+        UploadError: bytes are still missing
+    """
+    from .models import VehicleVideo
+
+    received = received_bytes(upload)
+    if received != upload.size:
+        raise UploadError(f'{upload.size - received} bytes still missing', status=409, offset=received)
+
+    with transaction.atomic():
+        video = VehicleVideo(vehicle_id=upload.vehicle_id)
+        with open(part_path(upload.pk), 'rb') as handle:
+            video.video.save(upload.filename, _PartialFile(handle, name=upload.filename), save=False)
+        video.save()
+        upload.delete()
+    return video
+
+
+def discard_upload(upload_id):
+    """Remove an upload's row and partial file, if present"""
+    from .models import VideoUpload
+
+    VideoUpload.objects.filter(pk=upload_id).delete()
+    try:
+        os.remove(part_path(upload_id))
+    except FileNotFoundError:
+        pass
@@ -1,12 +1,23 @@
 """
 Encryption module for GoWheels
 Provides Fernet-based encryption for sensitive data at rest
+
+Ciphers are expensive to build and listing pages decrypt many fields, so
+get_cipher() hands out one process-wide Cipher per key set. ENCRYPTION_KEY
+may hold several comma-separated keys for rotation: the first encrypts,
+all of them decrypt (MultiFernet).
 """
 
 import os
-from cryptography.fernet import Fernet, InvalidToken
+import threading
+from functools import lru_cache
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
 from django.core.exceptions import ImproperlyConfigured
 
+# Distinct ciphertexts remembered per Cipher; listing pages repeat the
+# same seller phone/owner name across rows and across requests
+DECRYPT_CACHE_SIZE = 1024
+
 
 class Cipher:
     """
@@ -17,17 +28,25 @@ class Cipher:
         from cryptography.fernet import Fernet
         key = Fernet.generate_key()
         print(key.decode())  # Add to .env as ENCRYPTION_KEY
+    
+    Rotate keys by prepending the new key:
+        ENCRYPTION_KEY=<new key>,<old key>
+    then re-encrypt stored values with Cipher.rotate().
+    
+    Prefer get_cipher() over Cipher() outside tests.
     """
     
-    def __init__(self):
-        key = os.environ.get('ENCRYPTION_KEY')
-        if not key:
-            # Generate a valid Fernet key for development
-            key = Fernet.generate_key()
+    def __init__(self, keys=None):
+        if keys is None:
+            keys = _configured_keys()
+        if not keys:
+            raise ImproperlyConfigured("Invalid ENCRYPTION_KEY: no key given")
         try:
-            self.cipher = Fernet(key.encode() if isinstance(key, str) else key)
+            fernets = [Fernet(key.encode() if isinstance(key, str) else key) for key in keys]
         except Exception as e:
             raise ImproperlyConfigured(f"Invalid ENCRYPTION_KEY: {e}")
+        self.cipher = MultiFernet(fernets)
+        self._decrypt_cached = lru_cache(maxsize=DECRYPT_CACHE_SIZE)(self._decrypt)
     
     def encrypt(self, plaintext):
         """
@@ -61,6 +80,10 @@ class Cipher:
         if not isinstance(ciphertext, str):
             ciphertext = str(ciphertext)
         
+        # Failures are not cached, so a bad token is re-checked every time
+        return self._decrypt_cached(ciphertext)
+    
+    def _decrypt(self, ciphertext):
         try:
             decrypted = self.cipher.decrypt(ciphertext.encode())
             return decrypted.decode()
@@ -68,15 +91,75 @@ class Cipher:
             raise ValueError("Decryption failed: invalid token or corrupted data")
         except Exception as e:
             raise ValueError(f"Decryption failed: {e}")
+    
+    def encrypt_many(self, plaintexts):
+        """
+        Encrypt a batch of values
+        
+        Returns:
+            list: ciphertexts in the same order as plaintexts
+        """
+        return [self.encrypt(plaintext) for plaintext in plaintexts]
+    
+    def decrypt_many(self, ciphertexts, default=None):
+        """
+        Decrypt a batch of values, each distinct ciphertext once
+        
+        Args:
+            ciphertexts: iterable of encrypted strings
+            default: value used for tokens that fail to decrypt
+            
+        Returns:
+            dict: {ciphertext: plaintext or default}
+        """
+        plaintext = {}
+        for ciphertext in ciphertexts:
+            if ciphertext in plaintext:
+                continue
+            try:
+                plaintext[ciphertext] = self.decrypt(ciphertext)
+            except ValueError:
+                plaintext[ciphertext] = default
+        return plaintext
+    
+    def rotate(self, ciphertext):
+        """Re-encrypt a value under the primary key"""
+        try:
+            return self.cipher.rotate(ciphertext.encode()).decode()
+        except InvalidToken:
+            raise ValueError("Rotation failed: invalid token or corrupted data")
+
+
+# Fallback key for development when ENCRYPTION_KEY is unset; stable for the
+# life of the process so values encrypted in one request decrypt in the next
+_dev_key = Fernet.generate_key().decode()
+
+_ciphers = {}
+_ciphers_lock = threading.Lock()
+
+
+def _configured_keys():
+    raw = os.environ.get('ENCRYPTION_KEY') or _dev_key
+    return tuple(key.strip() for key in raw.split(',') if key.strip())
+
+
+def get_cipher():
+    """Process-wide Cipher for the keys currently in ENCRYPTION_KEY"""
+    keys = _configured_keys()
+    cipher = _ciphers.get(keys)
+    if cipher is None:
+        with _ciphers_lock:
+            cipher = _ciphers.get(keys)
+            if cipher is None:
+                cipher = _ciphers[keys] = Cipher(keys)
+    return cipher
 
 
 def encrypt_field(plaintext):
     """Convenience function to encrypt a field"""
-    cipher = Cipher()
-    return cipher.encrypt(plaintext)
+    return get_cipher().encrypt(plaintext)
 
 
 def decrypt_field(ciphertext):
     """Convenience function to decrypt a field"""
-    cipher = Cipher()
-    return cipher.decrypt(ciphertext)
+    return get_cipher().decrypt(ciphertext)
@@ -0,0 +1,201 @@
+"""
+Streaming exports for the super admin lists
+Rows are read with queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE) and
+written to a StreamingHttpResponse one chunk at a time, so exporting
+every user or vehicle costs the worker one chunk of memory rather than
+the whole table.
+
+Formats: ndjson (one JSON object per line) and csv. Filters mirror the
+admin screens; see user_queryset() and vehicle_queryset().
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+
+from .encryption import get_cipher
+from .models import UserProfile, Vehicle
+
+EXPORT_CHUNK_SIZE = 2000
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+USER_FIELDS = ('id', 'name', 'phone', 'pincode', 'unique_id', 'blocked')
+
+VEHICLE_FIELDS = (
+    'id', 'category_name', 'brand_name', 'model_name', 'year', 'price', 'pricing_type',
+    'listing_type', 'approval_status', 'available', 'promoted', 'sponsored', 'added_by',
+    'seller_phone', 'pincode', 'state', 'created_at',
+)
+
+
+def _flag(value):
+    """'1'/'true' -> True, '0'/'false' -> False, anything else -> None (no filter)"""
+    value = str(value or '').lower()
+    if value in ('1', 'true'):
+        return True
+    if value in ('0', 'false'):
+        return False
+    return None
+
+
+def user_queryset(params):
+    """UserProfiles for the admin user list; params: search, pincode, blocked"""
+    queryset = UserProfile.objects.select_related('user').order_by('-id')
+    search = params.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(
+            Q(user__first_name__icontains=search) |
+            Q(phone__icontains=search) |
+            Q(unique_id__icontains=search) |
+            Q(pincode__icontains=search)
+        )
+    if params.get('pincode'):
+        queryset = queryset.filter(pincode=params['pincode'])
+    blocked = _flag(params.get('blocked'))
+    if blocked is not None:
+        queryset = queryset.filter(blocked=blocked)
+    return queryset
+
+
+def vehicle_queryset(params):
+    """
+    Vehicles for the admin lists
+
+    Params: search (brand/model/category, as on the ads screen),
+    added_by, approval_status, listing_type, available.
+    """
+    queryset = Vehicle.objects.order_by('-id')
+    search = params.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(
+            Q(brand_name__icontains=search) |
+            Q(model_name__icontains=search) |
+            Q(category_name__icontains=search)
+        )
+    for field in ('added_by', 'approval_status', 'listing_type'):
+        if params.get(field):
+            queryset = queryset.filter(**{field: params[field]})
+    available = _flag(params.get('available'))
+    if available is not None:
+        queryset = queryset.filter(available=available)
+    return queryset
+
+
+def _chunks(queryset):
+    rows = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    while True:
+        chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def user_records(queryset):
+    """Export dicts for UserProfiles, chunk by chunk"""
+    for chunk in _chunks(queryset):
+        yield [
+            {
+                'id': profile.user.id,
+                'name': f"{profile.user.first_name}".strip() or 'Not provided',
+                'phone': profile.phone or 'Not provided',
+                'pincode': profile.pincode or 'Not provided',
+                'unique_id': profile.unique_id or 'Not provided',
+                'blocked': profile.blocked,
+            }
+            for profile in chunk
+        ]
+
+
+def vehicle_records(queryset, fields=VEHICLE_FIELDS):
+    """Export dicts for Vehicles, chunk by chunk; seller phones decrypted once per chunk"""
+    cipher = get_cipher()
+    queryset = queryset.only(*fields)
+    for chunk in _chunks(queryset):
+        phones = {}
+        if 'seller_phone' in fields:
+            encrypted = [v.seller_phone for v in chunk if Vehicle.is_encrypted(v.seller_phone)]
+            phones = cipher.decrypt_many(encrypted) if encrypted else {}
+        records = []
+        for vehicle in chunk:
+            record = {field: getattr(vehicle, field) for field in fields}
+            if 'price' in record:
+                record['price'] = str(vehicle.price)
+            if 'created_at' in record:
+                record['created_at'] = vehicle.created_at.isoformat() if vehicle.created_at else None
+            if 'seller_phone' in record and vehicle.seller_phone in phones:
+                record['seller_phone'] = phones[vehicle.seller_phone] or ''
+            records.append(record)
+        yield records
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def _ndjson(chunks):
+    for records in chunks:
+        yield ''.join(json.dumps(record, default=str) + '\n' for record in records)
+
+
+# Spreadsheets run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _cell(value):
+    """Text cells that would start a formula get a leading ' so they stay text"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv(chunks, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for records in chunks:
+        yield ''.join(writer.writerow([_cell(record[field]) for field in fields]) for record in records)
+
+
+def stream_export(chunks, fields, fmt, filename):
+    """
+    StreamingHttpResponse for record chunks in ndjson or csv
+
+    Raises:
+        ValueError: unknown format
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    body = _ndjson(chunks) if fmt == 'ndjson' else _csv(chunks, fields)
+    response = StreamingHttpResponse(body, content_type=FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def stream_json_list(chunks, key, extra=None):
+    """
+    StreamingHttpResponse with the body {**extra, key: [records...]}
+
+    Lets list endpoints keep their JSON shape while sending records as
+    they are read.
+    """
+    def body():
+        head = json.dumps(extra or {})[:-1]
+        yield f'{head}{", " if extra else ""}"{key}": ['
+        separator = ''
+        for records in chunks:
+            if records:
+                yield separator + ', '.join(json.dumps(record, default=str) for record in records)
+                separator = ', '
+        yield ']}'
+
+    return StreamingHttpResponse(body(), content_type='application/json')
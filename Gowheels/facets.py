@@ -0,0 +1,215 @@
+"""
+Browse filters and facet counts for GoWheels
+BrowseFilters turns the browse query params into a Vehicle queryset, and
+facet_counts() answers "how many vehicles per category, brand, listing
+type, year band and price band" for the same filters in one GROUP BY.
+
+Facets follow the usual multi-select rule: each facet is counted with
+every filter applied except its own, so the category chips still show
+the other categories while one is selected. All of that is derived in
+Python from a single grouped query over the non-facet filters.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Case, CharField, Count, Max, Q, Value, When
+
+from .geo import pincode_coordinates, within_radius
+from .models import Vehicle, VehicleListing
+
+# (slug, label, lower bound inclusive, upper bound exclusive)
+YEAR_BANDS = (
+    ('before-2010', 'Before 2010', None, 2010),
+    ('2010-2014', '2010 - 2014', 2010, 2015),
+    ('2015-2019', '2015 - 2019', 2015, 2020),
+    ('2020-plus', '2020 & newer', 2020, None),
+)
+
+PRICE_BANDS = (
+    ('under-500', 'Under 500', None, 500),
+    ('500-1000', '500 - 1,000', 500, 1000),
+    ('1000-2000', '1,000 - 2,000', 1000, 2000),
+    ('2000-5000', '2,000 - 5,000', 2000, 5000),
+    ('5000-plus', '5,000 & above', 5000, None),
+)
+
+FACETS = ('category', 'brand', 'listing_type', 'year_band', 'price_band')
+
+
+def _band_q(field, low, high):
+    q = Q()
+    if low is not None:
+        q &= Q(**{f'{field}__gte': low})
+    if high is not None:
+        q &= Q(**{f'{field}__lt': high})
+    return q
+
+
+def _band_case(field, bands):
+    return Case(
+        *[When(_band_q(field, low, high), then=Value(slug)) for slug, _, low, high in bands],
+        output_field=CharField(),
+    )
+
+
+class BrowseFilters:
+    """
+    Browse query params shared by get_vehicles and get_vehicle_facets
+
+    Params: cat, br, mod, pincode, distance, listing_type (default
+    'rent'), year_band, price_band, sort. Unknown band slugs are ignored.
+
+    A pincode found in the Pincode table selects vehicles within
+    distance km of it (annotated as distance_km); sort=distance then
+    orders nearest first. Unknown pincodes fall back to a numeric window.
+    """
+
+    def __init__(self, params):
+        self.category = str(params.get('cat', ''))
+        self.brand = str(params.get('br', ''))
+        self.model = str(params.get('mod', ''))
+        self.pincode = str(params.get('pincode', ''))
+        self.listing_type = str(params.get('listing_type', 'rent'))
+        self.distance_km = int(params.get('distance', 25))
+        self.year_band = self._band(params.get('year_band'), YEAR_BANDS)
+        self.price_band = self._band(params.get('price_band'), PRICE_BANDS)
+        self.sort = str(params.get('sort', ''))
+        # (latitude, longitude) of the pincode, when the Pincode table knows it
+        self.origin = pincode_coordinates(self.pincode)
+
+    @staticmethod
+    def _band(slug, bands):
+        for band in bands:
+            if band[0] == slug:
+                return band
+        return None
+
+    def selected(self):
+        """Facet value each filter pins, keyed like the facet rows"""
+        return {
+            'category': self.category.lower() or None,
+            'brand': self.brand.lower() or None,
+            'listing_type': self.listing_type or None,
+            'year_band': self.year_band[0] if self.year_band else None,
+            'price_band': self.price_band[0] if self.price_band else None,
+        }
+
+    def base_queryset(self):
+        """Approved, available vehicles narrowed by the non-facet filters"""
+        return self._narrow(Vehicle.objects.filter(available=True, approval_status='approved'))
+
+    def ordering(self):
+        """Keyset ordering for paginating listing_queryset()"""
+        if self.sort == 'distance' and self.origin:
+            return ('distance_km', 'pk')
+        return ('-pk',)
+
+    def _narrow(self, queryset):
+        if self.model:
+            queryset = queryset.filter(model_key=self.model.lower())
+        if self.origin:
+            queryset = within_radius(queryset, *self.origin, self.distance_km)
+        elif self.pincode:
+            queryset = queryset.filter(self._pincode_q())
+        return queryset
+
+    def _pincode_q(self):
+        # Pincodes without coordinates: Chennai pincode-based mapping (600001-600120)
+        try:
+            base_pincode = int(self.pincode)
+        except (ValueError, TypeError):
+            return Q(pincode__exact=self.pincode)
+        # For Chennai pincodes (600xxx), show vehicles within +/- 10 pincode range
+        if 600001 <= base_pincode <= 600120:
+            min_pincode = max(600001, base_pincode - 10)
+            max_pincode = min(600120, base_pincode + 10)
+        else:
+            # For other areas, use distance-based range
+            min_pincode = base_pincode - self.distance_km
+            max_pincode = base_pincode + self.distance_km
+        return Q(pincode__gte=str(min_pincode), pincode__lte=str(max_pincode))
+
+    def queryset(self):
+        """Vehicles matching every filter"""
+        return self._apply_facets(self.base_queryset())
+
+    def listing_queryset(self):
+        """VehicleListing read-model rows matching every filter"""
+        return self._apply_facets(self._narrow(VehicleListing.objects.all()))
+
+    def _apply_facets(self, queryset):
+        queryset = queryset.filter(listing_type=self.listing_type)
+        if self.category:
+            queryset = queryset.filter(category_key=self.category.lower())
+        if self.brand:
+            queryset = queryset.filter(brand_key=self.brand.lower())
+        if self.year_band:
+            queryset = queryset.filter(_band_q('year', *self.year_band[2:]))
+        if self.price_band:
+            queryset = queryset.filter(_band_q('price', *self.price_band[2:]))
+        return queryset
+
+
+def facet_counts(filters):
+    """
+    Count every facet for filters in one grouped query
+
+    Returns:
+        dict: {'total': n, 'facets': {facet: [{value, label, count, selected}]}}
+    """
+    rows = (
+        filters.base_queryset()
+        .annotate(year_band=_band_case('year', YEAR_BANDS), price_band=_band_case('price', PRICE_BANDS))
+        .values('category_key', 'brand_key', 'listing_type', 'year_band', 'price_band')
+        .annotate(count=Count('id'), category_label=Max('category_name'), brand_label=Max('brand_name'))
+        .order_by()
+    )
+
+    selected = filters.selected()
+    counts = {facet: defaultdict(int) for facet in FACETS}
+    labels = {'category': {}, 'brand': {}}
+    total = 0
+
+    for row in rows:
+        values = {
+            'category': row['category_key'],
+            'brand': row['brand_key'],
+            'listing_type': row['listing_type'],
+            'year_band': row['year_band'],
+            'price_band': row['price_band'],
+        }
+        labels['category'].setdefault(row['category_key'], row['category_label'])
+        labels['brand'].setdefault(row['brand_key'], row['brand_label'])
+        mismatched = [facet for facet in FACETS if selected[facet] is not None and values[facet] != selected[facet]]
+        if not mismatched:
+            total += row['count']
+        for facet in FACETS:
+            # A row counts toward a facet if it passes every other facet's filter
+            if not mismatched or mismatched == [facet]:
+                counts[facet][values[facet]] += row['count']
+
+    def options(facet, choices):
+        return [
+            {'value': value, 'label': label, 'count': counts[facet].get(value, 0), 'selected': selected[facet] == value}
+            for value, label in choices
+        ]
+
+    def ranked(facet):
+        return sorted(
+            (
+                {'value': value, 'label': labels[facet][value], 'count': count, 'selected': selected[facet] == value}
+                for value, count in counts[facet].items() if value
+            ),
+            key=lambda option: (-option['count'], option['label']),
+        )
+
+    return {
+        'total': total,
+        'facets': {
+            'category': ranked('category'),
+            'brand': ranked('brand'),
+            'listing_type': options('listing_type', Vehicle.LISTING_TYPES),
+            'year_band': options('year_band', [band[:2] for band in YEAR_BANDS]),
+            'price_band': options('price_band', [band[:2] for band in PRICE_BANDS]),
+        },
+    }
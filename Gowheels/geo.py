@@ -0,0 +1,87 @@
+"""
+Distance queries over stored coordinates for GoWheels
+Vehicle and VehicleListing carry the latitude/longitude of their pincode.
+A radius query first narrows to the bounding box of the circle, which the
+lat/lng indexes can answer, then keeps the rows whose exact haversine
+distance is within the radius and exposes it as distance_km for sorting.
+"""
+
+import math
+
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+from .cache import VEHICLES
+from .models import Pincode, Vehicle, VehicleListing
+from .spatial import EARTH_RADIUS_KM, KM_PER_DEGREE_LAT
+
+
+def pincode_coordinates(code):
+    """(latitude, longitude) of a pincode from the Pincode table, or None"""
+    if not code:
+        return None
+    return Pincode.objects.filter(code=code).values_list('latitude', 'longitude').first()
+
+
+def bounding_box(lat, lng, radius_km):
+    """(south, west, north, east) of the box enclosing a radius around a point"""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    dlng = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+    return lat - dlat, lng - dlng, lat + dlat, lng + dlng
+
+
+def haversine_km(lat, lng, lat_field='latitude', lng_field='longitude'):
+    """Database expression for the great-circle distance from (lat, lng)"""
+    lat_r = math.radians(lat)
+    dlat = Radians(F(lat_field)) - Value(lat_r)
+    dlng = Radians(F(lng_field)) - Value(math.radians(lng))
+    a = (
+        Power(Sin(dlat / 2), 2)
+        + Value(math.cos(lat_r)) * Cos(Radians(F(lat_field))) * Power(Sin(dlng / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a), output_field=FloatField())
+
+
+def within_radius(queryset, lat, lng, radius_km):
+    """Rows of queryset within radius_km of (lat, lng), annotated with distance_km"""
+    south, west, north, east = bounding_box(lat, lng, radius_km)
+    return (
+        queryset
+        .filter(latitude__range=(south, north), longitude__range=(west, east))
+        .annotate(distance_km=haversine_km(lat, lng))
+        .filter(distance_km__lte=radius_km)
+    )
+
+
+def coordinate_updates():
+    """update() kwargs copying each row's pincode coordinates from the Pincode table"""
+    pincode = Pincode.objects.filter(code=OuterRef('pincode'))
+    return {
+        'latitude': Subquery(pincode.values('latitude')[:1]),
+        'longitude': Subquery(pincode.values('longitude')[:1]),
+    }
+
+
+def backfill_coordinates(codes=None):
+    """
+    Copy Pincode coordinates onto Vehicle and VehicleListing rows
+
+    One correlated UPDATE per table instead of one save per vehicle.
+    Vehicles whose pincode is not in the Pincode table get NULL
+    coordinates. Limited to the given pincodes when codes is passed.
+
+    Returns:
+        int: number of Vehicle rows updated
+    """
+    vehicles = Vehicle.objects.all()
+    listings = VehicleListing.objects.all()
+    if codes is not None:
+        codes = list(codes)
+        vehicles = vehicles.filter(pincode__in=codes)
+        listings = listings.filter(pincode__in=codes)
+    updated = vehicles.update(**coordinate_updates())
+    listings.update(**coordinate_updates())
+    if updated:
+        VEHICLES.bump()
+    return updated
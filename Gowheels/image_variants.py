@@ -0,0 +1,217 @@
+"""
+Responsive image variants for GoWheels
+Every VehicleImage gets resized copies (thumb, card, detail) in WebP
+and JPEG, stored next to the original and recorded in
+VehicleImage.variants, so listing cards can send a srcset instead of
+full-resolution phone photos.
+
+Variants are rendered upright (EXIF orientation applied) and written
+without any metadata, which drops the camera's EXIF block, including GPS
+tags. The original upload is left untouched.
+"""
+
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger('gowheels.image_variants')
+
+# Variant name -> largest width in pixels; images are never upscaled
+VARIANT_WIDTHS = {
+    'thumb': 160,
+    'card': 480,
+    'detail': 1200,
+}
+
+# Format -> (file extension, Pillow save options)
+FORMATS = {
+    'webp': ('webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Variant whose JPEG is the <img src> fallback for browsers without srcset
+DEFAULT_VARIANT = 'card'
+
+
+def variant_name(name, variant, fmt):
+    """Storage name for a variant: vehicles/seller/car.jpg -> vehicles/seller/car-card.webp"""
+    stem = os.path.splitext(name)[0]
+    return f'{stem}-{variant}.{FORMATS[fmt][0]}'
+
+
+def _load(field_file):
+    """The original as an upright RGB image"""
+    with field_file.open('rb') as handle:
+        image = Image.open(handle)
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            # Flatten transparency onto white; JPEG has no alpha channel
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            rgba = image.convert('RGBA')
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            image = background
+        image.load()
+    return image
+
+
+def render_variants(field_file):
+    """
+    Resize and encode every variant of an image file
+
+    Returns:
+        dict: {variant: {'width', 'height', fmt: bytes, ...}}
+    """
+    original = _load(field_file)
+    rendered = {}
+    for variant, width in VARIANT_WIDTHS.items():
+        image = original
+        if original.width > width:
+            height = max(1, round(original.height * width / original.width))
+            image = original.resize((width, height), Image.LANCZOS)
+        entry = {'width': image.width, 'height': image.height}
+        for fmt, (_, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, **options)
+            entry[fmt] = buffer.getvalue()
+        rendered[variant] = entry
+    return rendered
+
+
+def delete_variants(storage, variants):
+    """Remove the variant files recorded in a VehicleImage.variants map"""
+    for entry in (variants or {}).values():
+        for fmt in FORMATS:
+            if entry.get(fmt):
+                storage.delete(entry[fmt])
+
+
+def generate_variants(vehicle_image, force=False):
+    """
+    Render and store the variants of one VehicleImage
+
+    The row is updated with .update() so no post_save fires; callers that
+    need the listing card refreshed do it themselves (see
+    generate_for_image).
+
+    Returns:
+        dict: the new variants map, or None when there was nothing to do
+        or the original could not be read
+    """
+    from .models import VehicleImage
+
+    if vehicle_image.variants and not force:
+        return None
+    field_file = vehicle_image.image
+    storage = field_file.storage
+    try:
+        rendered = render_variants(field_file)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        logger.warning('No variants for image %s (%s): %s', vehicle_image.pk, field_file.name, exc)
+        return None
+
+    delete_variants(storage, vehicle_image.variants)
+    variants = {}
+    for variant, entry in rendered.items():
+        stored = {'width': entry['width'], 'height': entry['height']}
+        for fmt in FORMATS:
+            name = variant_name(field_file.name, variant, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            stored[fmt] = storage.save(name, ContentFile(entry[fmt]))
+        variants[variant] = stored
+
+    VehicleImage.objects.filter(pk=vehicle_image.pk).update(variants=variants)
+    vehicle_image.variants = variants
+    return variants
+
+
+def generate_for_image(image_id, force=False):
+    """generate_variants by primary key, then refresh the vehicle's cached card"""
+    from .cache import VEHICLES
+    from .models import VehicleImage
+    from .read_model import refresh_listing
+
+    vehicle_image = VehicleImage.objects.filter(pk=image_id).first()
+    if vehicle_image is None:
+        return None
+    variants = generate_variants(vehicle_image, force=force)
+    if variants is not None:
+        refresh_listing(vehicle_image.vehicle_id)
+        VEHICLES.bump()
+    return variants
+
+
+def srcset(vehicle_image):
+    """
+    srcset-ready description of a VehicleImage
+
+    Returns:
+        dict: {'src': fallback URL, 'webp': srcset, 'jpeg': srcset,
+        'width': ..., 'height': ...}; without variants yet, src is the
+        original and the srcsets are empty
+    """
+    field_file = vehicle_image.image
+    variants = vehicle_image.variants or {}
+    if not variants:
+        return {'src': field_file.url, 'webp': '', 'jpeg': '', 'width': None, 'height': None}
+
+    storage = field_file.storage
+    sets = {fmt: [] for fmt in FORMATS}
+    seen = set()
+    for variant in VARIANT_WIDTHS:
+        entry = variants.get(variant)
+        # Small originals give several variants of the same width; list each width once
+        if not entry or entry['width'] in seen:
+            continue
+        seen.add(entry['width'])
+        for fmt in FORMATS:
+            sets[fmt].append(f"{storage.url(entry[fmt])} {entry['width']}w")
+    fallback = variants.get(DEFAULT_VARIANT) or next(iter(variants.values()))
+    largest = variants[max(variants, key=lambda variant: variants[variant]['width'])]
+    return {
+        'src': storage.url(fallback['jpeg']),
+        'webp': ', '.join(sets['webp']),
+        'jpeg': ', '.join(sets['jpeg']),
+        'width': largest['width'],
+        'height': largest['height'],
+    }
+
+
+def backfill_variants(force=False, vehicle_id=None, batch_size=200, log=None):
+    """
+    Generate variants for stored images that have none (every image with force)
+
+    Images whose originals are missing or unreadable are logged and
+    skipped. Each touched vehicle's listing card is refreshed once.
+
+    Returns:
+        tuple: (images processed, images skipped)
+    """
+    from .cache import VEHICLES
+    from .models import VehicleImage
+    from .read_model import refresh_listing
+
+    queryset = VehicleImage.objects.only('id', 'vehicle_id', 'image', 'variants').order_by('id')
+    if not force:
+        queryset = queryset.filter(variants={})
+    if vehicle_id is not None:
+        queryset = queryset.filter(vehicle_id=vehicle_id)
+
+    done, skipped, vehicles = 0, 0, set()
+    for vehicle_image in queryset.iterator(chunk_size=batch_size):
+        if generate_variants(vehicle_image, force=force) is None:
+            skipped += 1
+        else:
+            done += 1
+            vehicles.add(vehicle_image.vehicle_id)
+        if log and (done + skipped) % batch_size == 0:
+            log(f'{done + skipped} images ({skipped} skipped)')
+
+    for touched in sorted(vehicles):
+        refresh_listing(touched)
+    if vehicles:
+        VEHICLES.bump()
+    return done, skipped
@@ -0,0 +1,224 @@
+"""
+Background jobs for GoWheels
+A small database-backed queue for work that should not hold up a
+request, such as media post-processing. Request code calls enqueue()
+inside its own transaction, so a job exists exactly when the rows it
+refers to were committed. The run_jobs management command claims and
+runs jobs.
+
+Failed jobs are retried with exponential backoff up to max_attempts and
+then moved to the DeadJob table. PermanentJobError skips the retries.
+"run_jobs --requeue-dead" puts dead jobs back on the queue.
+
+Handlers are registered by name:
+
+    @job('media.video_duration')
+    def video_duration(video_id):
+        ...
+
+    enqueue('media.video_duration', video_id=video.pk)
+
+With JOBS_EAGER = True (development without a worker), enqueue() runs the
+handler in-process once the surrounding transaction commits.
+"""
+
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger('gowheels.jobs')
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Retry n waits RETRY_BASE_SECONDS * 2 ** (n - 1), capped at RETRY_MAX_SECONDS
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+# A running job whose worker has not finished it in this long is assumed lost
+LOCK_TIMEOUT_SECONDS = 900
+
+HANDLERS = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help; the job goes straight to DeadJob"""
+    pass
+
+
+def job(name, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Register the decorated function as the handler for jobs called name"""
+    def register(func):
+        if name in HANDLERS:
+            raise ValueError(f'job {name} is already registered')
+        func.job_name = name
+        func.max_attempts = max_attempts
+        HANDLERS[name] = func
+        return func
+    return register
+
+
+def _handler(name):
+    try:
+        return HANDLERS[name]
+    except KeyError:
+        raise PermanentJobError(f'no handler registered for job {name}')
+
+
+def enqueue(name, /, run_after=None, **payload):
+    """
+    Queue a job; payload must be JSON-serializable keyword arguments
+
+    Returns:
+        Job: the queued row, or None when JOBS_EAGER runs it in-process
+    """
+    from .models import Job
+
+    handler = _handler(name)
+    if getattr(settings, 'JOBS_EAGER', False):
+        transaction.on_commit(lambda: _run_eager(name, payload))
+        return None
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=handler.max_attempts,
+        run_after=run_after or timezone.now(),
+    )
+
+
+def _run_eager(name, payload):
+    try:
+        _handler(name)(**payload)
+    except Exception:
+        logger.exception('Eager job %s %s failed', name, payload)
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def retry_delay(attempts):
+    """Seconds to wait before retrying a job that has failed attempts times"""
+    return min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+
+
+def release_stale(now=None):
+    """Requeue running jobs whose worker died; returns how many were released"""
+    from .models import Job
+
+    now = now or timezone.now()
+    return Job.objects.filter(
+        status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=LOCK_TIMEOUT_SECONDS),
+    ).update(status=Job.QUEUED, locked_by='', locked_at=None)
+
+
+def claim(worker, limit=10):
+    """
+    Lock up to limit due jobs for worker
+
+    Uses SELECT ... FOR UPDATE SKIP LOCKED where the database has it, so
+    several workers never claim the same row. The conditional UPDATE keeps
+    that guarantee on databases without it.
+    """
+    from .models import Job
+
+    now = timezone.now()
+    with transaction.atomic():
+        due = Job.objects.filter(status=Job.QUEUED, run_after__lte=now).order_by('run_after', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('id', flat=True)[:limit])
+        if not ids:
+            return []
+        Job.objects.filter(id__in=ids, status=Job.QUEUED).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F('attempts') + 1,
+        )
+    return list(Job.objects.filter(id__in=ids, status=Job.RUNNING, locked_by=worker).order_by('run_after', 'id'))
+
+
+def _bury(job_row, error):
+    from .models import DeadJob
+
+    with transaction.atomic():
+        DeadJob.objects.create(
+            name=job_row.name,
+            payload=job_row.payload,
+            attempts=job_row.attempts,
+            error=error,
+            queued_at=job_row.created_at,
+        )
+        job_row.delete()
+    logger.error('Job %s %s moved to dead letters after %d attempts', job_row.name, job_row.payload, job_row.attempts)
+
+
+def run_job(job_row):
+    """
+    Run one claimed job and record the outcome
+
+    Returns:
+        bool: True if the handler succeeded
+    """
+    try:
+        _handler(job_row.name)(**job_row.payload)
+    except Exception as exc:
+        error = traceback.format_exc()
+        if isinstance(exc, PermanentJobError) or job_row.attempts >= job_row.max_attempts:
+            _bury(job_row, error)
+        else:
+            delay = retry_delay(job_row.attempts)
+            type(job_row).objects.filter(pk=job_row.pk).update(
+                status=job_row.QUEUED, locked_by='', locked_at=None, last_error=error,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+            logger.warning('Job %s %s failed (attempt %d), retrying in %ds: %s',
+                           job_row.name, job_row.payload, job_row.attempts, delay, exc)
+        return False
+    job_row.delete()
+    return True
+
+
+def run_pending(worker=None, limit=10):
+    """
+    Run up to limit due jobs
+
+    Each job is claimed just before it runs, so jobs waiting behind a slow
+    one are not locked and cannot outlive LOCK_TIMEOUT_SECONDS and be
+    requeued by release_stale() while this worker still means to run them.
+
+    Returns:
+        tuple: (succeeded, failed)
+    """
+    worker = worker or worker_id()
+    succeeded = failed = 0
+    for _ in range(limit):
+        claimed = claim(worker, 1)
+        if not claimed:
+            break
+        if run_job(claimed[0]):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def requeue_dead(name=None):
+    """Move dead jobs (optionally only those called name) back to the queue"""
+    from .models import DeadJob, Job
+
+    dead = DeadJob.objects.all()
+    if name:
+        dead = dead.filter(name=name)
+    count = 0
+    with transaction.atomic():
+        for row in dead.select_for_update().order_by('id'):
+            max_attempts = HANDLERS[row.name].max_attempts if row.name in HANDLERS else DEFAULT_MAX_ATTEMPTS
+            Job.objects.create(name=row.name, payload=row.payload, max_attempts=max_attempts)
+            row.delete()
+            count += 1
+    return count
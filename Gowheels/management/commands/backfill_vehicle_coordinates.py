@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from gowheels.geo import backfill_coordinates
+
+class Command(BaseCommand):
+    help = 'Copy latitude/longitude from the Pincode table onto vehicles and their listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pincode', action='append', dest='pincodes', help='Only vehicles with this pincode (repeatable)')
+
+    def handle(self, *args, **options):
+        count = backfill_coordinates(options['pincodes'])
+        self.stdout.write(self.style.SUCCESS(f'Updated coordinates on {count} vehicles'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from gowheels.media_storage import collect_unreferenced, dedupe_catalog_media, recount_refs
+
+class Command(BaseCommand):
+    help = 'Move catalog images into the content-addressed store, merging duplicate files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be moved and saved without writing')
+        parser.add_argument('--recount', action='store_true', help='Recompute blob reference counts from the catalog tables')
+        parser.add_argument('--gc', action='store_true', help='Delete blobs that have had no references for the grace period')
+
+    def handle(self, *args, **options):
+        stats = dedupe_catalog_media(
+            dry_run=options['dry_run'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(('[dry run] ' if options['dry_run'] else '') + stats.summary()))
+        if options['dry_run']:
+            return
+        if options['recount']:
+            self.stdout.write(f'Corrected reference counts of {recount_refs()} blobs')
+        if options['gc']:
+            self.stdout.write(f'Removed {collect_unreferenced()} unreferenced blobs')
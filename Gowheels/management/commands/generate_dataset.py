@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from gowheels.synthetic import DatasetGenerator
+
+class Command(BaseCommand):
+    help = 'Fill the database with a reproducible synthetic dataset for load and performance testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vehicles', type=int, default=1000000, help='Number of vehicles to generate')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+        parser.add_argument('--skip-rebuild', action='store_true', help='Do not rebuild the search index and listing read model afterwards')
+        parser.add_argument('--force', action='store_true', help='Run even with DEBUG off (the rows land in whatever database is configured)')
+
+    def handle(self, *args, **options):
+        db = connection.settings_dict
+        target = f"{connection.vendor} database {db['NAME']!r}" + (f" on {db['HOST']}" if db.get('HOST') else '')
+        if not settings.DEBUG and not options['force']:
+            raise CommandError(f'Refusing to write synthetic data to {target} with DEBUG off; pass --force if this is a test database')
+        self.stdout.write(f'Writing synthetic data to {target}')
+
+        started = time.monotonic()
+        generator = DatasetGenerator(vehicles=options['vehicles'], seed=options['seed'], batch_size=options['batch_size'])
+        counts = generator.run(rebuild=not options['skip_rebuild'], log=self.stdout.write)
+        elapsed = time.monotonic() - started
+        for name, count in counts.items():
+            self.stdout.write(f'{name}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {counts['vehicles']} vehicles in {elapsed:.1f}s ({counts['vehicles'] / elapsed:,.0f} vehicles/s)"
+        ))
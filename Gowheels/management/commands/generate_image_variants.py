@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from gowheels.image_variants import backfill_variants
+
+class Command(BaseCommand):
+    help = 'Generate thumbnail, card and detail WebP/JPEG variants for stored vehicle images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate variants for images that already have them')
+        parser.add_argument('--vehicle', type=int, help='Only images of this vehicle id')
+        parser.add_argument('--batch-size', type=int, default=200, help='Images read per query')
+
+    def handle(self, *args, **options):
+        done, skipped = backfill_variants(
+            force=options['force'],
+            vehicle_id=options['vehicle'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {done} images ({skipped} skipped)'))
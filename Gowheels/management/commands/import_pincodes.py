@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from gowheels.pincode_import import import_pincodes
+
+class Command(BaseCommand):
+    help = 'Import pincodes from CSV file; only new or changed pincodes are written'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', type=str, help='Path to CSV file')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per bulk upsert statement')
+        parser.add_argument('--no-fast-path', action='store_true', help='Skip MySQL LOAD DATA LOCAL INFILE even when available')
+
+    def handle(self, *args, **options):
+        with open(options['csv_file'], 'r', encoding='utf-8-sig', newline='') as file:
+            stats = import_pincodes(
+                file,
+                batch_size=options['batch_size'],
+                fast_path=not options['no_fast_path'],
+                log=self.stdout.write if options['verbosity'] > 1 else None,
+            )
+        self.stdout.write(self.style.SUCCESS(stats.summary()))
@@ -0,0 +1,21 @@
+import os
+import time
+from django.core.management.base import BaseCommand
+from gowheels.neighbors import STANDARD_RADII, precompute_neighbors
+
+class Command(BaseCommand):
+    help = f'Precompute pincode neighbors within {"/".join(map(str, STANDARD_RADII))} km into PincodeMapping'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (1 runs inline)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk upsert statement')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = precompute_neighbors(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} neighbor pairs in {elapsed:.1f}s'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from gowheels.models import VehicleListing
+from gowheels.read_model import rebuild_listings
+
+class Command(BaseCommand):
+    help = 'Rebuild the VehicleListing read model from approved, available vehicles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Vehicles rendered per batch')
+        parser.add_argument('--if-empty', action='store_true', help='Only build when the read model has no rows (first deploy)')
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and VehicleListing.objects.exists():
+            self.stdout.write('Read model already populated, skipping')
+            return
+        count = rebuild_listings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} listings'))
@@ -0,0 +1,44 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from gowheels import jobs
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (media post-processing) until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run every due job, then exit')
+        parser.add_argument('--batch-size', type=int, default=10, help='Jobs run between stale-lock checks')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--requeue-dead', action='store_true', help='Move dead jobs back to the queue and exit')
+        parser.add_argument('--name', help='With --requeue-dead, only jobs with this name')
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            count = jobs.requeue_dead(options['name'])
+            self.stdout.write(self.style.SUCCESS(f'Requeued {count} dead jobs'))
+            return
+
+        self.stopping = False
+        # Finish the job in hand on SIGTERM/SIGINT, then exit
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker = jobs.worker_id()
+        succeeded = failed = 0
+        self.stdout.write(f'Worker {worker} started')
+        while not self.stopping:
+            jobs.release_stale()
+            done, errors = jobs.run_pending(worker, options['batch_size'])
+            succeeded += done
+            failed += errors
+            if done or errors:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker} stopped: {succeeded} succeeded, {failed} failed'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
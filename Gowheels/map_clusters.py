@@ -0,0 +1,130 @@
+"""
+Map marker clustering for GoWheels
+Groups listed vehicles into grid clusters on the Web Mercator tile grid,
+using the pincode coordinates stored on each listing, so a map request
+returns at most CLUSTER_GRID x CLUSTER_GRID clusters per 256px tile
+however many vehicles the area holds.
+
+Cells are fixed on the world grid for each zoom level, so a cluster
+comes out the same from a /z/x/y tile request and from any bounding box
+that covers it. Tiles are the cacheable unit; see get_map_tile.
+"""
+
+import math
+
+from django.db.models import Count, Min
+
+# Clusters per tile side; 8 gives ~32px cells on a 256px tile
+CLUSTER_GRID = 8
+
+MAX_ZOOM = 20
+
+# Bounding-box requests may cover at most this many tiles at their zoom
+MAX_BBOX_TILES = 64
+
+# Mercator stops at +/-85.0511 degrees
+MAX_LATITUDE = math.degrees(math.atan(math.sinh(math.pi)))
+
+
+def _world_xy(lat, lng, zoom):
+    """Position in tile units at zoom (tile (x, y) spans [x, x+1) x [y, y+1))"""
+    n = 2 ** zoom
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    x = (lng + 180.0) / 360.0 * n
+    y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+    return x, y
+
+
+def _validate(zoom, x=0, y=0):
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise ValueError(f'zoom must be between 0 and {MAX_ZOOM}')
+    n = 2 ** zoom
+    if not (0 <= x < n and 0 <= y < n):
+        raise ValueError(f'tile {zoom}/{x}/{y} does not exist')
+
+
+def tile_bounds(zoom, x, y):
+    """(south, west, north, east) in degrees of XYZ tile zoom/x/y"""
+    _validate(zoom, x, y)
+    n = 2 ** zoom
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat(y + 1), x / n * 360.0 - 180.0, lat(y), (x + 1) / n * 360.0 - 180.0
+
+
+def pincode_points(queryset, south, west, north, east):
+    """
+    Listed vehicles inside a bounding box, grouped by pincode
+
+    Returns:
+        list: (latitude, longitude, count, lowest vehicle id) per pincode
+    """
+    rows = (
+        queryset.filter(latitude__range=(south, north), longitude__range=(west, east))
+        .values('pincode', 'latitude', 'longitude')
+        .annotate(count=Count('pk'), vehicle_id=Min('pk'))
+        .order_by()
+    )
+    return [(row['latitude'], row['longitude'], row['count'], row['vehicle_id']) for row in rows]
+
+
+def cluster_points(points, zoom):
+    """
+    Grid-cluster (lat, lng, count, vehicle_id) points for a zoom level
+
+    Each cluster reports the count-weighted centre of its points. A
+    cluster holding a single vehicle also carries its vehicle_id so the
+    client can open the listing directly.
+    """
+    cells = {}
+    for lat, lng, count, vehicle_id in points:
+        x, y = _world_xy(lat, lng, zoom)
+        cell = cells.setdefault(
+            (int(x * CLUSTER_GRID), int(y * CLUSTER_GRID)),
+            {'count': 0, 'lat': 0.0, 'lng': 0.0, 'pincodes': 0, 'vehicle_id': vehicle_id},
+        )
+        cell['count'] += count
+        cell['lat'] += lat * count
+        cell['lng'] += lng * count
+        cell['pincodes'] += 1
+
+    clusters = []
+    for cell in cells.values():
+        cluster = {
+            'lat': round(cell['lat'] / cell['count'], 6),
+            'lng': round(cell['lng'] / cell['count'], 6),
+            'count': cell['count'],
+            'pincodes': cell['pincodes'],
+        }
+        if cell['count'] == 1:
+            cluster['vehicle_id'] = cell['vehicle_id']
+        clusters.append(cluster)
+    clusters.sort(key=lambda cluster: (-cluster['count'], cluster['lat'], cluster['lng']))
+    return clusters
+
+
+def bbox_clusters(queryset, south, west, north, east, zoom):
+    """Clusters of queryset's listings inside a bounding box at zoom"""
+    _validate(zoom)
+    if south > north or west > east:
+        raise ValueError('bounding box must be south <= north and west <= east')
+    left, top = _world_xy(north, west, zoom)
+    right, bottom = _world_xy(south, east, zoom)
+    tiles = (int(right) - int(left) + 1) * (int(bottom) - int(top) + 1)
+    if tiles > MAX_BBOX_TILES:
+        raise ValueError('bounding box too large for this zoom level')
+    return cluster_points(pincode_points(queryset, south, west, north, east), zoom)
+
+
+def tile_clusters(queryset, zoom, x, y):
+    """Clusters of queryset's listings on XYZ tile zoom/x/y"""
+    south, west, north, east = tile_bounds(zoom, x, y)
+    return {
+        'zoom': zoom,
+        'x': x,
+        'y': y,
+        'bounds': {'south': south, 'west': west, 'north': north, 'east': east},
+        'clusters': cluster_points(pincode_points(queryset, south, west, north, east), zoom),
+    }
@@ -0,0 +1,142 @@
+"""
+Media post-processing jobs for GoWheels
+Upload views only store the bytes; signals queue these jobs and the
+run_jobs worker does the slow part:
+
+    media.image_variants   resized WebP/JPEG copies of a VehicleImage
+    media.video_duration   VehicleVideo.duration from ffprobe
+    media.video_poster     first-second JPEG frame into VehicleVideo.poster
+    media.collect_blob     delete an unreferenced catalog image blob
+    media.expire_upload    drop a resumable video upload that was never finished
+
+Video jobs shell out to ffprobe/ffmpeg (FFPROBE_BINARY / FFMPEG_BINARY
+settings, found on PATH by default).
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .chunked_upload import discard_upload
+from .image_variants import generate_for_image
+from .jobs import PermanentJobError, job
+from .media_storage import collect
+
+# Seconds allowed for one ffprobe/ffmpeg run
+FFMPEG_TIMEOUT = 120
+
+# Poster frames are taken this far in, or halfway through shorter videos
+POSTER_OFFSET_SECONDS = 1.0
+
+
+@job('media.image_variants')
+def image_variants(image_id, force=False):
+    generate_for_image(image_id, force=force)
+
+
+@job('media.collect_blob')
+def collect_blob(blob):
+    collect(blob)
+
+
+@job('media.expire_upload')
+def expire_upload(upload_id):
+    # Finished uploads have already deleted their row and moved the file
+    discard_upload(upload_id)
+
+
+def _binary(setting, default):
+    return getattr(settings, setting, default)
+
+
+def _run(args):
+    """Run an ffmpeg tool and return its stdout; failures are retried by the queue"""
+    result = subprocess.run(args, capture_output=True, timeout=FFMPEG_TIMEOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f'{os.path.basename(args[0])} exited {result.returncode}: {result.stderr.decode(errors="replace")[-500:]}')
+    return result.stdout
+
+
+@contextmanager
+def local_path(field_file):
+    """A filesystem path for a stored file, copying it out of non-local storage"""
+    try:
+        path = field_file.storage.path(field_file.name)
+    except NotImplementedError:
+        path = None
+    if path is not None:
+        yield path
+        return
+    suffix = os.path.splitext(field_file.name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as handle:
+        with field_file.open('rb') as source:
+            shutil.copyfileobj(source, handle)
+        handle.flush()
+        yield handle.name
+
+
+def probe_duration(path):
+    """Container duration in seconds according to ffprobe"""
+    output = _run([
+        _binary('FFPROBE_BINARY', 'ffprobe'), '-v', 'error',
+        '-show_entries', 'format=duration', '-of', 'json', path,
+    ])
+    try:
+        return float(json.loads(output)['format']['duration'])
+    except (KeyError, TypeError, ValueError):
+        raise PermanentJobError(f'ffprobe reported no duration for {path}')
+
+
+def extract_frame(path, offset):
+    """One JPEG frame at offset seconds, as bytes"""
+    return _run([
+        _binary('FFMPEG_BINARY', 'ffmpeg'), '-v', 'error', '-ss', f'{offset:.2f}', '-i', path,
+        '-frames:v', '1', '-f', 'image2', '-c:v', 'mjpeg', '-q:v', '3', 'pipe:1',
+    ])
+
+
+def _video(video_id):
+    """The VehicleVideo, or None if it was deleted since the upload"""
+    from .models import VehicleVideo
+
+    return VehicleVideo.objects.filter(pk=video_id).first()
+
+
+@job('media.video_duration')
+def video_duration(video_id):
+    from .models import VehicleVideo
+
+    video = _video(video_id)
+    if video is None:
+        return
+    with local_path(video.video) as path:
+        duration = probe_duration(path)
+    VehicleVideo.objects.filter(pk=video.pk).update(duration=round(duration, 2))
+
+
+@job('media.video_poster')
+def video_poster(video_id):
+    from .models import VehicleVideo
+
+    video = _video(video_id)
+    if video is None:
+        return
+    with local_path(video.video) as path:
+        offset = POSTER_OFFSET_SECONDS
+        if video.duration and video.duration < 2 * POSTER_OFFSET_SECONDS:
+            offset = video.duration / 2
+        frame = extract_frame(path, offset)
+    if not frame:
+        raise PermanentJobError(f'ffmpeg returned no frame for video {video_id}')
+
+    if video.poster:
+        video.poster.delete(save=False)
+    stem = os.path.splitext(os.path.basename(video.video.name))[0]
+    video.poster.save(f'{stem}.jpg', ContentFile(frame), save=False)
+    VehicleVideo.objects.filter(pk=video.pk).update(poster=video.poster.name)
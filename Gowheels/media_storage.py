@@ -0,0 +1,277 @@
+"""
+Content-addressed storage for catalog images
+Brand, model and category logos are uploaded over and over by the admin
+screens. ContentAddressedStorage stores each distinct file once, under
+its SHA-256 (cas/ab/cd/<sha256>.png), so re-uploading a logo writes
+nothing new and every copy shares one URL that never changes content.
+
+Each blob has a MediaBlob row whose refs field counts the catalog rows
+that point at it. Signals keep the count current (see signals.py). When
+it drops to zero, a media.collect_blob job deletes the file after
+COLLECT_GRACE_SECONDS. An upload of the same bytes inside that window
+keeps the blob alive.
+
+dedupe_media moves existing uploads into the store and merges duplicates.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+BLOB_PREFIX = 'cas/'
+
+# Unreferenced blobs are kept this long before their file is removed
+COLLECT_GRACE_SECONDS = 3600
+
+# (model name, field name) of every image field stored in the blob store
+CATALOG_IMAGE_FIELDS = (
+    ('AdminCategory', 'image'),
+    ('AdminBrand', 'image'),
+    ('AdminModel', 'image'),
+    ('Category', 'image'),
+    ('BrandImage', 'image'),
+    ('ModelImage', 'image'),
+)
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_PREFIX)
+
+
+def blob_name(digest, extension):
+    return f'{BLOB_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{extension.lower()}'
+
+
+def hash_file(handle):
+    """(sha256 hex digest, size) of a file object, read in chunks from the start"""
+    handle.seek(0)
+    digest, size = hashlib.sha256(), 0
+    for chunk in iter(lambda: handle.read(64 * 1024), b''):
+        digest.update(chunk)
+        size += len(chunk)
+    handle.seek(0)
+    return digest.hexdigest(), size
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that names files by content
+
+    save() returns the blob name whatever name it was given. delete()
+    leaves blobs alone; they go once nothing references them.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content in _save; identical names are the point
+        return name
+
+    def _write(self, name, content):
+        """Write content to name atomically; concurrent writers of the same bytes are harmless"""
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                for chunk in content.chunks():
+                    handle.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary, self.file_permissions_mode)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+            raise
+
+    def _save(self, name, content):
+        from .models import MediaBlob
+
+        digest, size = hash_file(content)
+        name = blob_name(digest, os.path.splitext(name)[1])
+        if not self.exists(name):
+            self._write(name, content)
+        blob, created = MediaBlob.objects.get_or_create(name=name, defaults={'sha256': digest, 'size': size})
+        if not created:
+            # Refreshing updated_at holds off a pending collect_blob for the same bytes
+            MediaBlob.objects.filter(pk=blob.pk).update(updated_at=timezone.now())
+        return name
+
+    def delete(self, name):
+        if is_blob(name):
+            return
+        super().delete(name)
+
+
+_storage = None
+
+
+def catalog_storage():
+    """Storage for catalog image fields (callable so migrations don't freeze the instance)"""
+    global _storage
+    if _storage is None:
+        _storage = ContentAddressedStorage()
+    return _storage
+
+
+def retain(name):
+    """Count one more catalog row pointing at a blob"""
+    from .models import MediaBlob
+
+    if is_blob(name):
+        MediaBlob.objects.filter(name=name).update(refs=F('refs') + 1, updated_at=timezone.now())
+
+
+def release(name):
+    """Count one fewer reference; schedules the blob's collection when none are left"""
+    from .jobs import enqueue
+    from .models import MediaBlob
+
+    if not is_blob(name):
+        return
+    MediaBlob.objects.filter(name=name, refs__gt=0).update(refs=F('refs') - 1, updated_at=timezone.now())
+    if MediaBlob.objects.filter(name=name, refs=0).exists():
+        enqueue(
+            'media.collect_blob', blob=name,
+            run_after=timezone.now() + timedelta(seconds=COLLECT_GRACE_SECONDS),
+        )
+
+
+def collect(name, now=None):
+    """
+    Delete a blob's file and row if it is still unreferenced after the grace period
+
+    Returns:
+        bool: True if the blob was removed
+    """
+    from .models import MediaBlob
+
+    cutoff = (now or timezone.now()) - timedelta(seconds=COLLECT_GRACE_SECONDS)
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(name=name, refs=0, updated_at__lte=cutoff).first()
+        if blob is None:
+            return False
+        FileSystemStorage.delete(catalog_storage(), name)
+        blob.delete()
+    return True
+
+
+def collect_unreferenced(now=None):
+    """collect() every blob with no references; returns how many were removed"""
+    from .models import MediaBlob
+
+    names = list(MediaBlob.objects.filter(refs=0).values_list('name', flat=True))
+    return sum(1 for name in names if collect(name, now=now))
+
+
+def catalog_models():
+    """(model class, field name) for CATALOG_IMAGE_FIELDS"""
+    from django.apps import apps
+
+    return [(apps.get_model('gowheels', model), field) for model, field in CATALOG_IMAGE_FIELDS]
+
+
+def count_references():
+    """Counter of blob name -> catalog rows pointing at it, read from the tables"""
+    counts = Counter()
+    for model, field in catalog_models():
+        names = model.objects.filter(**{f'{field}__startswith': BLOB_PREFIX}).values_list(field, flat=True)
+        counts.update(names.iterator(chunk_size=2000))
+    return counts
+
+
+def recount_refs():
+    """Reset every MediaBlob.refs from the tables; returns the number of blobs corrected"""
+    from .models import MediaBlob
+
+    counts = count_references()
+    corrected = 0
+    for blob in MediaBlob.objects.only('name', 'refs').iterator(chunk_size=2000):
+        actual = counts.get(blob.name, 0)
+        if blob.refs != actual:
+            MediaBlob.objects.filter(pk=blob.pk).update(refs=actual, updated_at=timezone.now())
+            corrected += 1
+    return corrected
+
+
+class DedupeStats:
+    """Counters for one dedupe_media run"""
+
+    def __init__(self):
+        self.rows = 0
+        self.missing = 0
+        self.blobs = 0
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    def summary(self):
+        saved = self.bytes_before - self.bytes_after
+        return (
+            f'{self.rows} rows moved to {self.blobs} new blobs ({self.missing} missing files skipped); '
+            f'{self.bytes_before:,} bytes of originals -> {self.bytes_after:,} bytes, {saved:,} saved'
+        )
+
+
+def dedupe_catalog_media(dry_run=False, log=None):
+    """
+    Move catalog images that predate the blob store into it
+
+    Every row whose image is not yet a blob is pointed at the blob for its
+    bytes, with the same counting as an upload. Originals that no row
+    references afterwards are deleted. With dry_run nothing is written,
+    and the stats show what a real run would save.
+
+    Returns:
+        DedupeStats
+    """
+    from .models import MediaBlob
+
+    storage = catalog_storage()
+    stats = DedupeStats()
+    seen_blobs = set(MediaBlob.objects.values_list('name', flat=True))
+    originals = {}  # legacy name -> size
+    for model, field in catalog_models():
+        rows = (
+            model.objects.exclude(**{field: ''}).exclude(**{f'{field}__startswith': BLOB_PREFIX})
+            .values_list('pk', field)
+        )
+        for pk, name in rows.iterator(chunk_size=500):
+            if not storage.exists(name):
+                stats.missing += 1
+                continue
+            with storage.open(name, 'rb') as handle:
+                digest, size = hash_file(handle)
+                target = blob_name(digest, os.path.splitext(name)[1])
+                if target not in seen_blobs:
+                    seen_blobs.add(target)
+                    stats.blobs += 1
+                    stats.bytes_after += size
+                    if not dry_run:
+                        handle.seek(0)
+                        storage.save(target, handle)
+            stats.rows += 1
+            originals[name] = size
+            if not dry_run:
+                with transaction.atomic():
+                    model.objects.filter(pk=pk).update(**{field: target})
+                    retain(target)
+            if log and stats.rows % 500 == 0:
+                log(f'{stats.rows} rows processed')
+
+    stats.bytes_before = sum(originals.values())
+    if not dry_run:
+        still_used = set()
+        for model, field in catalog_models():
+            still_used.update(model.objects.filter(**{f'{field}__in': list(originals)}).values_list(field, flat=True))
+        for name in originals:
+            if name not in still_used:
+                FileSystemStorage.delete(storage, name)
+    return stats
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.26 on 2026-10-17 03:40
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def backfill_keys(apps, schema_editor):
+    Vehicle = apps.get_model('gowheels', 'Vehicle')
+    Vehicle.objects.update(
+        category_key=Lower('category_name'),
+        brand_key=Lower('brand_name'),
+        model_key=Lower('model_name'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gowheels', '0009_vehicle_manual_fuel_cost_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='brand_key',
+            field=models.CharField(blank=True, editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='category_key',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='model_key',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['approval_status', 'available', 'listing_type', 'category_key', 'brand_key', 'model_key'], name='vehicle_browse_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['approval_status', 'available', 'listing_type', 'pincode'], name='vehicle_browse_pincode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['added_by', 'approval_status'], name='vehicle_added_by_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['seller_phone'], name='vehicle_seller_phone_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.26 on 2026-10-17 03:42
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of gowheels.search as of this migration; later changes to
+# the live tokenizer must not change what this migration writes
+FIELD_WEIGHTS = {
+    'brand_name': 3,
+    'model_name': 3,
+    'category_name': 2,
+    'state': 1,
+    'year': 1,
+}
+TOKEN_MAX_LENGTH = 50
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def vehicle_tokens(vehicle):
+    tokens = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        text = str(getattr(vehicle, field) or '').lower()
+        for token in {token[:TOKEN_MAX_LENGTH] for token in TOKEN_RE.findall(text)}:
+            tokens[token] = tokens.get(token, 0) + weight
+    return tokens
+
+
+def build_search_index(apps, schema_editor):
+    Vehicle = apps.get_model('gowheels', 'Vehicle')
+    VehicleSearchToken = apps.get_model('gowheels', 'VehicleSearchToken')
+    rows = []
+    for vehicle in Vehicle.objects.only('id', *FIELD_WEIGHTS).iterator(chunk_size=1000):
+        rows.extend(
+            VehicleSearchToken(token=token, vehicle_id=vehicle.pk, weight=weight)
+            for token, weight in vehicle_tokens(vehicle).items()
+        )
+        if len(rows) >= 1000:
+            VehicleSearchToken.objects.bulk_create(rows)
+            rows = []
+    VehicleSearchToken.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gowheels', '0010_vehicle_browse_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehicleSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=50)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('vehicle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='gowheels.vehicle')),
+            ],
+            options={
+                'unique_together': {('token', 'vehicle')},
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.26 on 2026-10-17 03:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_listings(apps, schema_editor):
+    # Cards as VehicleListingSerializer rendered them when this table was added;
+    # seller_phone/owner_name stay '' in the card and are resolved at read time
+    Vehicle = apps.get_model('gowheels', 'Vehicle')
+    VehicleListing = apps.get_model('gowheels', 'VehicleListing')
+    vehicles = (
+        Vehicle.objects.filter(available=True, approval_status='approved')
+        .prefetch_related(models.Prefetch('images', queryset=apps.get_model('gowheels', 'VehicleImage').objects.order_by('id')))
+        .order_by('id')
+    )
+    rows = []
+    for vehicle in vehicles.iterator(chunk_size=500):
+        rows.append(VehicleListing(
+            vehicle_id=vehicle.id,
+            listing_type=vehicle.listing_type,
+            category_key=vehicle.category_key,
+            brand_key=vehicle.brand_key,
+            model_key=vehicle.model_key,
+            pincode=vehicle.pincode or '',
+            year=vehicle.year,
+            price=vehicle.price,
+            seller_phone=vehicle.seller_phone or '',
+            owner_name=vehicle.owner_name or '',
+            card={
+                'id': int(vehicle.id),
+                'category_name': str(vehicle.category_name),
+                'brand_name': str(vehicle.brand_name),
+                'model_name': str(vehicle.model_name),
+                'year': int(vehicle.year),
+                'price': str(vehicle.price),
+                'per_day_price': str(vehicle.per_day_price or 0),
+                'per_hour_price': str(vehicle.per_hour_price or 0),
+                'pricing_type': str(vehicle.pricing_type),
+                'listing_type': str(vehicle.listing_type),
+                'unit_type': str(vehicle.unit_type or 'unit_price'),
+                'seller_phone': '',
+                'pincode': str(vehicle.pincode or ''),
+                'village': str(vehicle.village or ''),
+                'owner_name': '',
+                'location': f"{vehicle.village or ''}, {vehicle.pincode}".strip(', '),
+                'manual_maintenance_cost': str(vehicle.manual_maintenance_cost or ''),
+                'manual_fuel_cost': str(vehicle.manual_fuel_cost or ''),
+                'manual_insurance_cost': str(vehicle.manual_insurance_cost or ''),
+                'images': [image.image.url for image in vehicle.images.all()],
+            },
+        ))
+        if len(rows) >= 500:
+            VehicleListing.objects.bulk_create(rows)
+            rows = []
+    VehicleListing.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gowheels', '0011_vehicle_search_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehicleListing',
+            fields=[
+                ('vehicle', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='gowheels.vehicle')),
+                ('listing_type', models.CharField(max_length=10)),
+                ('category_key', models.CharField(max_length=100)),
+                ('brand_key', models.CharField(max_length=50)),
+                ('model_key', models.CharField(max_length=100)),
+                ('pincode', models.CharField(blank=True, max_length=10)),
+                ('year', models.IntegerField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('seller_phone', models.CharField(blank=True, max_length=255)),
+                ('owner_name', models.CharField(blank=True, max_length=255)),
+                ('card', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['listing_type', 'category_key', 'brand_key', 'model_key'], name='listing_browse_idx'), models.Index(fields=['listing_type', 'pincode'], name='listing_pincode_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_listings, migrations.RunPython.noop),
+    ]
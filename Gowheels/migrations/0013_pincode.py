@@ -0,0 +1,42 @@
+# Generated by Django 4.2.26 on 2026-10-17 03:50
+
+from django.db import migrations, models
+
+
+def create_pincode_table(apps, schema_editor):
+    # create_pincode_table.sql may already have made the table by hand
+    Pincode = apps.get_model('gowheels', 'Pincode')
+    if Pincode._meta.db_table not in schema_editor.connection.introspection.table_names():
+        schema_editor.create_model(Pincode)
+
+
+def drop_pincode_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('gowheels', 'Pincode'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gowheels', '0012_vehicle_listing'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Pincode',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('code', models.CharField(max_length=6, unique=True)),
+                        ('city', models.CharField(max_length=100)),
+                        ('state', models.CharField(max_length=50)),
+                        ('latitude', models.FloatField()),
+                        ('longitude', models.FloatField()),
+                        ('created_at', models.DateTimeField(auto_now_add=True)),
+                    ],
+                ),
+            ],
+        ),
+        # Database side runs after the state change so the historical model exists
+        migrations.RunPython(create_pincode_table, drop_pincode_table),
+    ]
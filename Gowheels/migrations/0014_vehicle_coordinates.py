@@ -0,0 +1,53 @@
+# Generated by Django 4.2.26 on 2026-10-17 03:52
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_coordinates(apps, schema_editor):
+    Pincode = apps.get_model('gowheels', 'Pincode')
+    pincode = Pincode.objects.filter(code=OuterRef('pincode'))
+    for model_name in ('Vehicle', 'VehicleListing'):
+        apps.get_model('gowheels', model_name).objects.update(
+            latitude=Subquery(pincode.values('latitude')[:1]),
+            longitude=Subquery(pincode.values('longitude')[:1]),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gowheels', '0013_pincode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vehiclelisting',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='vehiclelisting',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_coordinates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['approval_status', 'available', 'listing_type', 'latitude', 'longitude'], name='vehicle_browse_geo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiclelisting',
+            index=models.Index(fields=['listing_type', 'latitude', 'longitude'], name='listing_geo_idx'),
+        ),
+    ]
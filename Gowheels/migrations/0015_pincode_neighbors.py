@@ -0,0 +1,32 @@
+# Generated by Django 4.2.26 on 2026-10-17 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gowheels', '0014_vehicle_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pincodemapping',
+            name='distance_km',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='pincodemapping',
+            name='radius_km',
+            field=models.PositiveSmallIntegerField(default=50),
+        ),
+        migrations.AddField(
+            model_name='pincodemapping',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='pincodemapping',
+            index=models.Index(fields=['main_pincode', 'radius_km', 'distance_km'], name='pincode_neighbor_idx'),
+        ),
+    ]
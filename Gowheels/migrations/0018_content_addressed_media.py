@@ -0,0 +1,56 @@
+# Generated by Django 4.2.26 on 2026-10-17 04:07
+
+import gowheels.media_storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gowheels', '0017_background_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('refs', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='adminbrand',
+            name='image',
+            field=models.ImageField(storage=gowheels.media_storage.catalog_storage, upload_to='brands/'),
+        ),
+        migrations.AlterField(
+            model_name='admincategory',
+            name='image',
+            field=models.ImageField(storage=gowheels.media_storage.catalog_storage, upload_to='categories/'),
+        ),
+        migrations.AlterField(
+            model_name='adminmodel',
+            name='image',
+            field=models.ImageField(storage=gowheels.media_storage.catalog_storage, upload_to='models/'),
+        ),
+        migrations.AlterField(
+            model_name='brandimage',
+            name='image',
+            field=models.ImageField(storage=gowheels.media_storage.catalog_storage, upload_to='brands/'),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='image',
+            field=models.ImageField(storage=gowheels.media_storage.catalog_storage, upload_to='categories/'),
+        ),
+        migrations.AlterField(
+            model_name='modelimage',
+            name='image',
+            field=models.ImageField(storage=gowheels.media_storage.catalog_storage, upload_to='models/'),
+        ),
+    ]
@@ -1,11 +1,13 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+import math
 import uuid
 import random
 import string
-from .encryption import Cipher
+from .encryption import get_cipher
 from .crypto_utils import generate_secure_token
+from .media_storage import catalog_storage
 
 class OTP(models.Model):
     phone = models.CharField(max_length=15, db_index=True)
@@ -35,7 +37,7 @@ class AdminGroup(models.Model):
 
 class AdminCategory(models.Model):
     name = models.CharField(max_length=100)
-    image = models.ImageField(upload_to='categories/')
+    image = models.ImageField(upload_to='categories/', storage=catalog_storage)
     group = models.ForeignKey(AdminGroup, on_delete=models.CASCADE, related_name='categories')
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -44,7 +46,7 @@ class AdminCategory(models.Model):
 
 class AdminBrand(models.Model):
     name = models.CharField(max_length=100)
-    image = models.ImageField(upload_to='brands/')
+    image = models.ImageField(upload_to='brands/', storage=catalog_storage)
     category = models.ForeignKey(AdminCategory, on_delete=models.CASCADE, related_name='brands')
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -53,7 +55,7 @@ class AdminBrand(models.Model):
 
 class AdminModel(models.Model):
     name = models.CharField(max_length=100)
-    image = models.ImageField(upload_to='models/')
+    image = models.ImageField(upload_to='models/', storage=catalog_storage)
     brand = models.ForeignKey(AdminBrand, on_delete=models.CASCADE, related_name='models')
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -88,30 +90,65 @@ class UserProfile(models.Model):
     def get_phone(self):
         """Get decrypted phone number"""
         try:
-            cipher = Cipher()
-            return cipher.decrypt(self.phone)
+            return get_cipher().decrypt(self.phone)
         except:
             return self.phone  # Fallback for unencrypted data
     
     def set_phone(self, phone_number):
         """Set encrypted phone number"""
-        cipher = Cipher()
-        self.phone = cipher.encrypt(phone_number)
+        self.phone = get_cipher().encrypt(phone_number)
     
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.unique_id}"
 
 class PincodeMapping(models.Model):
+    """Precomputed neighbor pair; filled by precompute_pincode_neighbors (see neighbors.py)"""
     main_pincode = models.CharField(max_length=10)
     nearby_pincode = models.CharField(max_length=10)
+    # Smallest standard search radius (5/10/25/50 km) that contains the pair
+    radius_km = models.PositiveSmallIntegerField(default=50)
+    distance_km = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         unique_together = ('main_pincode', 'nearby_pincode')
+        indexes = [
+            models.Index(fields=['main_pincode', 'radius_km', 'distance_km'], name='pincode_neighbor_idx'),
+        ]
     
     def __str__(self):
         return f"{self.main_pincode} → {self.nearby_pincode}"
 
+class Pincode(models.Model):
+    code = models.CharField(max_length=6, unique=True)
+    city = models.CharField(max_length=100)
+    state = models.CharField(max_length=50)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.code} - {self.city}, {self.state}"
+    
+    @staticmethod
+    def haversine_distance(lat1, lng1, lat2, lng2):
+        R = 6371
+        lat1, lng1, lat2, lng2 = map(math.radians, [lat1, lng1, lat2, lng2])
+        dlat = lat2 - lat1
+        dlng = lng2 - lng1
+        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng/2)**2
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+        return R * c
+    
+    @classmethod
+    def get_nearby_pincodes(cls, pincode, radius_km=10):
+        from .neighbors import nearby_pincodes as precomputed_neighbors
+        nearby_pincodes = precomputed_neighbors(pincode, radius_km)
+        if nearby_pincodes is None:
+            return [pincode]
+        return nearby_pincodes
+
 class Category(models.Model):
     TYPE_CHOICES = [
         ('group1', 'Group 1'),
@@ -121,7 +158,7 @@ class Category(models.Model):
     
     name = models.CharField(max_length=100)
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
-    image = models.ImageField(upload_to='categories/')
+    image = models.ImageField(upload_to='categories/', storage=catalog_storage)
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
@@ -201,32 +238,87 @@ class Vehicle(models.Model):
     manual_insurance_cost = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Lower-cased copies of the catalog names so case-insensitive browse
+    # filters are plain equality lookups that can use vehicle_browse_idx
+    category_key = models.CharField(max_length=100, blank=True, editable=False)
+    brand_key = models.CharField(max_length=50, blank=True, editable=False)
+    model_key = models.CharField(max_length=100, blank=True, editable=False)
+    # Coordinates of the pincode, resolved from the Pincode table on save
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    
+    class Meta:
+        indexes = [
+            # get_vehicles / get_vehicles_map: status filters, then catalog drill-down
+            models.Index(
+                fields=['approval_status', 'available', 'listing_type', 'category_key', 'brand_key', 'model_key'],
+                name='vehicle_browse_idx',
+            ),
+            # get_vehicles with a pincode range
+            models.Index(
+                fields=['approval_status', 'available', 'listing_type', 'pincode'],
+                name='vehicle_browse_pincode_idx',
+            ),
+            # Radius searches: bounding-box prefilter before the exact distance
+            models.Index(
+                fields=['approval_status', 'available', 'listing_type', 'latitude', 'longitude'],
+                name='vehicle_browse_geo_idx',
+            ),
+            # State admin / approval dashboards
+            models.Index(fields=['added_by', 'approval_status'], name='vehicle_added_by_status_idx'),
+            # Seller dashboard
+            models.Index(fields=['seller_phone'], name='vehicle_seller_phone_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         # Don't encrypt - store as plain text
+        self.normalize_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'pincode' in update_fields:
+            self.resolve_coordinates()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'latitude', 'longitude'}
         super().save(*args, **kwargs)
     
-    def get_seller_phone(self):
+    def resolve_coordinates(self):
+        """Look up latitude/longitude for the pincode; None when it is not in the Pincode table"""
+        coordinates = None
+        if self.pincode:
+            coordinates = Pincode.objects.filter(code=self.pincode).values_list('latitude', 'longitude').first()
+        self.latitude, self.longitude = coordinates or (None, None)
+    
+    def normalize_keys(self):
+        """Refresh the lower-cased lookup columns; call before bulk_create/bulk_update"""
+        self.category_key = (self.category_name or '').lower()
+        self.brand_key = (self.brand_name or '').lower()
+        self.model_key = (self.model_name or '').lower()
+    
+    @staticmethod
+    def is_encrypted(value):
+        """Fernet tokens are base64 and always start with gAAAA"""
+        return bool(value) and (value.startswith('gAAAA') or '==' in value)
+    
+    def get_seller_phone(self, cipher=None):
         """Get seller phone (handle both encrypted and plain text)"""
         if not self.seller_phone:
             return ''
         # If encrypted, try to decrypt, otherwise return placeholder
-        if self.seller_phone.startswith('gAAAA') or '==' in self.seller_phone:
+        if self.is_encrypted(self.seller_phone):
             try:
-                cipher = Cipher()
+                cipher = cipher or get_cipher()
                 return cipher.decrypt(self.seller_phone)
             except:
                 return 'Not Available'
         return self.seller_phone
     
-    def get_owner_name(self):
+    def get_owner_name(self, cipher=None):
         """Get owner name (handle both encrypted and plain text)"""
         if not self.owner_name:
             return ''
         # If encrypted, try to decrypt, otherwise return placeholder
-        if self.owner_name.startswith('gAAAA') or '==' in self.owner_name:
+        if self.is_encrypted(self.owner_name):
             try:
-                cipher = Cipher()
+                cipher = cipher or get_cipher()
                 return cipher.decrypt(self.owner_name)
             except:
                 return 'Owner'
@@ -238,6 +330,8 @@ class Vehicle(models.Model):
 class VehicleImage(models.Model):
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='vehicles/seller/')
+    # Resized copies written by image_variants: {variant: {width, height, webp, jpeg}}
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
@@ -246,12 +340,28 @@ class VehicleImage(models.Model):
 class VehicleVideo(models.Model):
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='videos')
     video = models.FileField(upload_to='vehicles/seller/videos/')
-    duration = models.FloatField(default=0)  # Duration in seconds
+    duration = models.FloatField(default=0)  # Duration in seconds, filled in by the media.video_duration job
+    poster = models.ImageField(upload_to='vehicles/seller/videos/posters/', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
         return f"Video for {self.vehicle} ({self.duration}s)"
 
+class VideoUpload(models.Model):
+    """In-progress resumable video upload (see chunked_upload.py); the bytes live in a partial file"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='video_uploads')
+    uploader_phone = models.CharField(max_length=15)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Upload {self.id} ({self.received}/{self.size} bytes)"
+
 class BrandImage(models.Model):
     CATEGORY_CHOICES = [
         ('car', 'Car'),
@@ -262,7 +372,7 @@ class BrandImage(models.Model):
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     category_ref = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='brands', null=True, blank=True)
     name = models.CharField(max_length=100, default='Brand Name')
-    image = models.ImageField(upload_to='brands/')
+    image = models.ImageField(upload_to='brands/', storage=catalog_storage)
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
@@ -278,7 +388,7 @@ class ModelImage(models.Model):
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     brand = models.ForeignKey(BrandImage, on_delete=models.CASCADE, related_name='models', null=True, blank=True)
     name = models.CharField(max_length=100, default='Model Name')
-    image = models.ImageField(upload_to='models/')
+    image = models.ImageField(upload_to='models/', storage=catalog_storage)
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
@@ -354,4 +464,110 @@ class Wishlist(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.user_phone} - {self.vehicle}"
\ No newline at end of file
+        return f"{self.user_phone} - {self.vehicle}"
+class VehicleSearchToken(models.Model):
+    """Inverted index row: one lower-cased token of a vehicle's searchable text"""
+    token = models.CharField(max_length=50)
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='search_tokens')
+    weight = models.PositiveSmallIntegerField(default=1)
+    
+    class Meta:
+        unique_together = ('token', 'vehicle')
+    
+    def __str__(self):
+        return f"{self.token} -> {self.vehicle_id}"
+
+class VehicleListing(models.Model):
+    """
+    Read model: the ready-made browse card of one approved, available vehicle
+    
+    Maintained by signals (see read_model.py); never edit directly.
+    seller_phone/owner_name keep the stored (possibly encrypted) values so
+    this table holds no more plaintext than Vehicle does.
+    """
+    vehicle = models.OneToOneField(Vehicle, on_delete=models.CASCADE, primary_key=True, related_name='listing')
+    listing_type = models.CharField(max_length=10)
+    category_key = models.CharField(max_length=100)
+    brand_key = models.CharField(max_length=50)
+    model_key = models.CharField(max_length=100)
+    pincode = models.CharField(max_length=10, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    year = models.IntegerField()
+    price = models.DecimalField(max_digits=8, decimal_places=2)
+    seller_phone = models.CharField(max_length=255, blank=True)
+    owner_name = models.CharField(max_length=255, blank=True)
+    card = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['listing_type', 'category_key', 'brand_key', 'model_key'], name='listing_browse_idx'),
+            models.Index(fields=['listing_type', 'pincode'], name='listing_pincode_idx'),
+            models.Index(fields=['listing_type', 'latitude', 'longitude'], name='listing_geo_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Listing {self.vehicle_id}"
+
+class Job(models.Model):
+    """
+    Queued background job (see jobs.py)
+    
+    Rows are deleted when the job succeeds and moved to DeadJob once it
+    has used up max_attempts.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+    ]
+    
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} {self.payload} ({self.status})"
+
+class DeadJob(models.Model):
+    """Dead letter: a job that failed permanently or ran out of retries"""
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    queued_at = models.DateTimeField()
+    failed_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.name} {self.payload} (dead)"
+
+class MediaBlob(models.Model):
+    """
+    One stored file in the content-addressed catalog image store (see media_storage.py)
+    
+    refs counts the catalog rows pointing at name; the file is collected
+    once it has been zero for a grace period.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    refs = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.refs} refs)"
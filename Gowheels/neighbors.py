@@ -0,0 +1,227 @@
+"""
+Precomputed pincode neighbor graph for GoWheels
+precompute_pincode_neighbors stores every pincode pair within
+max(STANDARD_RADII) km in PincodeMapping, tagged with the smallest
+standard radius that contains it, so "pincodes within 10 km of X" is one
+indexed range query on (main_pincode, radius_km).
+
+A Pincode edit, delete or bulk import only recomputes the pairs of the
+pincodes it touched (refresh_pincodes). Lookups are cached per process and dropped when the
+PINCODES cache namespace moves, checked at most every REFRESH_INTERVAL
+seconds.
+"""
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import PINCODES
+from .spatial import PincodeGridIndex, get_index
+
+STANDARD_RADII = (5, 10, 25, 50)
+
+# Seconds between checks of the shared PINCODES version
+REFRESH_INTERVAL = 30
+
+# Largest number of cached (pincode, radius) lookups per process
+MAX_CACHED_LOOKUPS = 20000
+
+
+def radius_band(distance_km):
+    """Smallest standard radius containing distance_km, or None beyond the largest"""
+    for radius in STANDARD_RADII:
+        if distance_km <= radius:
+            return radius
+    return None
+
+
+def neighbor_rows(index, codes):
+    """(main, nearby, radius_km, distance_km) for every pair within max(STANDARD_RADII)"""
+    rows = []
+    for code in codes:
+        lat, lng = index.coordinates(code)
+        for nearby, distance in index.query(lat, lng, STANDARD_RADII[-1]):
+            rows.append((code, nearby, radius_band(distance), round(distance, 3)))
+    return rows
+
+
+# Process pool workers build their own index once from the parent's points
+_worker_index = None
+
+
+def _init_worker(points):
+    global _worker_index
+    _worker_index = PincodeGridIndex(points)
+
+
+def _worker_rows(codes):
+    return neighbor_rows(_worker_index, codes)
+
+
+def iter_neighbor_rows(points, workers=1, chunk_size=500):
+    """
+    Yield batches of neighbor rows for every point
+
+    With workers > 1 the pincodes are split into chunks and spread across
+    a process pool; each worker gets the points once, at start-up.
+    """
+    codes = [code for code, _, _ in points]
+    chunks = [codes[i:i + chunk_size] for i in range(0, len(codes), chunk_size)]
+    if workers <= 1:
+        index = PincodeGridIndex(points)
+        for chunk in chunks:
+            yield neighbor_rows(index, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(points,)) as pool:
+        yield from pool.map(_worker_rows, chunks)
+
+
+def precompute_neighbors(workers=1, batch_size=5000, log=None):
+    """
+    Rebuild PincodeMapping from the Pincode table
+
+    Rows are upserted on (main_pincode, nearby_pincode); pairs that no
+    longer come out of the computation are deleted at the end.
+
+    Returns:
+        int: number of neighbor pairs written
+    """
+    from .models import Pincode, PincodeMapping
+
+    started = timezone.now()
+    points = list(Pincode.objects.values_list('code', 'latitude', 'longitude'))
+    # MySQL takes no conflict target; it upserts on the (main_pincode, nearby_pincode) unique key
+    conflict_target = {}
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_target['unique_fields'] = ['main_pincode', 'nearby_pincode']
+    written = 0
+    for rows in iter_neighbor_rows(points, workers=workers):
+        PincodeMapping.objects.bulk_create(
+            [
+                PincodeMapping(main_pincode=main, nearby_pincode=nearby, radius_km=radius, distance_km=distance)
+                for main, nearby, radius, distance in rows
+            ],
+            batch_size=batch_size,
+            update_conflicts=True,
+            update_fields=['radius_km', 'distance_km', 'updated_at'],
+            **conflict_target,
+        )
+        written += len(rows)
+        if log:
+            log(f'{written} neighbor pairs written')
+
+    PincodeMapping.objects.filter(updated_at__lt=started).delete()
+    PINCODES.bump()
+    clear_cache()
+    return written
+
+
+def refresh_pincodes(codes, removed=(), batch_size=5000):
+    """
+    Rewrite the pairs of the given pincodes, in both directions
+
+    codes were added, moved or edited; removed codes (deleted, or the old
+    side of a rename) just lose their rows. Nothing is written while the
+    table has not been precomputed; lookups use the grid index then. The
+    grid index must already reflect the changes.
+
+    Returns:
+        int: number of neighbor pairs written
+    """
+    from .models import PincodeMapping
+
+    codes = set(codes)
+    touched = codes | set(removed)
+    pairs = {}
+    with transaction.atomic():
+        precomputed = PincodeMapping.objects.exists()
+        PincodeMapping.objects.filter(Q(main_pincode__in=touched) | Q(nearby_pincode__in=touched)).delete()
+        if precomputed:
+            index = get_index()
+            present = [code for code in sorted(codes) if index.coordinates(code) is not None]
+            for main, nearby, radius, distance in neighbor_rows(index, present):
+                # A pair between two refreshed codes comes out once from each side
+                pairs[main, nearby] = pairs[nearby, main] = (radius, distance)
+            PincodeMapping.objects.bulk_create(
+                [
+                    PincodeMapping(main_pincode=main, nearby_pincode=nearby, radius_km=radius, distance_km=distance)
+                    for (main, nearby), (radius, distance) in pairs.items()
+                ],
+                batch_size=batch_size,
+            )
+    clear_cache()
+    return len(pairs)
+
+
+def refresh_pincode(code, previous_code=None, deleted=False):
+    """refresh_pincodes for one edited pincode"""
+    if deleted:
+        return refresh_pincodes([], removed=[code])
+    return refresh_pincodes([code], removed=[previous_code] if previous_code else [])
+
+
+class _NeighborCache:
+    """Per-process lookup cache, cleared when the shared PINCODES version moves"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.version = None
+        self.checked_at = 0.0
+
+    def get(self, key, load):
+        now = time.monotonic()
+        with self.lock:
+            if now - self.checked_at >= REFRESH_INTERVAL:
+                self.checked_at = now
+                version = PINCODES.version()
+                if version != self.version:
+                    self.entries.clear()
+                    self.version = version
+            if key in self.entries:
+                return self.entries[key]
+        value = load()
+        with self.lock:
+            if len(self.entries) >= MAX_CACHED_LOOKUPS:
+                self.entries.clear()
+            self.entries[key] = value
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.checked_at = 0.0
+
+
+_cache = _NeighborCache()
+
+
+def _load_neighbors(code, radius_km):
+    from .models import PincodeMapping
+
+    band = radius_band(radius_km)
+    if band is None:
+        # Beyond the precomputed radii: ask the grid index directly
+        return get_index().nearby(code, radius_km)
+    nearby = list(
+        PincodeMapping.objects
+        .filter(main_pincode=code, radius_km__lte=band, distance_km__lte=radius_km)
+        .order_by('distance_km', 'nearby_pincode')
+        .values_list('nearby_pincode', flat=True)
+    )
+    # Every precomputed pincode lists itself, so no rows means not precomputed
+    return nearby or get_index().nearby(code, radius_km)
+
+
+def nearby_pincodes(code, radius_km=10):
+    """Pincodes within radius_km of code, nearest first; None if code is unknown"""
+    return _cache.get((code, radius_km), lambda: _load_neighbors(code, radius_km))
+
+
+def clear_cache(**kwargs):
+    """Drop this process's cached lookups; safe to use as a signal receiver"""
+    _cache.clear()
@@ -0,0 +1,136 @@
+"""
+Keyset (cursor) pagination for listing endpoints
+Pages are fetched with WHERE (created_at, id) < (last seen) instead of
+OFFSET, so every page costs the same no matter how deep the client goes.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE):
+    """Page size from a ?limit= value, clamped to 1..MAX_PAGE_SIZE; default when missing or bad"""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+class CursorPaginator:
+    """
+    Paginate a queryset on a unique descending key
+
+    Usage:
+        page = CursorPaginator(request).paginate(queryset)
+        for vehicle in page.items: ...
+        return JsonResponse({'vehicles': data, **page.meta()})
+
+    Query params:
+        limit          page size, clamped to MAX_PAGE_SIZE
+        cursor         next_cursor from the previous response
+        include_total  '1' to add the (costly) total row count
+    """
+
+    def __init__(self, request, ordering=('-id',), default_limit=DEFAULT_PAGE_SIZE):
+        self.ordering = ordering
+        self.fields = [field.lstrip('-') for field in ordering]
+        self.descending = [field.startswith('-') for field in ordering]
+        self.limit = parse_limit(request.GET.get('limit'), default_limit)
+        self.cursor = self.decode(request.GET.get('cursor'))
+        self.include_total = request.GET.get('include_total') in ('1', 'true')
+
+    def decode(self, cursor):
+        """Turn an opaque cursor back into the list of key values"""
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        except (ValueError, UnicodeDecodeError):
+            raise InvalidCursor('Invalid cursor')
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor('Invalid cursor')
+        return [self._load(field, value) for field, value in zip(self.fields, values)]
+
+    def encode(self, row):
+        """Build the opaque cursor pointing just after row"""
+        values = [self._dump(self._value(row, field)) for field in self.fields]
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def _value(row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    @staticmethod
+    def _dump(value):
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    @staticmethod
+    def _load(field, value):
+        if field.endswith('_at'):
+            parsed = parse_datetime(value) if isinstance(value, str) else None
+            if parsed is None:
+                raise InvalidCursor('Invalid cursor')
+            return parsed
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise InvalidCursor('Invalid cursor')
+        return value
+
+    def _after_cursor(self):
+        """(a, b) < (x, y)  ==  a < x OR (a = x AND b < y), honouring direction"""
+        condition = Q()
+        for i, field in enumerate(self.fields):
+            lookup = 'lt' if self.descending[i] else 'gt'
+            term = Q(**{f'{field}__{lookup}': self.cursor[i]})
+            for prev in range(i):
+                term &= Q(**{self.fields[prev]: self.cursor[prev]})
+            condition |= term
+        return condition
+
+    def paginate(self, queryset):
+        total = queryset.count() if self.include_total else None
+
+        queryset = queryset.order_by(*self.ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self._after_cursor())
+
+        # Fetch one extra row to learn whether another page exists
+        rows = list(queryset[:self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+
+        next_cursor = self.encode(rows[-1]) if has_more and rows else None
+        return Page(rows, next_cursor, self.limit, total)
+
+
+class Page:
+    """One page of results plus the metadata clients need to fetch the next"""
+
+    def __init__(self, items, next_cursor, limit, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.limit = limit
+        self.total = total
+
+    def meta(self):
+        meta = {
+            'next_cursor': self.next_cursor,
+            'has_more': self.next_cursor is not None,
+            'limit': self.limit,
+        }
+        if self.total is not None:
+            meta['total'] = self.total
+        return meta
@@ -0,0 +1,223 @@
+"""
+Pincode CSV importer for GoWheels
+Streams the India Post directory CSV (Pincode, District, StateName,
+Latitude, Longitude), keeps the first usable row per pincode, compares
+the result with the Pincode table and writes only new or changed rows
+with a true upsert, so a re-import of an unchanged file writes nothing.
+
+On MySQL, when the connection allows LOAD DATA LOCAL INFILE
+(OPTIONS={'local_infile': 1}), the changed rows go through a temporary
+staging table and one INSERT ... ON DUPLICATE KEY UPDATE. Every other
+backend uses bulk_create(update_conflicts=True).
+"""
+
+import csv
+import logging
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Pincode
+from .spatial import pincodes_updated
+
+logger = logging.getLogger('gowheels.pincode_import')
+
+COLUMNS = {'code': 'Pincode', 'city': 'District', 'state': 'StateName', 'latitude': 'Latitude', 'longitude': 'Longitude'}
+FIELDS = ('city', 'state', 'latitude', 'longitude')
+MAX_CODE_LENGTH = Pincode._meta.get_field('code').max_length
+
+
+class ImportStats:
+    """Counters for one import run"""
+
+    def __init__(self):
+        self.rows = 0
+        self.skipped = 0
+        self.pincodes = 0
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.parse_seconds = 0.0
+        self.write_seconds = 0.0
+        self.fast_path = False
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.parse_seconds + self.write_seconds
+        return self.rows / elapsed if elapsed else float(self.rows)
+
+    def summary(self):
+        return (
+            f'{self.rows} rows ({self.skipped} skipped) -> {self.pincodes} pincodes; '
+            f'{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged; '
+            f'parse {self.parse_seconds:.2f}s, write {self.write_seconds:.2f}s'
+            f'{" via LOAD DATA" if self.fast_path else ""}, {self.rows_per_second:,.0f} rows/s'
+        )
+
+
+def _clean(record, positions):
+    """(code, city, state, latitude, longitude) for a CSV record, or None if unusable"""
+    try:
+        code = record[positions['code']].strip()
+        latitude = float(record[positions['latitude']])
+        longitude = float(record[positions['longitude']])
+    except (IndexError, ValueError):  # short rows, 'NA' coordinates
+        return None
+    if not code or len(code) > MAX_CODE_LENGTH:
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return (
+        code,
+        record[positions['city']].strip(),
+        record[positions['state']].strip(),
+        latitude,
+        longitude,
+    )
+
+
+def parse_chunks(lines, chunk_size=10000):
+    """Stream CSV text lines as (cleaned rows, skipped count) per chunk_size records"""
+    reader = csv.reader(lines)
+    header = [name.strip() for name in next(reader, [])]
+    try:
+        positions = {field: header.index(column) for field, column in COLUMNS.items()}
+    except ValueError:
+        raise ValueError(f'CSV header must contain {", ".join(COLUMNS.values())}')
+
+    rows, skipped = [], 0
+    for record in reader:
+        row = _clean(record, positions)
+        if row is None:
+            skipped += 1
+        else:
+            rows.append(row)
+        if len(rows) + skipped >= chunk_size:
+            yield rows, skipped
+            rows, skipped = [], 0
+    if rows or skipped:
+        yield rows, skipped
+
+
+def changed_rows(parsed):
+    """Split {code: row} into (new rows, changed rows, unchanged count) against the table"""
+    existing = {
+        code: (city, state, latitude, longitude)
+        for code, city, state, latitude, longitude
+        in Pincode.objects.values_list('code', *FIELDS).iterator(chunk_size=5000)
+    }
+    new, changed, unchanged = [], [], 0
+    for code, row in parsed.items():
+        current = existing.get(code)
+        if current is None:
+            new.append(row)
+        elif current != row[1:]:
+            changed.append(row)
+        else:
+            unchanged += 1
+    return new, changed, unchanged
+
+
+def _fast_path_available():
+    return connection.vendor == 'mysql' and bool(
+        settings.DATABASES[connection.alias].get('OPTIONS', {}).get('local_infile')
+    )
+
+
+def _tsv_value(value):
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+def _load_data_upsert(rows):
+    """MySQL: LOAD DATA LOCAL INFILE into a staging table, then one upsert"""
+    table = connection.ops.quote_name(Pincode._meta.db_table)
+    with tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False, encoding='utf-8') as handle:
+        for row in rows:
+            handle.write('\t'.join(_tsv_value(value) for value in row) + '\n')
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TEMPORARY TABLE IF EXISTS pincode_import')
+            cursor.execute(
+                'CREATE TEMPORARY TABLE pincode_import ('
+                'code VARCHAR(10) PRIMARY KEY, city VARCHAR(100), state VARCHAR(50), '
+                'latitude DOUBLE, longitude DOUBLE)'
+            )
+            cursor.execute(
+                "LOAD DATA LOCAL INFILE %s INTO TABLE pincode_import CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                "(code, city, state, latitude, longitude)",
+                [handle.name],
+            )
+            cursor.execute(
+                f'INSERT INTO {table} (code, city, state, latitude, longitude, created_at) '
+                'SELECT code, city, state, latitude, longitude, %s FROM pincode_import '
+                'ON DUPLICATE KEY UPDATE city = VALUES(city), state = VALUES(state), '
+                'latitude = VALUES(latitude), longitude = VALUES(longitude)',
+                [connection.ops.adapt_datetimefield_value(timezone.now())],
+            )
+            cursor.execute('DROP TEMPORARY TABLE pincode_import')
+    finally:
+        os.unlink(handle.name)
+
+
+def _bulk_upsert(rows, batch_size):
+    # MySQL takes no conflict target; it upserts on the unique code column
+    conflict_target = {}
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_target['unique_fields'] = ['code']
+    Pincode.objects.bulk_create(
+        [Pincode(code=code, city=city, state=state, latitude=lat, longitude=lng) for code, city, state, lat, lng in rows],
+        batch_size=batch_size,
+        update_conflicts=True,
+        update_fields=list(FIELDS),
+        **conflict_target,
+    )
+
+
+def import_pincodes(lines, batch_size=2000, fast_path=True, log=None):
+    """
+    Import pincodes from CSV text lines
+
+    Only pincodes that are new or whose city/state/coordinates differ
+    from the table are written. pincodes_updated is sent with the
+    touched codes when anything changed.
+
+    Returns:
+        ImportStats
+    """
+    stats = ImportStats()
+    parsed = {}
+    started = time.monotonic()
+    for rows, skipped in parse_chunks(lines):
+        stats.rows += len(rows) + skipped
+        stats.skipped += skipped
+        for row in rows:
+            # The directory lists every post office; keep the first for each pincode
+            parsed.setdefault(row[0], row)
+        if log:
+            log(f'Parsed {stats.rows} rows ({len(parsed)} pincodes)')
+    stats.pincodes = len(parsed)
+    stats.parse_seconds = time.monotonic() - started
+
+    started = time.monotonic()
+    new, changed, stats.unchanged = changed_rows(parsed)
+    stats.inserted, stats.updated = len(new), len(changed)
+    rows = new + changed
+    if rows:
+        stats.fast_path = fast_path and _fast_path_available()
+        with transaction.atomic():
+            if stats.fast_path:
+                _load_data_upsert(rows)
+            else:
+                _bulk_upsert(rows, batch_size)
+    stats.write_seconds = time.monotonic() - started
+
+    if rows:
+        # Upserts skip post_save, so tell the spatial index and vehicles explicitly
+        pincodes_updated.send(sender=Pincode, codes=[row[0] for row in rows])
+    logger.info('Pincode import: %s', stats.summary())
+    return stats
@@ -3,11 +3,15 @@ Rate Limiting Middleware
 Implements IP-based, user-based, and endpoint-based rate limiting
 """
 from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
 from django.http import JsonResponse
 from django.conf import settings
+from abc import ABC, abstractmethod
+import math
 import time
 import hashlib
 import logging
+import threading
 
 logger = logging.getLogger('gowheels.ratelimit')
 
@@ -47,11 +51,12 @@ class RateLimitMiddleware:
         
         if not allowed:
             logger.warning(f"Rate limit exceeded for {client_id} on {request.path}")
+            retry_after = max(1, math.ceil(reset_time - time.time()))
             return JsonResponse({
                 'error': 'Rate limit exceeded',
-                'retry_after': int(reset_time - time.time())
+                'retry_after': retry_after
             }, status=429, headers={
-                'Retry-After': str(int(reset_time - time.time())),
+                'Retry-After': str(retry_after),
                 'X-RateLimit-Limit': str(config['requests']),
                 'X-RateLimit-Remaining': '0',
                 'X-RateLimit-Reset': str(int(reset_time))
@@ -95,34 +100,8 @@ class RateLimitMiddleware:
         return ip
     
     def _check_rate_limit(self, client_id, limit_type, max_requests, window):
-        """Check if request is within rate limit"""
-        cache_key = f"ratelimit:{limit_type}:{client_id}"
-        
-        # Get current request count and window start
-        data = cache.get(cache_key, {'count': 0, 'start': time.time()})
-        
-        current_time = time.time()
-        window_start = data['start']
-        count = data['count']
-        
-        # Reset if window expired
-        if current_time - window_start >= window:
-            count = 0
-            window_start = current_time
-        
-        # Check limit
-        if count >= max_requests:
-            reset_time = window_start + window
-            return False, 0, reset_time
-        
-        # Increment count
-        count += 1
-        cache.set(cache_key, {'count': count, 'start': window_start}, window)
-        
-        remaining = max_requests - count
-        reset_time = window_start + window
-        
-        return True, remaining, reset_time
+        """Check if request is within rate limit (one atomic limiter call)"""
+        return get_rate_limiter().hit(f"{limit_type}:{client_id}", max_requests, window)
 
 
 class IPRateLimiter:
@@ -131,21 +110,13 @@ class IPRateLimiter:
     @staticmethod
     def is_allowed(ip: str, max_requests: int = 100, window: int = 60) -> bool:
         """Check if IP is within rate limit"""
-        cache_key = f"ratelimit:ip:{ip}"
-        count = cache.get(cache_key, 0)
-        
-        if count >= max_requests:
-            return False
-        
-        cache.set(cache_key, count + 1, window)
-        return True
+        allowed, _, _ = get_rate_limiter().hit(f"ip:{ip}", max_requests, window)
+        return allowed
     
     @staticmethod
-    def get_remaining(ip: str, max_requests: int = 100) -> int:
+    def get_remaining(ip: str, max_requests: int = 100, window: int = 60) -> int:
         """Get remaining requests for IP"""
-        cache_key = f"ratelimit:ip:{ip}"
-        count = cache.get(cache_key, 0)
-        return max(0, max_requests - count)
+        return get_rate_limiter().peek(f"ip:{ip}", max_requests, window)
 
 
 def rate_limit(max_requests: int = 100, window: int = 60):
@@ -165,30 +136,207 @@ def rate_limit(max_requests: int = 100, window: int = 60):
     return decorator
 
 
-# Distributed rate limiting with Redis (optional)
-class RedisRateLimiter:
-    """Redis-based distributed rate limiter"""
-    
+
+
+# Rate limiting engines
+#
+# Every engine answers hit() with one atomic operation, so concurrent
+# requests can never both see the last free slot:
+#   local  GCRA under a threading.Lock; exact within one process
+#   cache  fixed window on the Django cache's atomic incr(); shared when
+#          CACHE_BACKEND=redis
+#   redis  GCRA in a Lua script; exact across workers, one round-trip
+
+class RateLimiter(ABC):
+    """hit() consumes one request; peek() only reports what is left"""
+
+    @abstractmethod
+    def hit(self, key: str, limit: int, window: int) -> tuple:
+        """
+        Count one request against key
+
+        Returns:
+            tuple: (allowed, remaining, reset_time) where reset_time is the
+                   unix time the next request is allowed when denied, or the
+                   time the limit fully resets when allowed
+        """
+        pass
+
+    @abstractmethod
+    def peek(self, key: str, limit: int, window: int) -> int:
+        """Requests still available for key without consuming one"""
+        pass
+
+    def is_allowed(self, key: str, max_requests: int, window: int) -> tuple:
+        """Check rate limit; returns (allowed, remaining)"""
+        allowed, remaining, _ = self.hit(key, max_requests, window)
+        return allowed, remaining
+
+
+# Float slack so limit * (window / limit) still fits inside window
+GCRA_EPSILON = 1e-6
+
+
+def gcra_remaining(used, limit, window):
+    """Requests left when the theoretical arrival time is `used` seconds ahead"""
+    interval = window / limit
+    return max(0, int((window - used) / interval + GCRA_EPSILON))
+
+
+class LocalRateLimiter(RateLimiter):
+    """In-process GCRA limiter; not shared between gunicorn workers"""
+
+    PRUNE_THRESHOLD = 10000
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._tat = {}
+
+    def hit(self, key, limit, window):
+        interval = window / limit
+        with self._lock:
+            now = self.clock()
+            tat = max(self._tat.get(key, now), now)
+            new_tat = tat + interval
+            if new_tat - now > window + GCRA_EPSILON:
+                return False, 0, new_tat - window
+            self._tat[key] = new_tat
+            if len(self._tat) > self.PRUNE_THRESHOLD:
+                self._prune(now)
+        return True, gcra_remaining(new_tat - now, limit, window), new_tat
+
+    def peek(self, key, limit, window):
+        with self._lock:
+            now = self.clock()
+            used = max(self._tat.get(key, now), now) - now
+        return gcra_remaining(used, limit, window)
+
+    def _prune(self, now):
+        """Forget keys whose bucket has fully drained"""
+        for key in [key for key, tat in self._tat.items() if tat <= now]:
+            del self._tat[key]
+
+
+class CacheRateLimiter(RateLimiter):
+    """Fixed-window counter on cache.incr(); exact because incr is atomic"""
+
+    KEY_PREFIX = 'ratelimit:'
+
+    def __init__(self, cache_backend=None, clock=time.time):
+        self.cache = cache_backend or cache
+        self.clock = clock
+
+    def _window(self, key, window):
+        window_start = int(self.clock() // window) * window
+        return f"{self.KEY_PREFIX}{key}:{window_start}", window_start + window
+
+    def hit(self, key, limit, window):
+        cache_key, reset_time = self._window(key, window)
+        try:
+            count = self.cache.incr(cache_key)
+        except ValueError:
+            # First request of the window; add() is atomic, so only one
+            # racer creates the counter and the rest fall back to incr()
+            if self.cache.add(cache_key, 1, window):
+                count = 1
+            else:
+                count = self.cache.incr(cache_key)
+
+        if count > limit:
+            return False, 0, reset_time
+        return True, limit - count, reset_time
+
+    def peek(self, key, limit, window):
+        cache_key, _ = self._window(key, window)
+        return max(0, limit - self.cache.get(cache_key, 0))
+
+
+class RedisRateLimiter(RateLimiter):
+    """Redis-based distributed GCRA limiter; one EVALSHA per request"""
+
+    KEY_PREFIX = 'gowheels:ratelimit:'
+
+    # KEYS[1] = bucket, ARGV[1] = emission interval (ms), ARGV[2] = window (ms)
+    # Returns {allowed, ms the theoretical arrival time is ahead of now}
+    # Uses the server clock so every worker agrees on "now" (Redis >= 5)
+    GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+if new_tat - now > window + 0.001 then
+    return {0, tostring(new_tat - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+return {1, tostring(new_tat - now)}
+"""
+
     def __init__(self, redis_client):
         self.redis = redis_client
-    
-    def is_allowed(self, key: str, max_requests: int, window: int) -> tuple:
-        """Check rate limit using Redis"""
-        current = int(time.time())
-        window_start = current - window
-        
-        # Remove old entries
-        self.redis.zremrangebyscore(key, 0, window_start)
-        
-        # Count requests in window
-        count = self.redis.zcard(key)
-        
-        if count >= max_requests:
-            return False, 0
-        
-        # Add current request
-        self.redis.zadd(key, {current: current})
-        self.redis.expire(key, window)
-        
-        remaining = max_requests - count - 1
-        return True, remaining
+        self._script = redis_client.register_script(self.GCRA_SCRIPT)
+
+    def hit(self, key, limit, window):
+        interval_ms = window * 1000 / limit
+        allowed, used_ms = self._script(
+            keys=[self.KEY_PREFIX + key], args=[repr(interval_ms), window * 1000]
+        )
+        used = float(used_ms) / 1000
+        now = time.time()
+        if not int(allowed):
+            return False, 0, now + used - window
+        return True, gcra_remaining(used, limit, window), now + used
+
+    def peek(self, key, limit, window):
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.time()
+        pipe.get(self.KEY_PREFIX + key)
+        (seconds, micros), tat = pipe.execute()
+        now_ms = seconds * 1000 + micros / 1000
+        used = max(float(tat or now_ms) - now_ms, 0) / 1000
+        return gcra_remaining(used, limit, window)
+
+
+class RateLimiterFactory:
+    """Factory for creating the configured rate limiter"""
+
+    @staticmethod
+    def create(backend: str, redis_url: str = ''):
+        if backend == 'local':
+            return LocalRateLimiter()
+        elif backend == 'cache':
+            return CacheRateLimiter()
+        elif backend == 'redis':
+            try:
+                import redis
+            except ImportError:
+                raise ImproperlyConfigured("RATE_LIMIT_BACKEND='redis' requires the redis package")
+            return RedisRateLimiter(redis.Redis.from_url(redis_url))
+        else:
+            raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the process-wide limiter configured by RATE_LIMIT_BACKEND"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiterFactory.create(
+                    getattr(settings, 'RATE_LIMIT_BACKEND', 'cache'),
+                    getattr(settings, 'REDIS_URL', ''),
+                )
+    return _limiter
+
+
+def set_rate_limiter(limiter):
+    """Swap the process-wide limiter (tests, benchmarks)"""
+    global _limiter
+    _limiter = limiter
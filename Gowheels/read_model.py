@@ -0,0 +1,109 @@
+"""
+VehicleListing read model for GoWheels
+Keeps one pre-rendered browse card per approved, available vehicle so
+get_vehicles reads a single narrow table instead of joining images and
+re-formatting every row on every request.
+
+Cards are rendered by VehicleListingSerializer, the same code the
+listing views use, so the JSON is identical. The card is rendered
+without seller_phone and owner_name (nothing is decrypted at write
+time); the row keeps them as stored and listing_cards resolves them at
+read time through the shared cipher's decrypt_many.
+"""
+
+from django.db import transaction
+
+from .encryption import get_cipher
+from .models import Vehicle, VehicleListing
+from .serializers import VehicleListingSerializer
+
+# Columns the read model stores that the card itself does not need
+ROW_FIELDS = ('latitude', 'longitude')
+
+
+def _listable(queryset):
+    return queryset.filter(available=True, approval_status='approved')
+
+
+def _prepare(queryset):
+    return VehicleListingSerializer.prepare(queryset, fields=ROW_FIELDS)
+
+
+def _build_rows(vehicles):
+    """VehicleListing rows for vehicles prepared by _prepare"""
+    # seller_phone/owner_name stay empty in the card; listing_cards fills them in
+    listing = VehicleListingSerializer(vehicles, pii=False)
+    rows = []
+    for vehicle in listing.vehicles:
+        card = listing.card(vehicle)
+        vehicle.normalize_keys()
+        rows.append(VehicleListing(
+            vehicle_id=vehicle.id,
+            listing_type=vehicle.listing_type,
+            category_key=vehicle.category_key,
+            brand_key=vehicle.brand_key,
+            model_key=vehicle.model_key,
+            pincode=vehicle.pincode or '',
+            latitude=vehicle.latitude,
+            longitude=vehicle.longitude,
+            year=vehicle.year,
+            price=vehicle.price,
+            seller_phone=vehicle.seller_phone or '',
+            owner_name=vehicle.owner_name or '',
+            card=card,
+        ))
+    return rows
+
+
+def refresh_listing(vehicle_id):
+    """Re-render one vehicle's card, or drop it if the vehicle is no longer listed"""
+    vehicles = _prepare(_listable(Vehicle.objects.filter(pk=vehicle_id)))
+    rows = _build_rows(vehicles)
+    with transaction.atomic():
+        VehicleListing.objects.filter(vehicle_id=vehicle_id).delete()
+        if rows:
+            rows[0].save(force_insert=True)
+
+
+def rebuild_listings(batch_size=500):
+    """Re-render every card from scratch; returns the number of listings written"""
+    count = 0
+    with transaction.atomic():
+        VehicleListing.objects.all().delete()
+        ids = list(_listable(Vehicle.objects.all()).order_by('id').values_list('id', flat=True))
+        for start in range(0, len(ids), batch_size):
+            batch = _prepare(Vehicle.objects.filter(id__in=ids[start:start + batch_size]))
+            rows = _build_rows(batch)
+            VehicleListing.objects.bulk_create(rows)
+            count += len(rows)
+    return count
+
+
+def listing_cards(listings, cipher=None):
+    """
+    Browse cards for a page of VehicleListing rows
+
+    Returns the stored card dicts with seller_phone/owner_name filled in,
+    decrypting each distinct ciphertext on the page once.
+    """
+    ciphertexts = [
+        value
+        for listing in listings
+        for value in (listing.seller_phone, listing.owner_name)
+        if Vehicle.is_encrypted(value)
+    ]
+    plaintext = (cipher or get_cipher()).decrypt_many(ciphertexts) if ciphertexts else {}
+
+    def plain(value, fallback):
+        if not Vehicle.is_encrypted(value):
+            return value
+        value = plaintext.get(value)
+        return fallback if value is None else value
+
+    cards = []
+    for listing in listings:
+        card = dict(listing.card)
+        card['seller_phone'] = plain(listing.seller_phone, VehicleListingSerializer.PHONE_FALLBACK)
+        card['owner_name'] = plain(listing.owner_name, VehicleListingSerializer.OWNER_FALLBACK)
+        cards.append(card)
+    return cards
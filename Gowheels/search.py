@@ -0,0 +1,146 @@
+"""
+Vehicle search for GoWheels
+Inverted index over brand, model, category, state and year. Each vehicle
+is split into lower-cased tokens stored in VehicleSearchToken; a query
+turns every search term into an index range scan (prefix match) and
+ranks vehicles by the summed weight of the fields that matched, all in
+one grouped query. Cost depends on how many tokens match, not on the
+size of the Vehicle table.
+
+Ranked results page on (score, vehicle_id) with CursorPaginator, using
+RANK_ORDERING.
+"""
+
+import re
+from functools import reduce
+from operator import add
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Max, Q, Sum, Value, When, F
+
+from .models import Vehicle, VehicleSearchToken
+
+# Relevance of a token by the field it came from
+FIELD_WEIGHTS = {
+    'brand_name': 3,
+    'model_name': 3,
+    'category_name': 2,
+    'state': 1,
+    'year': 1,
+}
+
+MIN_QUERY_LENGTH = 2
+
+# Best score first, newest vehicle first among equals; unique per row, so it is a keyset
+RANK_ORDERING = ('-score', '-vehicle_id')
+MAX_TERMS = 5
+TOKEN_MAX_LENGTH = 50
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Lower-cased word tokens of text, in order, duplicates kept"""
+    return [token[:TOKEN_MAX_LENGTH] for token in _TOKEN_RE.findall(str(text or '').lower())]
+
+
+def vehicle_tokens(vehicle):
+    """{token: weight} for one vehicle; a token found in several fields sums their weights"""
+    tokens = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in set(tokenize(getattr(vehicle, field))):
+            tokens[token] = tokens.get(token, 0) + weight
+    return tokens
+
+
+def _token_rows(vehicle):
+    return [
+        VehicleSearchToken(token=token, vehicle_id=vehicle.pk, weight=weight)
+        for token, weight in vehicle_tokens(vehicle).items()
+    ]
+
+
+def index_vehicle(vehicle):
+    """Replace the index rows of one vehicle"""
+    with transaction.atomic():
+        VehicleSearchToken.objects.filter(vehicle_id=vehicle.pk).delete()
+        VehicleSearchToken.objects.bulk_create(_token_rows(vehicle))
+
+
+def rebuild_index(batch_size=1000):
+    """Re-tokenize every vehicle; returns the number of vehicles indexed"""
+    fields = ['id', *FIELD_WEIGHTS]
+    count = 0
+    with transaction.atomic():
+        VehicleSearchToken.objects.all().delete()
+        rows = []
+        for vehicle in Vehicle.objects.only(*fields).iterator(chunk_size=batch_size):
+            rows.extend(_token_rows(vehicle))
+            count += 1
+            if len(rows) >= batch_size:
+                VehicleSearchToken.objects.bulk_create(rows)
+                rows = []
+        if rows:
+            VehicleSearchToken.objects.bulk_create(rows)
+    return count
+
+
+def _prefix(term):
+    """Index-friendly prefix match: term <= token < term with its last char bumped"""
+    upper = term[:-1] + chr(ord(term[-1]) + 1)
+    return Q(token__gte=term, token__lt=upper)
+
+
+def ranked_matches(query):
+    """
+    Vehicles matching every term of query, as {vehicle_id, score} rows
+
+    Each term matches tokens it is a prefix of; exact token matches score
+    double. Unordered: apply RANK_ORDERING or paginate on it.
+
+    Returns:
+        QuerySet or None: None when query has no terms
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_TERMS]
+    if not terms:
+        return None
+
+    matched_terms = [
+        Max(Case(When(_prefix(term), then=Value(1)), default=Value(0), output_field=IntegerField()))
+        for term in terms
+    ]
+    return (
+        VehicleSearchToken.objects
+        .filter(reduce(lambda a, b: a | b, (_prefix(term) for term in terms)))
+        .values('vehicle_id')
+        .annotate(
+            terms_matched=reduce(add, matched_terms),
+            score=Sum(Case(
+                When(token__in=terms, then=F('weight') * 2),
+                default=F('weight'),
+                output_field=IntegerField(),
+            )),
+        )
+        .filter(terms_matched=len(terms))
+        .values('vehicle_id', 'score')
+    )
+
+
+def vehicles_in_order(ids):
+    """Vehicles for ids in the same order, skipping any deleted meanwhile"""
+    vehicles = Vehicle.objects.in_bulk(ids)
+    return [vehicles[pk] for pk in ids if pk in vehicles]
+
+
+def search(query, limit=20):
+    """
+    First limit vehicles matching query, best ranked first
+
+    Returns:
+        tuple: (vehicles in rank order, has_more)
+    """
+    matches = ranked_matches(query)
+    if matches is None:
+        return [], False
+    ids = [row['vehicle_id'] for row in matches.order_by(*RANK_ORDERING)[:limit + 1]]
+    return vehicles_in_order(ids[:limit]), len(ids) > limit
@@ -0,0 +1,151 @@
+"""
+Listing serializers for GoWheels
+Turns Vehicle querysets into JSON-ready listing cards in a constant
+number of queries, whatever the page size
+"""
+
+from django.db.models import Prefetch
+from .models import Vehicle, VehicleImage, VehicleVideo
+from .encryption import get_cipher
+from .image_variants import srcset
+
+
+class VehicleListingSerializer:
+    """
+    Batch serializer for vehicle listing cards
+
+    Usage:
+        vehicles = VehicleListingSerializer.prepare(queryset)
+        listing = VehicleListingSerializer(vehicles)
+        cards = [listing.card(v) for v in listing.vehicles]
+
+    prepare() restricts the columns loaded and prefetches images (and
+    optionally videos), so iterating costs one query per relation instead
+    of one per row. Encrypted seller_phone/owner_name values are decrypted
+    once per distinct ciphertext with the process-wide cipher. With
+    pii=False they are left empty and nothing is decrypted.
+    """
+
+    # Every Vehicle column the listing views read; anything else stays deferred
+    FIELDS = (
+        'id', 'category_name', 'brand_name', 'model_name', 'year', 'state',
+        'price', 'per_day_price', 'per_hour_price', 'pricing_type',
+        'listing_type', 'unit_type', 'seller_phone', 'pincode', 'village',
+        'owner_name', 'available', 'approval_status', 'promoted',
+        'manual_maintenance_cost', 'manual_fuel_cost', 'manual_insurance_cost',
+        'created_at',
+    )
+
+    PHONE_FALLBACK = 'Not Available'
+    OWNER_FALLBACK = 'Owner'
+
+    @classmethod
+    def prepare(cls, queryset, videos=False, fields=()):
+        """Restrict columns (FIELDS plus any extra fields) and prefetch media for a Vehicle queryset"""
+        prefetches = [
+            Prefetch('images', queryset=VehicleImage.objects.only('id', 'vehicle_id', 'image', 'variants').order_by('id')),
+        ]
+        if videos:
+            prefetches.append(
+                Prefetch('videos', queryset=VehicleVideo.objects.only('id', 'vehicle_id', 'video', 'poster').order_by('id'))
+            )
+        return queryset.only(*cls.FIELDS, *fields).prefetch_related(*prefetches)
+
+    def __init__(self, vehicles, cipher=None, pii=True):
+        self.vehicles = list(vehicles)
+        self.cipher = cipher
+        self.pii = pii
+        self._plaintext = self._decrypt_all() if pii else {}
+
+    def _decrypt_all(self):
+        """Decrypt each distinct ciphertext on the page exactly once"""
+        ciphertexts = [
+            value
+            for vehicle in self.vehicles
+            for value in (vehicle.seller_phone, vehicle.owner_name)
+            if Vehicle.is_encrypted(value)
+        ]
+        if not ciphertexts:
+            return {}
+
+        if self.cipher is None:
+            self.cipher = get_cipher()
+        return self.cipher.decrypt_many(ciphertexts)
+
+    def _plain(self, value, fallback):
+        if not value or not self.pii:
+            return ''
+        if not Vehicle.is_encrypted(value):
+            return value
+        plain = self._plaintext.get(value)
+        return fallback if plain is None else plain
+
+    def seller_phone(self, vehicle):
+        """Decrypted seller phone, same contract as Vehicle.get_seller_phone"""
+        return self._plain(vehicle.seller_phone, self.PHONE_FALLBACK)
+
+    def owner_name(self, vehicle):
+        """Decrypted owner name, same contract as Vehicle.get_owner_name"""
+        return self._plain(vehicle.owner_name, self.OWNER_FALLBACK)
+
+    @staticmethod
+    def images(vehicle, limit=None):
+        """Image URLs from the prefetched images relation"""
+        images = list(vehicle.images.all())
+        if limit is not None:
+            images = images[:limit]
+        return [img.image.url for img in images]
+
+    @staticmethod
+    def image_srcsets(vehicle, limit=None):
+        """Responsive image descriptions (see image_variants.srcset), in images order"""
+        images = list(vehicle.images.all())
+        if limit is not None:
+            images = images[:limit]
+        return [srcset(img) for img in images]
+
+    @staticmethod
+    def videos(vehicle, limit=None):
+        """Video URLs from the prefetched videos relation"""
+        videos = list(vehicle.videos.all())
+        if limit is not None:
+            videos = videos[:limit]
+        return [video.video.url for video in videos]
+
+    @staticmethod
+    def video_posters(vehicle, limit=None):
+        """Poster frame URLs matching videos(); '' until the poster job has run"""
+        videos = list(vehicle.videos.all())
+        if limit is not None:
+            videos = videos[:limit]
+        return [video.poster.url if video.poster else '' for video in videos]
+
+    @staticmethod
+    def location(vehicle):
+        return f"{vehicle.village or ''}, {vehicle.pincode}".strip(', ')
+
+    def card(self, vehicle):
+        """Full browse card as returned by get_vehicles"""
+        return {
+            'id': int(vehicle.id),
+            'category_name': str(vehicle.category_name),
+            'brand_name': str(vehicle.brand_name),
+            'model_name': str(vehicle.model_name),
+            'year': int(vehicle.year),
+            'price': str(vehicle.price),
+            'per_day_price': str(vehicle.per_day_price or 0),
+            'per_hour_price': str(vehicle.per_hour_price or 0),
+            'pricing_type': str(vehicle.pricing_type),
+            'listing_type': str(vehicle.listing_type),
+            'unit_type': str(vehicle.unit_type or 'unit_price'),
+            'seller_phone': str(self.seller_phone(vehicle) or ''),
+            'pincode': str(vehicle.pincode or ''),
+            'village': str(vehicle.village or ''),
+            'owner_name': str(self.owner_name(vehicle) or ''),
+            'location': self.location(vehicle),
+            'manual_maintenance_cost': str(vehicle.manual_maintenance_cost or ''),
+            'manual_fuel_cost': str(vehicle.manual_fuel_cost or ''),
+            'manual_insurance_cost': str(vehicle.manual_insurance_cost or ''),
+            'images': self.images(vehicle),
+            'image_srcsets': self.image_srcsets(vehicle),
+        }
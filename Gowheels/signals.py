@@ -0,0 +1,187 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    AdminGroup, AdminCategory, AdminBrand, AdminModel,
+    Vehicle, VehicleImage, VehicleVideo, BrandImage, ModelImage, Pincode, PincodeMapping,
+)
+from .read_model import refresh_listing
+from .catalog import bump_catalog_version
+from .cache import VEHICLES, MEDIA, PINCODES
+from .search import FIELD_WEIGHTS, index_vehicle
+from .spatial import pincodes_updated, rebuild_index, invalidate_index
+from .geo import backfill_coordinates
+from .jobs import enqueue
+from . import autocomplete, media_storage, neighbors
+
+
+@receiver(post_save, sender=AdminGroup)
+@receiver(post_save, sender=AdminCategory)
+@receiver(post_save, sender=AdminBrand)
+@receiver(post_save, sender=AdminModel)
+@receiver(post_delete, sender=AdminGroup)
+@receiver(post_delete, sender=AdminCategory)
+@receiver(post_delete, sender=AdminBrand)
+@receiver(post_delete, sender=AdminModel)
+def catalog_changed(sender, **kwargs):
+    """save_admin_data, manage_* and delete_admin_* all land here"""
+    bump_catalog_version()
+
+
+# Registered after catalog_changed so the version bump is already visible
+@receiver(post_save, sender=AdminCategory)
+def autocomplete_category_saved(sender, instance, created, **kwargs):
+    autocomplete.catalog_row_saved('category', instance, '', created)
+
+
+@receiver(post_save, sender=AdminBrand)
+def autocomplete_brand_saved(sender, instance, created, **kwargs):
+    autocomplete.catalog_row_saved('brand', instance, instance.category.name, created)
+
+
+@receiver(post_save, sender=AdminModel)
+def autocomplete_model_saved(sender, instance, created, **kwargs):
+    autocomplete.catalog_row_saved('model', instance, instance.brand.name, created)
+
+
+@receiver(post_delete, sender=AdminCategory)
+@receiver(post_delete, sender=AdminBrand)
+@receiver(post_delete, sender=AdminModel)
+def autocomplete_row_deleted(sender, instance, **kwargs):
+    kind = {AdminCategory: 'category', AdminBrand: 'brand', AdminModel: 'model'}[sender]
+    autocomplete.catalog_row_deleted(kind, instance)
+
+
+@receiver(post_save, sender=Vehicle)
+@receiver(post_save, sender=VehicleImage)
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_delete, sender=VehicleImage)
+def vehicles_changed(sender, **kwargs):
+    """Listing edits, approvals and image changes invalidate cached get_vehicles pages"""
+    VEHICLES.bump()
+
+
+@receiver(pre_save, sender=Vehicle)
+def autocomplete_vehicle_saving(sender, instance, update_fields=None, **kwargs):
+    autocomplete.vehicle_saving(instance, update_fields)
+
+
+# Registered after vehicles_changed so the version bump is already visible
+@receiver(post_save, sender=Vehicle)
+def autocomplete_vehicle_saved(sender, instance, **kwargs):
+    autocomplete.vehicle_saved(instance)
+
+
+@receiver(post_delete, sender=Vehicle)
+def autocomplete_vehicle_deleted(sender, instance, **kwargs):
+    autocomplete.vehicle_deleted(instance)
+
+
+@receiver(post_save, sender=Vehicle)
+def reindex_vehicle(sender, instance, update_fields=None, **kwargs):
+    """Keep search tokens in step with the searchable fields; deletes cascade"""
+    if update_fields is not None and not set(update_fields) & set(FIELD_WEIGHTS):
+        return
+    index_vehicle(instance)
+
+
+@receiver(post_save, sender=Vehicle)
+def refresh_vehicle_listing(sender, instance, **kwargs):
+    """Re-render the read-model card; drops it once unapproved or unavailable"""
+    refresh_listing(instance.pk)
+
+
+@receiver(post_save, sender=VehicleImage)
+@receiver(post_delete, sender=VehicleImage)
+def refresh_listing_images(sender, instance, origin=None, **kwargs):
+    """Image changes alter the card; skip when the vehicle itself is being deleted"""
+    if isinstance(origin, Vehicle) or getattr(origin, 'model', None) is Vehicle:
+        return
+    refresh_listing(instance.vehicle_id)
+
+
+@receiver(post_save, sender=VehicleImage)
+def queue_image_variants(sender, instance, created, **kwargs):
+    """Resize new uploads in the job worker; cards use the original until then"""
+    if created and not instance.variants:
+        enqueue('media.image_variants', image_id=instance.pk)
+
+
+@receiver(post_save, sender=VehicleVideo)
+def queue_video_processing(sender, instance, created, **kwargs):
+    """Probe the duration, then cut a poster frame, in the job worker"""
+    if created:
+        enqueue('media.video_duration', video_id=instance.pk)
+        enqueue('media.video_poster', video_id=instance.pk)
+
+
+@receiver(post_save, sender=BrandImage)
+@receiver(post_save, sender=ModelImage)
+@receiver(post_delete, sender=BrandImage)
+@receiver(post_delete, sender=ModelImage)
+def media_changed(sender, **kwargs):
+    """Brand/model image uploads and deletes invalidate get_brand_images/get_model_images"""
+    MEDIA.bump()
+
+
+# Catalog image blobs: MediaBlob.refs follows the rows pointing at each blob
+def _track_blob_references(model, field):
+    def remember_previous(sender, instance, **kwargs):
+        """Stored name before this save, so the post_save below can tell if it changed"""
+        instance._previous_blob = ''
+        if instance.pk is not None and not instance._state.adding:
+            instance._previous_blob = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first() or ''
+
+    def count(sender, instance, created, **kwargs):
+        current = getattr(instance, field).name or ''
+        previous = getattr(instance, '_previous_blob', '')
+        if created or current != previous:
+            media_storage.retain(current)
+            media_storage.release(previous)
+
+    def uncount(sender, instance, **kwargs):
+        media_storage.release(getattr(instance, field).name or '')
+
+    uid = f'blob_refs_{model.__name__}_{field}'
+    pre_save.connect(remember_previous, sender=model, weak=False, dispatch_uid=f'{uid}_previous')
+    post_save.connect(count, sender=model, weak=False, dispatch_uid=f'{uid}_count')
+    post_delete.connect(uncount, sender=model, weak=False, dispatch_uid=f'{uid}_uncount')
+
+
+for _model, _field in media_storage.catalog_models():
+    _track_blob_references(_model, _field)
+
+
+@receiver(pre_save, sender=Pincode)
+def remember_pincode_code(sender, instance, **kwargs):
+    """Stored code before this save, so a renamed pincode's neighbor rows can go"""
+    instance._previous_code = None
+    if instance.pk is not None and not instance._state.adding:
+        instance._previous_code = sender.objects.filter(pk=instance.pk).values_list('code', flat=True).first()
+
+
+@receiver(post_save, sender=Pincode)
+@receiver(post_delete, sender=Pincode)
+def pincode_changed(sender, instance, **kwargs):
+    """Single-row edits: rebuild lazily on the next radius query; vehicles and neighbor rows follow the pincode"""
+    invalidate_index()
+    backfill_coordinates([instance.code])
+    neighbors.refresh_pincode(
+        instance.code, getattr(instance, '_previous_code', None), deleted=kwargs['signal'] is post_delete,
+    )
+    VEHICLES.bump()
+    PINCODES.bump()
+
+
+@receiver(pincodes_updated)
+def pincodes_reloaded(sender, codes=None, **kwargs):
+    """Bulk imports: rebuild eagerly so the first search stays fast; neighbor rows follow the imported codes"""
+    rebuild_index()
+    backfill_coordinates(codes)
+    if codes is not None:
+        neighbors.refresh_pincodes(codes)
+    elif PincodeMapping.objects.exists():
+        # Loader did not say what changed: recompute the whole table
+        neighbors.precompute_neighbors()
+    VEHICLES.bump()
+    PINCODES.bump()
@@ -0,0 +1,168 @@
+"""
+In-process spatial index for pincode radius queries
+Buckets pincode coordinates into a lat/lng grid so a radius search only
+looks at the handful of cells overlapping the query bounding box, then
+runs a vectorized haversine over those candidates.
+"""
+
+import math
+import threading
+
+from django.dispatch import Signal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.195
+
+# Cell size in degrees (~11 km at the equator). Standard search radii
+# (5-50 km) touch between 4 and 36 cells.
+DEFAULT_CELL_DEGREES = 0.1
+
+# Sent by import_pincodes (or any bulk loader) after the Pincode table
+# changed in a way that does not fire post_save, e.g. bulk_create.
+# Loaders may pass codes=[...] to limit follow-up work to those pincodes.
+pincodes_updated = Signal()
+
+
+class PincodeGridIndex:
+    """Immutable grid index over (code, latitude, longitude) points"""
+
+    def __init__(self, points, cell_degrees=DEFAULT_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.positions = {}
+        self.cells = {}
+
+        # Sort by cell so every cell is one contiguous slice of the arrays
+        keyed = sorted(
+            ((self._cell(lat, lng), code, lat, lng) for code, lat, lng in points),
+            key=lambda row: row[0]
+        )
+        self.codes = [row[1] for row in keyed]
+        lats = [row[2] for row in keyed]
+        lngs = [row[3] for row in keyed]
+
+        for i, (cell, code, _, _) in enumerate(keyed):
+            start, _ = self.cells.get(cell, (i, i))
+            self.cells[cell] = (start, i + 1)
+            self.positions[code] = i
+
+        if np is not None:
+            self.lats = np.radians(np.asarray(lats, dtype=np.float64))
+            self.lngs = np.radians(np.asarray(lngs, dtype=np.float64))
+            self.cos_lats = np.cos(self.lats)
+            self.codes = np.asarray(self.codes, dtype=object)
+        else:
+            self.lats = [math.radians(v) for v in lats]
+            self.lngs = [math.radians(v) for v in lngs]
+            self.cos_lats = [math.cos(v) for v in self.lats]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _cell(self, lat, lng):
+        return (int(math.floor(lat / self.cell_degrees)),
+                int(math.floor(lng / self.cell_degrees)))
+
+    def coordinates(self, code):
+        """Return (latitude, longitude) in degrees for a pincode, or None"""
+        i = self.positions.get(code)
+        if i is None:
+            return None
+        return math.degrees(self.lats[i]), math.degrees(self.lngs[i])
+
+    def _candidate_slices(self, lat, lng, radius_km):
+        """Yield (start, end) slices of every cell overlapping the bounding box"""
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        dlng = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+
+        min_row, min_col = self._cell(lat - dlat, lng - dlng)
+        max_row, max_col = self._cell(lat + dlat, lng + dlng)
+
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                span = self.cells.get((row, col))
+                if span:
+                    yield span
+
+    def query(self, lat, lng, radius_km):
+        """Return [(code, distance_km)] within radius_km of (lat, lng), nearest first"""
+        slices = list(self._candidate_slices(lat, lng, radius_km))
+        if not slices:
+            return []
+
+        lat_r = math.radians(lat)
+        lng_r = math.radians(lng)
+
+        if np is not None:
+            idx = np.concatenate([np.arange(start, end) for start, end in slices])
+            dlat = self.lats[idx] - lat_r
+            dlng = self.lngs[idx] - lng_r
+            a = np.sin(dlat / 2) ** 2 + math.cos(lat_r) * self.cos_lats[idx] * np.sin(dlng / 2) ** 2
+            dist = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+            mask = dist <= radius_km
+            idx, dist = idx[mask], dist[mask]
+            order = np.argsort(dist, kind='stable')
+            return list(zip(self.codes[idx[order]].tolist(), dist[order].tolist()))
+
+        results = []
+        cos_base = math.cos(lat_r)
+        for start, end in slices:
+            for i in range(start, end):
+                a = (math.sin((self.lats[i] - lat_r) / 2) ** 2 +
+                     cos_base * self.cos_lats[i] * math.sin((self.lngs[i] - lng_r) / 2) ** 2)
+                dist = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+                if dist <= radius_km:
+                    results.append((self.codes[i], dist))
+        results.sort(key=lambda item: item[1])
+        return results
+
+    def nearby(self, code, radius_km):
+        """Return pincodes within radius_km of another pincode, or None if unknown"""
+        coords = self.coordinates(code)
+        if coords is None:
+            return None
+        return [c for c, _ in self.query(coords[0], coords[1], radius_km)]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def build_index():
+    """Build a fresh index from the Pincode table"""
+    from .models import Pincode
+    rows = Pincode.objects.values_list('code', 'latitude', 'longitude').iterator(chunk_size=5000)
+    return PincodeGridIndex(rows)
+
+
+def get_index():
+    """Return the process-wide index, building it on first use"""
+    global _index
+    index = _index
+    if index is None:
+        with _lock:
+            if _index is None:
+                _index = build_index()
+            index = _index
+    return index
+
+
+def rebuild_index(**kwargs):
+    """Rebuild the process-wide index now"""
+    global _index
+    index = build_index()
+    with _lock:
+        _index = index
+    return index
+
+
+def invalidate_index(**kwargs):
+    """Drop the process-wide index; the next query rebuilds it"""
+    global _index
+    with _lock:
+        _index = None
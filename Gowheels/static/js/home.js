@@ -0,0 +1,182 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const hamburger = document.querySelector('.hamburger');
+    const navMenu = document.querySelector('.nav-menu');
+    const header = document.querySelector('header');
+    
+    // Navbar scroll animation
+    window.addEventListener('scroll', () => {
+        if (window.scrollY > 50) {
+            header.classList.add('scrolled');
+        } else {
+            header.classList.remove('scrolled');
+        }
+    });
+    
+    if (hamburger && navMenu) {
+        hamburger.addEventListener('click', function() {
+            navMenu.classList.toggle('active');
+        });
+        
+        document.querySelectorAll('.nav-menu a').forEach(link => {
+            link.addEventListener('click', () => {
+                navMenu.classList.remove('active');
+            });
+        });
+    }
+
+    // Particles animation
+    const canvas = document.getElementById('particles');
+    if (canvas) {
+        const ctx = canvas.getContext('2d');
+        canvas.width = canvas.offsetWidth;
+        canvas.height = canvas.offsetHeight;
+
+        const particles = [];
+        const particleCount = 50;
+
+        for (let i = 0; i < particleCount; i++) {
+            particles.push({
+                x: Math.random() * canvas.width,
+                y: Math.random() * canvas.height,
+                radius: Math.random() * 2 + 1,
+                vx: (Math.random() - 0.5) * 0.5,
+                vy: (Math.random() - 0.5) * 0.5,
+                opacity: Math.random() * 0.5 + 0.2
+            });
+        }
+
+        function animate() {
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+            
+            particles.forEach(p => {
+                p.x += p.vx;
+                p.y += p.vy;
+
+                if (p.x < 0 || p.x > canvas.width) p.vx *= -1;
+                if (p.y < 0 || p.y > canvas.height) p.vy *= -1;
+
+                ctx.beginPath();
+                ctx.arc(p.x, p.y, p.radius, 0, Math.PI * 2);
+                ctx.fillStyle = `rgba(255, 193, 7, ${p.opacity})`;
+                ctx.fill();
+            });
+
+            requestAnimationFrame(animate);
+        }
+
+        animate();
+
+        window.addEventListener('resize', () => {
+            canvas.width = canvas.offsetWidth;
+            canvas.height = canvas.offsetHeight;
+        });
+    }
+
+    // Rotating hero content
+    const heroContents = [
+        {
+            title: "Rent Your Dream Vehicle",
+            subtitle: "In Minutes",
+            description: "Experience seamless vehicle rentals with instant booking, verified owners, and 24/7 support. Your journey starts here."
+        },
+        {
+            title: "Drive Your Dream Vehicle",
+            subtitle: "Own It Today",
+            description: "Find, book, and own the perfect ride with verified sellers and seamless transactions."
+        },
+        {
+            title: "Premium Vehicles, Zero Hassle",
+            subtitle: "Book or Buy",
+            description: "From daily rides to dream machines—book or buy in minutes with trusted sellers."
+        },
+        {
+            title: "Drive the Future Today",
+            subtitle: "Modern Mobility",
+            description: "Premium vehicles. Verified sellers. Seamless booking—built for modern drivers."
+        }
+    ];
+
+    let currentIndex = 0;
+    const heroTitle = document.getElementById('heroTitle');
+    const heroSubtitle = document.getElementById('heroSubtitle');
+    const heroDescription = document.getElementById('heroDescription');
+
+    function rotateContent() {
+        currentIndex = (currentIndex + 1) % heroContents.length;
+        const content = heroContents[currentIndex];
+        
+        // Smooth fade out
+        heroTitle.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
+        heroSubtitle.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
+        heroDescription.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
+        
+        heroTitle.style.opacity = '0';
+        heroTitle.style.transform = 'translateY(-20px)';
+        heroSubtitle.style.opacity = '0';
+        heroSubtitle.style.transform = 'translateY(-20px)';
+        heroDescription.style.opacity = '0';
+        heroDescription.style.transform = 'translateY(-20px)';
+        
+        // Smooth fade in with new content
+        setTimeout(() => {
+            heroTitle.textContent = content.title;
+            heroTitle.style.opacity = '1';
+            heroTitle.style.transform = 'translateY(0)';
+        }, 600);
+        
+        setTimeout(() => {
+            heroSubtitle.textContent = content.subtitle;
+            heroSubtitle.style.opacity = '1';
+            heroSubtitle.style.transform = 'translateY(0)';
+        }, 800);
+        
+        setTimeout(() => {
+            heroDescription.textContent = content.description;
+            heroDescription.style.opacity = '1';
+            heroDescription.style.transform = 'translateY(0)';
+        }, 1000);
+    }
+
+    setInterval(rotateContent, 4000);
+
+    // Scroll animations
+    const observerOptions = {
+        threshold: 0.1,
+        rootMargin: '0px 0px -100px 0px'
+    };
+
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.style.animation = 'fadeInUp 0.8s ease-out forwards';
+            }
+        });
+    }, observerOptions);
+
+    document.querySelectorAll('.feature-card, .step, .stat').forEach(el => {
+        observer.observe(el);
+    });
+
+    // Magnetic button effect
+    document.querySelectorAll('.btn-primary, .btn-secondary').forEach(btn => {
+        btn.addEventListener('mousemove', (e) => {
+            const rect = btn.getBoundingClientRect();
+            const x = e.clientX - rect.left - rect.width / 2;
+            const y = e.clientY - rect.top - rect.height / 2;
+            btn.style.transform = `translate(${x * 0.2}px, ${y * 0.2}px)`;
+        });
+        
+        btn.addEventListener('mouseleave', () => {
+            btn.style.transform = 'translate(0, 0)';
+        });
+    });
+
+    // Parallax effect on scroll
+    window.addEventListener('scroll', () => {
+        const scrolled = window.pageYOffset;
+        const heroContent = document.querySelector('.hero-content');
+        if (heroContent) {
+            heroContent.style.transform = `translateY(${scrolled * 0.3}px)`;
+        }
+    });
+});
@@ -0,0 +1,1293 @@
+// Initialize data storage with localStorage persistence
+function loadFromStorage() {
+    window.createdGroups = JSON.parse(localStorage.getItem('createdGroups')) || [];
+    window.groupCategories = JSON.parse(localStorage.getItem('groupCategories')) || {};
+    window.categoryBrands = JSON.parse(localStorage.getItem('categoryBrands')) || {};
+    window.brandModels = JSON.parse(localStorage.getItem('brandModels')) || {};
+}
+
+function saveToStorage() {
+    localStorage.setItem('createdGroups', JSON.stringify(window.createdGroups));
+    localStorage.setItem('groupCategories', JSON.stringify(window.groupCategories));
+    localStorage.setItem('categoryBrands', JSON.stringify(window.categoryBrands));
+    localStorage.setItem('brandModels', JSON.stringify(window.brandModels));
+}
+
+// Load data on page load
+loadFromStorage();
+loadGroupsFromDatabase();
+loadAllDataFromDatabase();
+
+function loadGroupsFromDatabase() {
+    fetch('/get-admin-groups/')
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            window.createdGroups = data.groups;
+            saveToStorage();
+        }
+    })
+    .catch(error => console.error('Error loading groups:', error));
+}
+
+function loadAllDataFromDatabase() {
+    fetch('/get-all-admin-data/')
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            window.groupCategories = data.categories || {};
+            window.categoryBrands = data.brands || {};
+            window.brandModels = data.models || {};
+            saveToStorage();
+            displayAllImages();
+        }
+    })
+    .catch(error => console.error('Error loading data:', error));
+}
+
+function showScreen(screenName) {
+    ['main-menu', 'add-groups-screen', 'add-info-screen', 'list-screen', 'subadmin-screen', 'ads-screen', 'added-groups-screen', 'category-screen', 'brand-screen', 'model-screen'].forEach(screen => {
+        const element = document.getElementById(screen);
+        if (element) element.style.display = 'none';
+    });
+    
+    if (screenName === 'add-groups') {
+        document.getElementById('add-groups-screen').style.display = 'block';
+    } else if (screenName === 'add-info') {
+        document.getElementById('add-info-screen').style.display = 'block';
+        displayInfoGroups();
+    } else if (screenName === 'list') {
+        document.getElementById('list-screen').style.display = 'block';
+    } else if (screenName === 'subadmin') {
+        document.getElementById('subadmin-screen').style.display = 'block';
+    } else if (screenName === 'ads') {
+        document.getElementById('ads-screen').style.display = 'block';
+    } else {
+        const targetScreen = document.getElementById(screenName);
+        if (targetScreen) targetScreen.style.display = 'block';
+    }
+}
+
+function createGroup() {
+    const groupName = document.getElementById('group-input').value.trim();
+    if (!groupName) {
+        alert('Please enter a group name');
+        return;
+    }
+    
+    // Check if group already exists
+    if (window.createdGroups.includes(groupName)) {
+        alert('Group name already exists. Please enter a different name.');
+        return;
+    }
+    
+    // Save group to database
+    const formData = new FormData();
+    formData.append('type', 'group');
+    formData.append('name', groupName);
+    
+    fetch('/save-admin-data/', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            if (!window.createdGroups.includes(groupName)) {
+                window.createdGroups.push(groupName);
+                saveToStorage();
+            }
+            updateCreatedGroupsDisplay();
+            document.getElementById('group-input').value = '';
+            alert('Group created successfully!');
+        } else {
+            alert('Error: ' + (data.error || 'Failed to create group'));
+        }
+    })
+    .catch(error => {
+        alert('Error creating group');
+    });
+}
+
+function updateCreatedGroupsDisplay() {
+    const displayDiv = document.getElementById('created-groups-display');
+    if (!window.createdGroups || window.createdGroups.length === 0) {
+        displayDiv.innerHTML = '';
+        return;
+    }
+    
+    let html = '<h3 style="color: #FFD700; text-align: center; margin-bottom: 1rem;">Created Groups</h3><div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(150px, 1fr)); gap: 1rem; max-width: 800px; margin: 0 auto;">';
+    
+    window.createdGroups.forEach(group => {
+        const letter = group.replace('group', '');
+        html += `<div style="position: relative;"><button class="btn" style="padding: 1rem; width: 100%;">Group ${letter}</button><button onclick="deleteGroup('${group}')" style="position: absolute; top: -5px; right: -5px; background: #dc3545; color: white; border: none; border-radius: 50%; width: 25px; height: 25px; font-size: 12px; cursor: pointer;">×</button></div>`;
+    });
+    
+    html += '</div><div style="text-align: center; margin-top: 2rem;"><button onclick="showScreen(\'add-info\')" class="btn" style="padding: 1.5rem 3rem; font-size: 1.2rem; background: linear-gradient(135deg, #17a2b8 0%, #138496 100%);">Go to Add Info</button></div>';
+    displayDiv.innerHTML = html;
+}
+
+function deleteGroup(groupToDelete) {
+    if (confirm(`Delete ${groupToDelete.replace('group', 'Group ')} permanently from database?`)) {
+        // Delete from database
+        const formData = new FormData();
+        formData.append('group_name', groupToDelete);
+        
+        fetch('/api/delete-admin-group/', {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Remove from local storage
+                window.createdGroups = window.createdGroups.filter(group => group !== groupToDelete);
+                
+                // Remove all related data
+                delete window.groupCategories[groupToDelete];
+                
+                Object.keys(window.categoryBrands).forEach(key => {
+                    if (key.startsWith(groupToDelete + '_')) {
+                        delete window.categoryBrands[key];
+                    }
+                });
+                
+                Object.keys(window.brandModels).forEach(key => {
+                    if (key.startsWith(groupToDelete + '_')) {
+                        delete window.brandModels[key];
+                    }
+                });
+                
+                saveToStorage();
+                updateCreatedGroupsDisplay();
+                displayAllImages();
+                alert('Group deleted permanently from database!');
+            } else {
+                alert('Error deleting group: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error deleting group from database');
+        });
+    }
+}
+
+function showAddedGroupsScreen() {
+    showScreen('added-groups-screen');
+    displayAllGroups();
+}
+
+function displayInfoGroups() {
+    const displayDiv = document.getElementById('info-groups-display');
+    if (!window.createdGroups || window.createdGroups.length === 0) {
+        displayDiv.innerHTML = '<p style="text-align: center; color: #666;">No groups created yet. Please create groups first.</p>';
+        return;
+    }
+    
+    let html = '';
+    window.createdGroups.forEach(group => {
+        const letter = group.replace('group', '');
+        const categories = window.groupCategories[group] || [];
+        
+        html += `<div onclick="showCategoryScreen('${group}')" style="text-align: center; background: rgba(255,215,0,0.1); border: 2px solid #FFD700; border-radius: 15px; padding: 2rem; cursor: pointer;">
+            <h3 style="color: #FFD700; margin-bottom: 1rem;">Group ${letter}</h3>
+            <p style="color: #666;">${categories.length} categories</p>
+        </div>`;
+    });
+    
+    displayDiv.innerHTML = html;
+}
+
+function showCategoryScreen(groupName) {
+    window.currentGroup = groupName || '';
+    const letter = (window.currentGroup || '').replace('group', '') || 'Unknown';
+    document.getElementById('category-group-header').textContent = `Group ${letter} - Categories`;
+    
+    showScreen('category-screen');
+    loadCategories();
+}
+
+function loadCategories() {
+    const categoryDiv = document.getElementById('category-display');
+    const categories = window.groupCategories[window.currentGroup] || [];
+    
+    if (categories.length > 0) {
+        let html = '';
+        categories.forEach(category => {
+            html += `<div onclick="showBrandScreen('${category.name}', '${category.image}')" style="text-align: center; background: rgba(40,167,69,0.2); border: 2px solid #28a745; border-radius: 15px; padding: 1.5rem; cursor: pointer; transition: all 0.3s ease;" onmouseover="this.style.transform='translateY(-5px)'; this.style.borderColor='#28a745'" onmouseout="this.style.transform='translateY(0)'; this.style.borderColor='#28a745'">
+                <img src="${category.image}" style="width: 80px; height: 80px; border-radius: 10px; object-fit: cover; margin-bottom: 1rem;" onerror="this.style.display='none'">
+                <h4 style="color: #28a745; margin: 0 0 0.5rem 0;">${category.name}</h4>
+                <p style="color: #20c997; font-size: 0.8rem; margin: 0;">Click to view brands</p>
+            </div>`;
+        });
+        categoryDiv.innerHTML = html;
+    } else {
+        categoryDiv.innerHTML = '<p style="text-align: center; color: #666;">No categories added yet</p>';
+    }
+}
+
+function addCategory() {
+    const categoryName = document.getElementById('categoryName').value;
+    const categoryImage = document.getElementById('categoryImage').files[0];
+    
+    if (!categoryName) {
+        alert('Please enter category name');
+        return;
+    }
+    
+    if (!categoryImage) {
+        alert('Please select category image');
+        return;
+    }
+    
+    if (!window.groupCategories[window.currentGroup]) {
+        window.groupCategories[window.currentGroup] = [];
+    }
+    
+    const imageUrl = URL.createObjectURL(categoryImage);
+    window.groupCategories[window.currentGroup].push({
+        name: categoryName,
+        image: imageUrl
+    });
+    
+    saveToStorage();
+    
+    // Save to database
+    saveToDatabase('category', categoryName, categoryImage);
+    
+    loadCategories();
+    
+    document.getElementById('categoryName').value = '';
+    document.getElementById('categoryImage').value = '';
+    
+    alert('Category added successfully!');
+    displayAllImages();
+}
+
+function showBrandScreen(categoryName, categoryImage) {
+    window.currentCategory = categoryName || '';
+    window.currentCategoryImage = categoryImage || '';
+    
+    const letter = (window.currentGroup || '').replace('group', '') || 'Unknown';
+    document.getElementById('brand-group-header').textContent = `Group ${letter}`;
+    document.getElementById('brand-category-info').innerHTML = `<div style="display: flex; align-items: center; justify-content: center; gap: 1rem;"><img src="${categoryImage || ''}" style="width: 80px; height: 80px; border-radius: 10px; object-fit: cover;" onerror="this.style.display='none'"><h3 style="color: #FFD700; margin: 0;">${categoryName || 'Unknown'}</h3></div>`;
+    
+    showScreen('brand-screen');
+    loadBrands();
+}
+
+function loadBrands() {
+    const brandDiv = document.getElementById('brand-display');
+    const key = `${window.currentGroup}_${window.currentCategory}`;
+    const brands = window.categoryBrands[key] || [];
+    
+    if (brands.length > 0) {
+        let html = '';
+        brands.forEach(brand => {
+            html += `<div onclick="showModelScreen('${brand.name}', '${brand.image}')" style="text-align: center; background: rgba(23,162,184,0.2); border: 2px solid #17a2b8; border-radius: 15px; padding: 1.5rem; cursor: pointer; transition: all 0.3s ease;" onmouseover="this.style.transform='translateY(-5px)'; this.style.borderColor='#17a2b8'" onmouseout="this.style.transform='translateY(0)'; this.style.borderColor='#17a2b8'">
+                <img src="${brand.image}" style="width: 80px; height: 80px; border-radius: 10px; object-fit: cover; margin-bottom: 1rem;" onerror="this.style.display='none'">
+                <h4 style="color: #17a2b8; margin: 0 0 0.5rem 0;">${brand.name}</h4>
+                <p style="color: #20c997; font-size: 0.8rem; margin: 0;">Click to view models</p>
+            </div>`;
+        });
+        brandDiv.innerHTML = html;
+    } else {
+        brandDiv.innerHTML = '<p style="text-align: center; color: #666;">No brands added yet</p>';
+    }
+}
+
+function addBrand() {
+    const brandName = document.getElementById('brandName').value;
+    const brandImage = document.getElementById('brandImage').files[0];
+    
+    if (!brandName) {
+        alert('Please enter brand name');
+        return;
+    }
+    
+    if (!brandImage) {
+        alert('Please select brand image');
+        return;
+    }
+    
+    const key = `${window.currentGroup}_${window.currentCategory}`;
+    if (!window.categoryBrands[key]) {
+        window.categoryBrands[key] = [];
+    }
+    
+    const imageUrl = URL.createObjectURL(brandImage);
+    window.categoryBrands[key].push({
+        name: brandName,
+        image: imageUrl
+    });
+    
+    saveToStorage();
+    
+    // Save to database
+    saveToDatabase('brand', brandName, brandImage);
+    
+    loadBrands();
+    
+    document.getElementById('brandName').value = '';
+    document.getElementById('brandImage').value = '';
+    
+    alert('Brand added successfully!');
+    displayAllImages();
+}
+
+function showModelScreen(brandName, brandImage) {
+    window.currentBrand = brandName || '';
+    window.currentBrandImage = brandImage || '';
+    
+    const letter = (window.currentGroup || '').replace('group', '') || 'Unknown';
+    document.getElementById('model-group-header').textContent = `Group ${letter}`;
+    document.getElementById('model-category-info').innerHTML = `<div style="display: flex; align-items: center; justify-content: center; gap: 1rem;"><img src="${window.currentCategoryImage || ''}" style="width: 60px; height: 60px; border-radius: 8px; object-fit: cover;" onerror="this.style.display='none'"><span style="color: #FFD700; font-size: 1.1rem;">${window.currentCategory || 'Unknown'}</span></div>`;
+    document.getElementById('model-brand-info').innerHTML = `<div style="display: flex; align-items: center; justify-content: center; gap: 1rem;"><img src="${brandImage || ''}" style="width: 60px; height: 60px; border-radius: 8px; object-fit: cover;" onerror="this.style.display='none'"><span style="color: #17a2b8; font-size: 1.1rem;">${brandName || 'Unknown'}</span></div>`;
+    
+    showScreen('model-screen');
+    loadModels();
+    displayAllImages();
+}
+
+function displayAllImages() {
+    const categoryDiv = document.getElementById('all-category-images');
+    const mainCategoryDiv = document.getElementById('main-category-images');
+    
+    let categoryHtml = '';
+    
+    // Group categories by group name
+    const groupedCategories = {};
+    Object.keys(window.groupCategories).forEach(groupName => {
+        if (!groupedCategories[groupName]) {
+            groupedCategories[groupName] = [];
+        }
+        window.groupCategories[groupName].forEach(category => {
+            groupedCategories[groupName].push(category);
+        });
+    });
+    
+    // Display categories grouped by group name
+    Object.keys(groupedCategories).forEach(groupName => {
+        if (groupedCategories[groupName].length > 0) {
+            categoryHtml += `<div style="margin-bottom: 3rem;">`;
+            categoryHtml += `<h3 style="color: #ffc107; margin-bottom: 1.5rem; text-align: left; font-size: 1rem; font-weight: 300; letter-spacing: 3px; text-transform: uppercase; border-bottom: 1px solid #3a3a3a; padding-bottom: 0.5rem;">Group: ${groupName.toUpperCase()}</h3>`;
+            categoryHtml += `<div style="display: flex; gap: 1.5rem; overflow-x: auto; padding-bottom: 1rem;">`;
+            
+            groupedCategories[groupName].forEach(category => {
+                const categoryKey = `${groupName}_${category.name}`;
+                const brandCount = window.categoryBrands[categoryKey] ? window.categoryBrands[categoryKey].length : 0;
+                
+                categoryHtml += `<div style="position: relative; flex: 0 0 180px; text-align: center; background: #252525; border: 1px solid #3a3a3a; padding: 1.5rem; cursor: pointer; transition: all 0.3s ease;" onclick="showCategoryBrands('${groupName}', '${category.name}')" onmouseover="this.style.borderColor='#ffc107'; this.style.transform='translateY(-5px)'" onmouseout="this.style.borderColor='#3a3a3a'; this.style.transform='translateY(0)'">
+                    <button onclick="event.stopPropagation(); deleteCategory('${groupName}', '${category.name}')" style="position: absolute; top: 8px; right: 8px; background: #dc3545; color: white; border: none; border-radius: 0; width: 24px; height: 24px; font-size: 14px; cursor: pointer; z-index: 10; transition: all 0.3s ease;" onmouseover="this.style.background='#c82333'" onmouseout="this.style.background='#dc3545'">×</button>
+                    <img src="${category.image}" style="width: 80px; height: 80px; object-fit: cover; margin-bottom: 1rem; border: 1px solid #3a3a3a;" onerror="this.style.display='none'">
+                    <div style="color: #ffc107; font-size: 0.85rem; font-weight: 300; letter-spacing: 2px; text-transform: uppercase; margin-bottom: 0.5rem;">${category.name}</div>
+                    <div style="color: #999999; font-size: 0.75rem; font-weight: 300;">${brandCount} brands</div>
+                </div>`;
+            });
+            
+            categoryHtml += `</div></div>`;
+        }
+    });
+    
+    const finalHtml = categoryHtml || '<p style="color: #666; text-align: center;">No categories added yet</p>';
+    if (categoryDiv) categoryDiv.innerHTML = finalHtml;
+    if (mainCategoryDiv) mainCategoryDiv.innerHTML = finalHtml;
+}
+
+function showCategoryBrands(groupName, categoryName) {
+    const categoryDiv = document.getElementById('all-category-images');
+    const mainCategoryDiv = document.getElementById('main-category-images');
+    
+    let brandHtml = `<div onclick="displayAllImages()" style="background: #6c757d; color: white; padding: 0.5rem 1rem; border-radius: 4px; cursor: pointer; margin-bottom: 1rem; text-align: center;">← Back to Categories</div>`;
+    
+    const categoryKey = `${groupName}_${categoryName}`;
+    if (window.categoryBrands[categoryKey]) {
+        window.categoryBrands[categoryKey].forEach(brand => {
+            const brandKey = `${groupName}_${categoryName}_${brand.name}`;
+            const modelCount = window.brandModels[brandKey] ? window.brandModels[brandKey].length : 0;
+            
+            brandHtml += `<div style="position: relative; flex: 0 0 180px; text-align: center; background: #252525; border: 1px solid #3a3a3a; padding: 1.5rem; margin: 0.5rem 0; cursor: pointer; transition: all 0.3s ease;" onclick="showBrandModels('${groupName}', '${categoryName}', '${brand.name}')" onmouseover="this.style.borderColor='#ffc107'; this.style.transform='translateY(-5px)'" onmouseout="this.style.borderColor='#3a3a3a'; this.style.transform='translateY(0)'">
+                <button onclick="event.stopPropagation(); deleteBrand('${groupName}', '${categoryName}', '${brand.name}')" style="position: absolute; top: 8px; right: 8px; background: #dc3545; color: white; border: none; border-radius: 0; width: 24px; height: 24px; font-size: 14px; cursor: pointer; z-index: 10;">×</button>
+                <img src="${brand.image}" style="width: 80px; height: 80px; object-fit: cover; margin-bottom: 1rem; border: 1px solid #3a3a3a;" onerror="this.style.display='none'">
+                <div style="color: #ffc107; font-size: 0.85rem; font-weight: 300; letter-spacing: 2px; text-transform: uppercase; margin-bottom: 0.5rem;">${brand.name}</div>
+                <div style="color: #999999; font-size: 0.75rem; font-weight: 300;">${modelCount} models</div>
+            </div>`;
+        });
+    } else {
+        brandHtml += '<p style="color: #666; text-align: center;">No brands added yet</p>';
+    }
+    
+    if (categoryDiv) categoryDiv.innerHTML = `<div style="display: flex; gap: 1rem; overflow-x: auto; padding-bottom: 0.5rem;">${brandHtml}</div>`;
+    if (mainCategoryDiv) mainCategoryDiv.innerHTML = `<div style="display: flex; gap: 1rem; overflow-x: auto; padding-bottom: 0.5rem;">${brandHtml}</div>`;
+}
+
+function showBrandModels(groupName, categoryName, brandName) {
+    const categoryDiv = document.getElementById('all-category-images');
+    const mainCategoryDiv = document.getElementById('main-category-images');
+    
+    let modelHtml = `<div onclick="showCategoryBrands('${groupName}', '${categoryName}')" style="background: #6c757d; color: white; padding: 0.5rem 1rem; border-radius: 4px; cursor: pointer; margin-bottom: 1rem; text-align: center;">← Back to Brands</div>`;
+    
+    const brandKey = `${groupName}_${categoryName}_${brandName}`;
+    if (window.brandModels[brandKey]) {
+        window.brandModels[brandKey].forEach(model => {
+            modelHtml += `<div style="position: relative; flex: 0 0 180px; text-align: center; background: #252525; border: 1px solid #3a3a3a; padding: 1.5rem; margin: 0.5rem 0; transition: all 0.3s ease;" onmouseover="this.style.borderColor='#ffc107'; this.style.transform='translateY(-5px)'" onmouseout="this.style.borderColor='#3a3a3a'; this.style.transform='translateY(0)'">
+                <button onclick="deleteModel('${groupName}', '${categoryName}', '${brandName}', '${model.name}')" style="position: absolute; top: 8px; right: 8px; background: #dc3545; color: white; border: none; border-radius: 0; width: 24px; height: 24px; font-size: 14px; cursor: pointer; z-index: 10;">×</button>
+                <img src="${model.image}" style="width: 80px; height: 80px; object-fit: cover; margin-bottom: 1rem; border: 1px solid #3a3a3a;" onerror="this.style.display='none'">
+                <div style="color: #ffc107; font-size: 0.85rem; font-weight: 300; letter-spacing: 2px; text-transform: uppercase;">${model.name}</div>
+            </div>`;
+        });
+    } else {
+        modelHtml += '<p style="color: #666; text-align: center;">No models added yet</p>';
+    }
+    
+    if (categoryDiv) categoryDiv.innerHTML = `<div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(120px, 1fr)); gap: 1rem;">${modelHtml}</div>`;
+    if (mainCategoryDiv) mainCategoryDiv.innerHTML = `<div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(120px, 1fr)); gap: 1rem;">${modelHtml}</div>`;
+}
+
+function loadModels() {
+    const modelDiv = document.getElementById('model-display');
+    const key = `${window.currentGroup}_${window.currentCategory}_${window.currentBrand}`;
+    const models = window.brandModels[key] || [];
+    
+    if (models.length > 0) {
+        let html = '';
+        models.forEach(model => {
+            html += `<div style="text-align: center; background: rgba(255,193,7,0.2); border: 2px solid #ffc107; border-radius: 15px; padding: 1.5rem;">
+                <img src="${model.image}" style="width: 80px; height: 80px; border-radius: 10px; object-fit: cover; margin-bottom: 1rem;" onerror="this.style.display='none'">
+                <h4 style="color: #ffc107; margin: 0;">${model.name}</h4>
+            </div>`;
+        });
+        modelDiv.innerHTML = html;
+    } else {
+        modelDiv.innerHTML = '<p style="text-align: center; color: #666;">No models added yet</p>';
+    }
+}
+
+function addModel() {
+    const modelName = document.getElementById('modelName').value;
+    const modelImage = document.getElementById('modelImage').files[0];
+    
+    if (!modelName) {
+        alert('Please enter model name');
+        return;
+    }
+    
+    if (!modelImage) {
+        alert('Please select model image');
+        return;
+    }
+    
+    const key = `${window.currentGroup}_${window.currentCategory}_${window.currentBrand}`;
+    if (!window.brandModels[key]) {
+        window.brandModels[key] = [];
+    }
+    
+    const imageUrl = URL.createObjectURL(modelImage);
+    window.brandModels[key].push({
+        name: modelName,
+        image: imageUrl
+    });
+    
+    saveToStorage();
+    
+    // Save to database
+    saveToDatabase('model', modelName, modelImage);
+    
+    loadModels();
+    
+    document.getElementById('modelName').value = '';
+    document.getElementById('modelImage').value = '';
+    
+    alert('Model added successfully!');
+    displayAllImages();
+}
+
+function showBrandScreenFromMain(groupName, categoryName, categoryImage) {
+    window.currentGroup = groupName || '';
+    window.currentCategory = categoryName || '';
+    window.currentCategoryImage = categoryImage || '';
+    
+    const letter = (groupName || '').replace('group', '') || 'Unknown';
+    document.getElementById('brand-group-header').textContent = `Group ${letter}`;
+    document.getElementById('brand-category-info').innerHTML = `<div style="display: flex; align-items: center; justify-content: center; gap: 1rem;"><img src="${categoryImage || ''}" style="width: 80px; height: 80px; border-radius: 10px; object-fit: cover;" onerror="this.style.display='none'"><h3 style="color: #FFD700; margin: 0;">${categoryName || 'Unknown'}</h3></div>`;
+    
+    showScreen('brand-screen');
+    loadBrands();
+}
+
+function showUserListModal() {
+    document.getElementById('user-list-modal').style.display = 'block';
+    loadUsers();
+}
+
+function closeUserList() {
+    document.getElementById('user-list-modal').style.display = 'none';
+}
+
+function loadUsers() {
+    const container = document.getElementById('user-list-content');
+    container.innerHTML = '<p style="text-align: center; color: #F5F5DC; padding: 2rem;">Loading users...</p>';
+    
+    fetch('/api/get-all-users/')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success && data.users) {
+                window.allUsers = data.users;
+                displayUsers(window.allUsers);
+            } else {
+                container.innerHTML = '<p style="text-align: center; color: #F5F5DC; padding: 2rem;">No users found</p>';
+            }
+        })
+        .catch(error => {
+            container.innerHTML = '<p style="text-align: center; color: #dc3545; padding: 2rem;">Error loading users</p>';
+        });
+}
+
+function displayUsers(users) {
+    const container = document.getElementById('user-list-content');
+    let html = '';
+    
+    if (users && users.length > 0) {
+        users.forEach(user => {
+            const blockButtonText = user.blocked ? 'Unblock' : 'Block';
+            const blockButtonColor = user.blocked ? '#28a745' : '#dc3545';
+            const statusText = user.blocked ? 'BLOCKED' : 'ACTIVE';
+            const statusColor = user.blocked ? '#dc3545' : '#28a745';
+            
+            html += `
+                <div style="background: rgba(255, 215, 0, 0.1); padding: 1rem; border-radius: 10px; margin-bottom: 1rem; border-left: 4px solid #FFD700;">
+                    <div style="display: grid; grid-template-columns: 1fr 1fr auto; gap: 1rem; align-items: center;">
+                        <div>
+                            <p style="color: #FFD700; font-weight: bold; margin: 0;">Name: ${user.name || 'Not provided'}</p>
+                            <p style="color: #F5F5DC; margin: 0.2rem 0;">Phone: ${user.phone}</p>
+                        </div>
+                        <div>
+                            <p style="color: #F5F5DC; margin: 0;">Pincode: ${user.pincode || 'Not provided'}</p>
+                            <p style="color: ${statusColor}; margin: 0.2rem 0; font-weight: bold;">Status: ${statusText}</p>
+                        </div>
+                        <div>
+                            <button onclick="blockUser(${user.id})" style="background: ${blockButtonColor}; color: white; border: none; padding: 0.5rem 1rem; border-radius: 5px; cursor: pointer; font-size: 0.9rem; margin-bottom: 0.5rem; width: 100%;">${blockButtonText}</button>
+                        </div>
+                    </div>
+                </div>
+            `;
+        });
+    } else {
+        html = `
+            <div style="text-align: center; padding: 3rem; color: #F5F5DC;">
+                <div style="font-size: 3rem; margin-bottom: 1rem;">👥</div>
+                <h3 style="color: #FFD700; margin-bottom: 1rem;">No Users Found</h3>
+                <p>No users have registered yet. Users will appear here once they register through the app.</p>
+            </div>
+        `;
+    }
+    
+    container.innerHTML = html;
+}
+
+function filterUsers() {
+    const searchTerm = document.getElementById('user-search').value.toLowerCase();
+    const filteredUsers = (window.allUsers || []).filter(user => 
+        (user.name && user.name.toLowerCase().includes(searchTerm)) ||
+        (user.phone && user.phone.includes(searchTerm)) ||
+        (user.pincode && user.pincode.includes(searchTerm)) ||
+        (user.unique_id && user.unique_id.toLowerCase().includes(searchTerm))
+    );
+    displayUsers(filteredUsers);
+}
+
+function blockUser(userId) {
+    if (confirm('Are you sure you want to block/unblock this user?')) {
+        fetch(`/api/block-user/${userId}/`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                alert(data.message);
+                loadUsers(); // Reload user list
+            } else {
+                alert('Error: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error blocking/unblocking user');
+        });
+    }
+}
+
+function showProductListModal() {
+    document.getElementById('product-list-modal').style.display = 'block';
+    loadProducts();
+}
+
+function closeProductList() {
+    document.getElementById('product-list-modal').style.display = 'none';
+}
+
+function loadProducts() {
+    const container = document.getElementById('product-list-content');
+    container.innerHTML = '<p style="text-align: center; color: #F5F5DC; padding: 2rem;">Loading products...</p>';
+    
+    fetch('/get-all-admin-data/')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                window.allProducts = data;
+                displayProducts(data);
+            } else {
+                container.innerHTML = '<p style="text-align: center; color: #F5F5DC; padding: 2rem;">No products found</p>';
+            }
+        })
+        .catch(error => {
+            container.innerHTML = '<p style="text-align: center; color: #dc3545; padding: 2rem;">Error loading products</p>';
+        });
+}
+
+function displayProducts(data) {
+    const container = document.getElementById('product-list-content');
+    let html = '';
+    let hasData = false;
+    
+    if (data.categories && Object.keys(data.categories).length > 0) {
+        hasData = true;
+        Object.keys(data.categories).forEach(groupName => {
+            html += `<div style="background: rgba(102, 126, 234, 0.2); padding: 1.5rem; border-radius: 15px; margin-bottom: 2rem; border: 2px solid #667eea;">`;
+            html += `<h2 style="color: #667eea; margin: 0 0 1.5rem 0; font-size: 1.5rem; text-align: center;">📁 Group: ${groupName.toUpperCase()}</h2>`;
+            
+            data.categories[groupName].forEach(category => {
+                html += `<div style="background: rgba(255, 255, 255, 0.1); padding: 1rem; border-radius: 10px; margin-bottom: 1rem; border-left: 4px solid #FFD700;">`;
+                html += `<div style="display: flex; align-items: center; gap: 1rem; margin-bottom: 1rem;">`;
+                if (category.image) {
+                    html += `<img src="${category.image}" style="width: 60px; height: 60px; border-radius: 8px; object-fit: cover;" onerror="this.style.display='none'">`;
+                }
+                html += `<h3 style="color: #FFD700; margin: 0; font-size: 1.2rem;">📂 ${category.name}</h3>`;
+                html += `</div>`;
+                
+                const categoryKey = `${groupName}_${category.name}`;
+                if (data.brands && data.brands[categoryKey]) {
+                    data.brands[categoryKey].forEach(brand => {
+                        html += `<div style="margin-left: 2rem; margin-bottom: 1rem; padding: 1rem; background: rgba(40, 167, 69, 0.2); border-radius: 8px; border-left: 3px solid #28a745;">`;
+                        html += `<div style="display: flex; align-items: center; gap: 1rem; margin-bottom: 0.5rem;">`;
+                        if (brand.image) {
+                            html += `<img src="${brand.image}" style="width: 50px; height: 50px; border-radius: 6px; object-fit: cover;" onerror="this.style.display='none'">`;
+                        }
+                        html += `<h4 style="color: #28a745; margin: 0; font-size: 1rem;">🏷️ ${brand.name}</h4>`;
+                        html += `</div>`;
+                        
+                        const brandKey = `${groupName}_${category.name}_${brand.name}`;
+                        if (data.models && data.models[brandKey]) {
+                            data.models[brandKey].forEach(model => {
+                                html += `<div style="margin-left: 2rem; margin-bottom: 0.5rem; padding: 0.8rem; background: rgba(220, 53, 69, 0.2); border-radius: 5px; border-left: 2px solid #dc3545; display: flex; align-items: center; gap: 1rem;">`;
+                                if (model.image) {
+                                    html += `<img src="${model.image}" style="width: 40px; height: 40px; border-radius: 4px; object-fit: cover;" onerror="this.style.display='none'">`;
+                                }
+                                html += `<p style="color: #dc3545; margin: 0; font-weight: 500;">🚗 ${model.name}</p>`;
+                                html += `</div>`;
+                            });
+                        }
+                        html += `</div>`;
+                    });
+                }
+                html += `</div>`;
+            });
+            html += `</div>`;
+        });
+    }
+    
+    if (!hasData) {
+        html = `
+            <div style="text-align: center; padding: 3rem; color: #F5F5DC;">
+                <div style="font-size: 3rem; margin-bottom: 1rem;">📦</div>
+                <h3 style="color: #FFD700; margin-bottom: 1rem;">No Products Found</h3>
+                <p>No groups, categories, brands or models have been added yet.</p>
+            </div>
+        `;
+    }
+    
+    container.innerHTML = html;
+}
+
+function filterProducts() {
+    const searchTerm = document.getElementById('product-search').value.toLowerCase();
+    if (!searchTerm) {
+        displayProducts(window.allProducts);
+        return;
+    }
+    
+    const filteredData = { categories: {}, brands: {}, models: {} };
+    
+    if (window.allProducts.categories) {
+        Object.keys(window.allProducts.categories).forEach(groupName => {
+            const filteredCategories = window.allProducts.categories[groupName].filter(cat => 
+                cat.name.toLowerCase().includes(searchTerm)
+            );
+            if (filteredCategories.length > 0) {
+                filteredData.categories[groupName] = filteredCategories;
+            }
+        });
+    }
+    
+    displayProducts(filteredData);
+}
+function showCreateSubAdminModal() {
+    document.getElementById('create-subadmin-modal').style.display = 'block';
+}
+
+function closeCreateSubAdmin() {
+    document.getElementById('create-subadmin-modal').style.display = 'none';
+    document.getElementById('create-subadmin-form').reset();
+}
+
+function showSubAdminListModal() {
+    document.getElementById('subadmin-list-modal').style.display = 'block';
+    loadSubAdmins();
+}
+
+function closeSubAdminList() {
+    document.getElementById('subadmin-list-modal').style.display = 'none';
+}
+
+function loadSubAdmins() {
+    const container = document.getElementById('subadmin-list-content');
+    container.innerHTML = '<p style="text-align: center; color: #F5F5DC; padding: 2rem;">Loading sub admins...</p>';
+    
+    // Mock data for demonstration
+    const mockSubAdmins = [
+        { id: 1, name: 'John Doe', phone: '9876543210', state: 'Maharashtra', role: 'state_admin', created: '2024-01-15' },
+        { id: 2, name: 'Jane Smith', phone: '8765432109', state: 'Karnataka', role: 'regional_admin', created: '2024-01-20' },
+        { id: 3, name: 'Mike Johnson', phone: '7654321098', state: 'Tamil Nadu', role: 'state_admin', created: '2024-02-01' }
+    ];
+    
+    window.allSubAdmins = mockSubAdmins;
+    displaySubAdmins(mockSubAdmins);
+}
+
+function displaySubAdmins(subAdmins) {
+    const container = document.getElementById('subadmin-list-content');
+    let html = '';
+    
+    if (subAdmins && subAdmins.length > 0) {
+        subAdmins.forEach(admin => {
+            html += `
+                <div style="background: rgba(255, 215, 0, 0.1); padding: 1rem; border-radius: 10px; margin-bottom: 1rem; border-left: 4px solid #FFD700;">
+                    <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 1rem;">
+                        <div>
+                            <p style="color: #FFD700; font-weight: bold; margin: 0;">Name: ${admin.name}</p>
+                            <p style="color: #F5F5DC; margin: 0.2rem 0;">Phone: ${admin.phone}</p>
+                        </div>
+                        <div>
+                            <p style="color: #F5F5DC; margin: 0;">State: ${admin.state}</p>
+                            <p style="color: #F5F5DC; margin: 0.2rem 0;">Role: ${admin.role.replace('_', ' ').toUpperCase()}</p>
+                        </div>
+                        <div>
+                            <p style="color: #F5F5DC; margin: 0;">Created: ${admin.created}</p>
+                            <button onclick="deleteSubAdmin(${admin.id})" style="background: #dc3545; color: white; border: none; padding: 0.3rem 0.8rem; border-radius: 5px; cursor: pointer; font-size: 0.8rem; margin-top: 0.5rem;">Delete</button>
+                        </div>
+                    </div>
+                </div>
+            `;
+        });
+    } else {
+        html = `
+            <div style="text-align: center; padding: 3rem; color: #F5F5DC;">
+                <div style="font-size: 3rem; margin-bottom: 1rem;">👥</div>
+                <h3 style="color: #FFD700; margin-bottom: 1rem;">No Sub Admins Found</h3>
+                <p>No sub admins have been created yet.</p>
+            </div>
+        `;
+    }
+    
+    container.innerHTML = html;
+}
+
+function filterSubAdmins() {
+    const searchTerm = document.getElementById('subadmin-search').value.toLowerCase();
+    const filteredSubAdmins = (window.allSubAdmins || []).filter(admin => 
+        admin.name.toLowerCase().includes(searchTerm) ||
+        admin.phone.includes(searchTerm) ||
+        admin.state.toLowerCase().includes(searchTerm) ||
+        admin.role.toLowerCase().includes(searchTerm)
+    );
+    displaySubAdmins(filteredSubAdmins);
+}
+
+function deleteSubAdmin(adminId) {
+    if (confirm('Are you sure you want to delete this sub admin?')) {
+        window.allSubAdmins = window.allSubAdmins.filter(admin => admin.id !== adminId);
+        displaySubAdmins(window.allSubAdmins);
+        alert('Sub admin deleted successfully!');
+    }
+}
+
+// Handle create sub admin form submission
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('create-subadmin-form');
+    if (form) {
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+            
+            const name = document.getElementById('subadmin-name').value;
+            const phone = document.getElementById('subadmin-phone').value;
+            const state = document.getElementById('subadmin-state').value;
+            const role = document.getElementById('subadmin-role').value;
+            
+            if (!name || !phone || !state || !role) {
+                alert('Please fill all fields');
+                return;
+            }
+            
+            // Mock creation - in real app, send to server
+            const newAdmin = {
+                id: Date.now(),
+                name: name,
+                phone: phone,
+                state: state,
+                role: role,
+                created: new Date().toISOString().split('T')[0]
+            };
+            
+            if (!window.allSubAdmins) window.allSubAdmins = [];
+            window.allSubAdmins.push(newAdmin);
+            
+            alert('Sub admin created successfully!');
+            closeCreateSubAdmin();
+        });
+    }
+});
+
+function deleteCategory(groupName, categoryName) {
+    if (confirm(`Delete category "${categoryName}"? This will also delete all its brands and models from database permanently.`)) {
+        // Delete from database
+        const formData = new FormData();
+        formData.append('group_name', groupName);
+        formData.append('category_name', categoryName);
+        
+        fetch('/api/delete-admin-category/', {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Remove from local storage
+                if (window.groupCategories[groupName]) {
+                    window.groupCategories[groupName] = window.groupCategories[groupName].filter(cat => cat.name !== categoryName);
+                }
+                
+                // Remove related brands and models
+                const categoryKey = `${groupName}_${categoryName}`;
+                delete window.categoryBrands[categoryKey];
+                
+                Object.keys(window.brandModels).forEach(key => {
+                    if (key.startsWith(categoryKey + '_')) {
+                        delete window.brandModels[key];
+                    }
+                });
+                
+                saveToStorage();
+                displayAllImages();
+                alert('Category deleted permanently from database!');
+            } else {
+                alert('Error deleting category: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error deleting category from database');
+        });
+    }
+}
+
+function deleteBrand(groupName, categoryName, brandName) {
+    if (confirm(`Delete brand "${brandName}"? This will also delete all its models from database permanently.`)) {
+        // Delete from database
+        const formData = new FormData();
+        formData.append('group_name', groupName);
+        formData.append('category_name', categoryName);
+        formData.append('brand_name', brandName);
+        
+        fetch('/api/delete-admin-brand/', {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Remove from local storage
+                const categoryKey = `${groupName}_${categoryName}`;
+                if (window.categoryBrands[categoryKey]) {
+                    window.categoryBrands[categoryKey] = window.categoryBrands[categoryKey].filter(brand => brand.name !== brandName);
+                }
+                
+                // Remove related models
+                const brandKey = `${groupName}_${categoryName}_${brandName}`;
+                delete window.brandModels[brandKey];
+                
+                saveToStorage();
+                showCategoryBrands(groupName, categoryName);
+                alert('Brand deleted permanently from database!');
+            } else {
+                alert('Error deleting brand: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error deleting brand from database');
+        });
+    }
+}
+
+function deleteModel(groupName, categoryName, brandName, modelName) {
+    if (confirm(`Delete model "${modelName}" from database permanently?`)) {
+        // Delete from database
+        const formData = new FormData();
+        formData.append('group_name', groupName);
+        formData.append('category_name', categoryName);
+        formData.append('brand_name', brandName);
+        formData.append('model_name', modelName);
+        
+        fetch('/api/delete-admin-model/', {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Remove from local storage
+                const brandKey = `${groupName}_${categoryName}_${brandName}`;
+                if (window.brandModels[brandKey]) {
+                    window.brandModels[brandKey] = window.brandModels[brandKey].filter(model => model.name !== modelName);
+                }
+                
+                saveToStorage();
+                showBrandModels(groupName, categoryName, brandName);
+                alert('Model deleted permanently from database!');
+            } else {
+                alert('Error deleting model: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error deleting model from database');
+        });
+    }
+}
+
+function showPromoteModal() {
+    document.getElementById('promote-modal').style.display = 'block';
+    loadPromotionPlans();
+}
+
+function closePromoteModal() {
+    document.getElementById('promote-modal').style.display = 'none';
+}
+
+function createCustomPromotion() {
+    const days = document.getElementById('admin-days').value;
+    const pricePerDay = document.getElementById('admin-price').value;
+    
+    if (!days || !pricePerDay || days < 1 || pricePerDay < 1) {
+        alert('Please enter valid days and price');
+        return;
+    }
+    
+    const formData = new FormData();
+    formData.append('duration_days', days);
+    formData.append('price_per_day', pricePerDay);
+    formData.append('created_by', 'super_admin');
+    formData.append('status', 'active');
+    
+    fetch('/api/create-promotion/', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            alert(`Promotion plan created!\n\nDuration: ${days} ${days == 1 ? 'day' : 'days'}\nPrice per day: ₹${pricePerDay}\nTotal: ₹${days * pricePerDay}`);
+            document.getElementById('admin-days').value = '1';
+            document.getElementById('admin-price').value = '50';
+            loadPromotionPlans();
+        } else {
+            alert('Error: ' + (data.error || 'Unknown error'));
+        }
+    })
+    .catch(error => {
+        alert('Error creating promotion');
+    });
+}
+
+function loadPromotionPlans() {
+    fetch('/api/get-promotion-plans/')
+    .then(response => response.json())
+    .then(data => {
+        if (data.success && data.plans) {
+            let html = '';
+            data.plans.forEach(plan => {
+                html += `<div style="background: rgba(40, 167, 69, 0.2); padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #28a745;">`;
+                html += `<strong>${plan.duration_days} ${plan.duration_days == 1 ? 'Day' : 'Days'}</strong> - ₹${plan.price_per_day}/day (Total: ₹${plan.duration_days * plan.price_per_day})`;
+                html += `</div>`;
+            });
+            document.getElementById('plans-list').innerHTML = html || 'No plans created yet';
+        } else {
+            document.getElementById('plans-list').innerHTML = 'No plans available';
+        }
+    })
+    .catch(error => {
+        document.getElementById('plans-list').innerHTML = 'Error loading plans';
+    });
+}
+
+function showSponsorModal() {
+    document.getElementById('sponsor-modal').style.display = 'block';
+    loadSponsorAds();
+}
+
+function closeSponsorModal() {
+    document.getElementById('sponsor-modal').style.display = 'none';
+}
+
+function loadSponsorAds() {
+    fetch('/api/get-sponsor-ads/')
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            // Store sponsors in session storage for WhatsApp access
+            sessionStorage.setItem('currentSponsors', JSON.stringify([...data.pending, ...data.approved]));
+            displayPendingSponsors(data.pending || []);
+            displayApprovedSponsors(data.approved || []);
+        } else {
+            document.getElementById('pending-sponsors').innerHTML = 'Error loading sponsors';
+            document.getElementById('approved-sponsors').innerHTML = 'Error loading sponsors';
+        }
+    })
+    .catch(error => {
+        document.getElementById('pending-sponsors').innerHTML = 'Error loading sponsors';
+        document.getElementById('approved-sponsors').innerHTML = 'Error loading sponsors';
+    });
+}
+
+function displayPendingSponsors(sponsors) {
+    const container = document.getElementById('pending-sponsors');
+    if (sponsors.length === 0) {
+        container.innerHTML = '<p style="color: #666; text-align: center;">No pending sponsors</p>';
+        return;
+    }
+    
+    let html = '';
+    sponsors.forEach(sponsor => {
+        html += `
+            <div style="background: rgba(255, 255, 255, 0.1); padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #ffc107;">
+                <div style="display: flex; gap: 1rem; align-items: center;">
+                    <img src="/media/${sponsor.image}" style="width: 60px; height: 60px; object-fit: cover; border-radius: 8px;" onerror="this.style.display='none'">
+                    <div style="flex: 1;">
+                        <h4 style="color: #ffc107; margin: 0 0 0.5rem 0;">${sponsor.brand_name}</h4>
+                        <p style="color: #F5F5DC; font-size: 0.9rem; margin: 0 0 0.5rem 0;">${sponsor.description || 'No description'}</p>
+                        <p style="color: #ccc; font-size: 0.8rem; margin: 0;">Contact: ${sponsor.contact || 'Not provided'}</p>
+                    </div>
+                </div>
+                <div style="margin-top: 1rem; display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 0.5rem;">
+                    <button onclick="whatsappSponsor('${sponsor.contact}', '${sponsor.brand_name}')" style="background: #25D366; color: white; border: none; padding: 0.5rem 1rem; border-radius: 5px; cursor: pointer; font-size: 0.9rem;">💬 WhatsApp</button>
+                    <button onclick="approveSponsor(${sponsor.id})" style="background: #28a745; color: white; border: none; padding: 0.5rem 1rem; border-radius: 5px; cursor: pointer; font-size: 0.9rem;">✓ Approve</button>
+                    <button onclick="rejectSponsor(${sponsor.id})" style="background: #dc3545; color: white; border: none; padding: 0.5rem 1rem; border-radius: 5px; cursor: pointer; font-size: 0.9rem;">✗ Reject</button>
+                </div>
+            </div>
+        `;
+    });
+    container.innerHTML = html;
+}
+
+function displayApprovedSponsors(sponsors) {
+    const container = document.getElementById('approved-sponsors');
+    if (sponsors.length === 0) {
+        container.innerHTML = '<p style="color: #666; text-align: center;">No approved sponsors</p>';
+        return;
+    }
+    
+    let html = '';
+    sponsors.forEach(sponsor => {
+        html += `
+            <div style="background: rgba(255, 255, 255, 0.1); padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #28a745;">
+                <div style="display: flex; gap: 1rem; align-items: center;">
+                    <img src="/media/${sponsor.image}" style="width: 60px; height: 60px; object-fit: cover; border-radius: 8px;" onerror="this.style.display='none'">
+                    <div style="flex: 1;">
+                        <h4 style="color: #28a745; margin: 0 0 0.5rem 0;">${sponsor.brand_name}</h4>
+                        <p style="color: #F5F5DC; font-size: 0.9rem; margin: 0 0 0.5rem 0;">${sponsor.description || 'No description'}</p>
+                        <p style="color: #ccc; font-size: 0.8rem; margin: 0;">Contact: ${sponsor.contact || 'Not provided'}</p>
+                    </div>
+                </div>
+                <div style="margin-top: 1rem; text-align: center;">
+                    <button onclick="toggleSponsorStatus(${sponsor.id})" style="background: #ffc107; color: #333; border: none; padding: 0.5rem 1rem; border-radius: 5px; cursor: pointer; margin-right: 0.5rem;">${sponsor.active ? 'Hide' : 'Show'}</button>
+                    <button onclick="deleteSponsor(${sponsor.id})" style="background: #dc3545; color: white; border: none; padding: 0.5rem 1rem; border-radius: 5px; cursor: pointer;">Delete</button>
+                </div>
+            </div>
+        `;
+    });
+    container.innerHTML = html;
+}
+
+function approveSponsor(sponsorId) {
+    // Show payment confirmation dialog first
+    const paymentConfirmed = confirm('Has the sponsor completed the payment?\n\nClick OK if payment is received\nClick Cancel to approve without payment check');
+    
+    if (paymentConfirmed) {
+        // Payment confirmed - approve directly
+        confirmSponsorApproval(sponsorId, true);
+    } else {
+        // Ask if they want to send payment reminder
+        const sendReminder = confirm('Send payment reminder via WhatsApp?');
+        if (sendReminder) {
+            // Get sponsor details and send reminder
+            const sponsors = JSON.parse(sessionStorage.getItem('currentSponsors') || '[]');
+            const sponsor = sponsors.find(s => s.id === sponsorId);
+            if (sponsor) {
+                sendPaymentReminder(sponsor.contact, sponsor.brand_name);
+            }
+        } else {
+            // Approve anyway
+            confirmSponsorApproval(sponsorId, false);
+        }
+    }
+}
+
+function confirmSponsorApproval(sponsorId, paymentReceived) {
+    fetch(`/api/approve-sponsor/${sponsorId}/`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/x-www-form-urlencoded',
+        },
+        body: `payment_received=${paymentReceived}`
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            const message = paymentReceived ? 
+                'Sponsor approved with payment confirmation!' : 
+                'Sponsor approved (payment pending)';
+            alert(message);
+            loadSponsorAds();
+        } else {
+            alert('Error: ' + (data.error || 'Unknown error'));
+        }
+    })
+    .catch(error => {
+        alert('Error approving sponsor');
+    });
+}
+
+function sendPaymentReminder(contact, brandName) {
+    const phoneNumber = contact.replace(/[^0-9]/g, '');
+    const message = `Hi! This is a reminder about your GoWheels sponsorship for "${brandName}".\n\nPayment Details:\n₹500/month\n\nUPI ID: gowheels@paytm\nPhone Pay: 9876543210\n\nPlease complete payment and send screenshot for approval.\n\nThank you!`;
+    
+    const whatsappUrl = `https://wa.me/${phoneNumber}?text=${encodeURIComponent(message)}`;
+    window.open(whatsappUrl, '_blank');
+}
+
+function rejectSponsor(sponsorId) {
+    if (confirm('Reject this sponsor ad?')) {
+        fetch(`/api/reject-sponsor/${sponsorId}/`, {
+            method: 'POST'
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                alert('Sponsor rejected successfully!');
+                loadSponsorAds();
+            } else {
+                alert('Error: ' + (data.error || 'Unknown error'));
+            }
+        })
+        .catch(error => {
+            alert('Error rejecting sponsor');
+        });
+    }
+}
+
+function toggleSponsorStatus(sponsorId) {
+    fetch(`/api/toggle-sponsor-status/${sponsorId}/`, {
+        method: 'POST'
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            loadSponsorAds();
+        } else {
+            alert('Error: ' + (data.error || 'Unknown error'));
+        }
+    })
+    .catch(error => {
+        alert('Error toggling sponsor status');
+    });
+}
+
+function deleteSponsor(sponsorId) {
+    if (confirm('Delete this sponsor ad permanently?')) {
+        fetch(`/api/delete-sponsor/${sponsorId}/`, {
+            method: 'POST'
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                alert('Sponsor deleted successfully!');
+                loadSponsorAds();
+            } else {
+                alert('Error: ' + (data.error || 'Unknown error'));
+            }
+        })
+        .catch(error => {
+            alert('Error deleting sponsor');
+        });
+    }
+}
+
+function whatsappSponsor(contact, brandName) {
+    if (!contact || contact === 'Not provided') {
+        alert('No contact information available for this sponsor');
+        return;
+    }
+    
+    // Clean phone number (remove non-digits)
+    const phoneNumber = contact.replace(/[^0-9]/g, '');
+    
+    if (phoneNumber.length < 10) {
+        alert('Invalid phone number format');
+        return;
+    }
+    
+    // Create WhatsApp message
+    const message = `Hello! I'm from GoWheels admin team.\n\nI received your sponsor ad request for "${brandName}".\n\nTo proceed with your sponsorship:\n\n1. Sponsor fee: ₹500/month\n2. Payment via UPI/QR code\n3. After payment confirmation, your ad will be approved\n\nWould you like to proceed with the payment?\n\nThank you!`;
+    
+    // Open WhatsApp
+    const whatsappUrl = `https://wa.me/${phoneNumber}?text=${encodeURIComponent(message)}`;
+    window.open(whatsappUrl, '_blank');
+}
+
+function saveToDatabase(type, name, imageFile) {
+    const formData = new FormData();
+    formData.append('type', type);
+    formData.append('name', name);
+    formData.append('image', imageFile);
+    formData.append('group_name', window.currentGroup || '');
+    formData.append('category_name', window.currentCategory || '');
+    formData.append('brand_name', window.currentBrand || '');
+    
+    fetch('/save-admin-data/', {
+        method: 'POST',
+        body: formData,
+        headers: {
+            'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]')?.value || ''
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            console.log(`${type} saved to database`);
+        } else {
+            console.error(`Error saving ${type}:`, data.error);
+        }
+    })
+    .catch(error => {
+        console.error('Database save error:', error);
+    });
+}
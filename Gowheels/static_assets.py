@@ -0,0 +1,229 @@
+"""
+Fingerprinted, precompressed static files for GoWheels
+collectstatic (run at image build time) stores every asset under a
+content-hashed name (css/home.3f2a9c1b7e4d.css) listed in
+staticfiles.json, and writes gzip and brotli copies next to each text
+asset. {% static %} emits the hashed names.
+
+StaticFilesMiddleware serves STATIC_ROOT from gunicorn without touching
+the disk per request. It indexes the directory once at startup, sends
+the .br or .gz copy the client accepts, and marks hashed files immutable
+for a year. A page's assets change URL whenever their content changes,
+so repeat visits take everything from the browser cache.
+
+Brotli copies need the optional Brotli package; without it only gzip
+copies are written.
+"""
+
+import gzip
+import json
+import logging
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date
+
+try:
+    import brotli
+except ImportError:  # optional; gzip alone still covers every browser
+    brotli = None
+
+logger = logging.getLogger('gowheels.static')
+
+# Only text formats shrink; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.html', '.xml', '.ico', '.ttf', '.eot', '.otf')
+MIN_COMPRESS_BYTES = 256
+
+# A compressed copy is kept only if it is at most this fraction of the original
+MAX_COMPRESSED_RATIO = 0.95
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Unhashed names (direct links, files missing from the manifest) can change in place
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+
+
+def compress_file(path):
+    """
+    Write path.gz (and path.br when Brotli is installed) if they are worth keeping
+
+    Returns:
+        list: paths written
+    """
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return []
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return []
+
+    compressors = {'.gz': lambda raw: gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors['.br'] = lambda raw: brotli.compress(raw, quality=11)
+    written = []
+    for suffix, compress in compressors.items():
+        target = path + suffix
+        compressed = compress(data)
+        if len(compressed) > len(data) * MAX_COMPRESSED_RATIO:
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target, 'wb') as handle:
+            handle.write(compressed)
+        written.append(target)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also writes .gz/.br copies of collected files"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run=dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        written = 0
+        for name in sorted(names):
+            written += len(compress_file(self.path(name)))
+        logger.info('Wrote %d precompressed static files for %d assets', written, len(names))
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not collected yet (development checkouts, tests): link the unhashed file
+            return name
+
+
+class StaticAsset:
+    """One file under STATIC_ROOT and its precompressed copies"""
+
+    def __init__(self, path, immutable, encodings):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.last_modified = http_date(stat.st_mtime)
+        self.etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        self.immutable = immutable
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'application/json'):
+            self.content_type += '; charset=utf-8'
+        # [(encoding, path, size)] in order of preference
+        self.encodings = encodings
+
+    def pick(self, accept_encoding):
+        """(encoding or None, path, size, etag) of the best representation the client accepts"""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding, path, size in self.encodings:
+            if encoding in accepted:
+                return encoding, path, size, f'{self.etag[:-1]}-{encoding}"'
+        return None, self.path, self.size, self.etag
+
+
+def parse_accept_encoding(header):
+    """Set of content codings an Accept-Encoding header allows (q=0 excludes)"""
+    accepted = set()
+    for item in (header or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+def read_manifest(root):
+    """Hashed names listed in root/staticfiles.json; empty if collectstatic hasn't run"""
+    try:
+        with open(os.path.join(root, ManifestStaticFilesStorage.manifest_name), encoding='utf-8') as handle:
+            return set(json.load(handle).get('paths', {}).values())
+    except (OSError, ValueError):
+        return set()
+
+
+def index_static_root(root):
+    """{url path relative to STATIC_URL: StaticAsset} for every file under root"""
+    hashed = read_manifest(root)
+    suffixes = tuple(suffix for _, suffix in ENCODINGS)
+    files = {}
+    for directory, _, filenames in os.walk(root):
+        present = set(filenames)
+        for filename in filenames:
+            if filename.endswith(suffixes) and filename.rsplit('.', 1)[0] in present:
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            encodings = [
+                (encoding, path + suffix, os.path.getsize(path + suffix))
+                for encoding, suffix in ENCODINGS
+                if filename + suffix in present
+            ]
+            files[name] = StaticAsset(path, name in hashed, encodings)
+    return files
+
+
+class StaticFilesMiddleware:
+    """
+    Serve collected static files with far-future caching and precompressed bodies
+
+    Place it right after SecurityMiddleware so static requests skip
+    sessions, CSRF and rate limiting. Unknown paths fall through to the
+    rest of the stack. The index is built once per process, so files
+    collected after startup are only served after a restart.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL or ''
+        root = settings.STATIC_ROOT
+        # A STATIC_URL on another host (CDN) is not ours to serve
+        if not self.prefix.startswith('/') or not root or not os.path.isdir(root):
+            self.files = {}
+        else:
+            self.files = index_static_root(root)
+            logger.info('Serving %d static files from %s', len(self.files), root)
+
+    def __call__(self, request):
+        if self.files and request.path_info.startswith(self.prefix) and request.method in ('GET', 'HEAD'):
+            asset = self.files.get(request.path_info[len(self.prefix):])
+            if asset is not None:
+                return self.serve(request, asset)
+        return self.get_response(request)
+
+    def serve(self, request, asset):
+        encoding, path, size, etag = asset.pick(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+            response = HttpResponseNotModified()
+        elif request.method == 'HEAD':
+            response = HttpResponse(content_type=asset.content_type)
+            response['Content-Length'] = str(size)
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=asset.content_type)
+            response['Content-Length'] = str(size)
+            # FileResponse names the .br/.gz file; the asset is not a download
+            response.headers.pop('Content-Disposition', None)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if asset.encodings:
+            response['Vary'] = 'Accept-Encoding'
+        response['ETag'] = etag
+        response['Last-Modified'] = asset.last_modified
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if asset.immutable else DEFAULT_CACHE_CONTROL
+        response['X-Content-Type-Options'] = 'nosniff'
+        return response
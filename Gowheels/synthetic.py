@@ -0,0 +1,343 @@
+"""
+Synthetic dataset generator for GoWheels
+Fills the database with production-sized, reproducible data for
+performance work: the admin catalog hierarchy, metro pincodes with
+coordinates, vehicles with images, clicks, wishlists, chats/messages and
+OTPs. Everything is drawn from one seeded random.Random, so the same
+seed on an empty database produces the same rows.
+
+Rows are written with bulk_create in batches, which skips model signals,
+so the derived tables (search tokens, VehicleListing read model) are
+rebuilt at the end and the cache namespaces bumped.
+"""
+
+import hashlib
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .cache import MEDIA, PINCODES, VEHICLES
+from .catalog import bump_catalog_version
+from .models import (
+    AdminBrand, AdminCategory, AdminGroup, AdminModel, Chat, Message, OTP, Pincode,
+    Vehicle, VehicleClick, VehicleImage, Wishlist,
+)
+
+# group -> category -> brand -> models
+CATALOG_TREE = {
+    'Personal': {
+        'Car': {
+            'Maruti Suzuki': ['Swift', 'Baleno', 'Dzire', 'Ertiga', 'Wagon R'],
+            'Hyundai': ['i20', 'Creta', 'Venue', 'Verna'],
+            'Tata': ['Nexon', 'Punch', 'Tiago', 'Harrier'],
+            'Mahindra': ['Scorpio', 'XUV700', 'Thar', 'Bolero'],
+            'Toyota': ['Innova Crysta', 'Fortuner', 'Glanza'],
+            'Honda': ['City', 'Amaze'],
+        },
+        'Bike': {
+            'Hero': ['Splendor Plus', 'HF Deluxe', 'Passion Pro'],
+            'Honda': ['Shine', 'Unicorn'],
+            'Bajaj': ['Pulsar 150', 'Platina'],
+            'Royal Enfield': ['Classic 350', 'Bullet 350', 'Himalayan'],
+            'TVS': ['Apache RTR 160', 'Raider'],
+        },
+        'Scooter': {
+            'Honda': ['Activa 6G', 'Dio'],
+            'TVS': ['Jupiter', 'Ntorq'],
+            'Suzuki': ['Access 125'],
+            'Ola': ['S1 Pro'],
+            'Ather': ['450X'],
+        },
+    },
+    'Commercial': {
+        'Truck': {
+            'Tata': ['Ace', '407', 'Signa'],
+            'Ashok Leyland': ['Dost', 'Ecomet'],
+            'Eicher': ['Pro 2049'],
+        },
+        'Tractor': {
+            'Mahindra': ['575 DI', 'Arjun 605'],
+            'Swaraj': ['744 FE'],
+            'Sonalika': ['DI 745'],
+        },
+    },
+}
+
+# category -> (share of listings, (low, high) price per day)
+CATEGORY_MIX = {
+    'Car': (0.35, (1200, 6000)),
+    'Bike': (0.30, (300, 1500)),
+    'Scooter': (0.20, (250, 900)),
+    'Truck': (0.10, (2500, 12000)),
+    'Tractor': (0.05, (1500, 5000)),
+}
+
+# city, state, latitude, longitude, pincode prefix, share of listings
+METROS = (
+    ('Mumbai', 'Maharashtra', 19.0760, 72.8777, '400', 0.16),
+    ('Delhi', 'Delhi', 28.6139, 77.2090, '110', 0.16),
+    ('Chennai', 'Tamil Nadu', 13.0827, 80.2707, '600', 0.14),
+    ('Bengaluru', 'Karnataka', 12.9716, 77.5946, '560', 0.14),
+    ('Hyderabad', 'Telangana', 17.3850, 78.4867, '500', 0.10),
+    ('Kolkata', 'West Bengal', 22.5726, 88.3639, '700', 0.10),
+    ('Pune', 'Maharashtra', 18.5204, 73.8567, '411', 0.07),
+    ('Ahmedabad', 'Gujarat', 23.0225, 72.5714, '380', 0.06),
+    ('Jaipur', 'Rajasthan', 26.9124, 75.7873, '302', 0.04),
+    ('Coimbatore', 'Tamil Nadu', 11.0168, 76.9558, '641', 0.03),
+)
+
+PINCODES_PER_CITY = 120
+
+OWNER_NAMES = (
+    'Aarav', 'Priya', 'Ravi', 'Lakshmi', 'Arjun', 'Meera', 'Karthik', 'Divya', 'Rahul', 'Sneha',
+    'Vikram', 'Anjali', 'Suresh', 'Kavya', 'Manoj', 'Pooja', 'Imran', 'Fatima', 'Joseph', 'Anita',
+)
+
+MESSAGES = (
+    'Is this still available?', 'What is the final price?', 'Can I see it tomorrow?',
+    'Yes, available.', 'Price is negotiable.', 'Please share more photos.', 'Where can we meet?',
+    'Is the insurance valid?', 'Okay, I will call you.', 'Thanks!',
+)
+
+
+def _next_id(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+class DatasetGenerator:
+    """
+    Generate a synthetic dataset
+
+    Usage:
+        DatasetGenerator(vehicles=1_000_000, seed=42).run(log=print)
+    """
+
+    def __init__(self, vehicles=1_000_000, seed=42, batch_size=5000):
+        self.vehicles = vehicles
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.now = timezone.now()
+        self.counts = {}
+        self.sellers = max(1, vehicles // 4)
+        self.buyers = max(10, vehicles // 2)
+
+    def _count(self, name, rows):
+        self.counts[name] = self.counts.get(name, 0) + len(rows)
+
+    def _phone(self, prefix, index):
+        return f'{prefix}{index:09d}'
+
+    def _past(self, days):
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    # Reference data
+
+    def create_catalog(self):
+        """Admin catalog rows, reusing any group/category/brand/model already present by name"""
+        self.catalog = []  # (category, brand, model, weight)
+        for group_name, categories in CATALOG_TREE.items():
+            group, _ = AdminGroup.objects.get_or_create(name=group_name)
+            for category_name, brands in categories.items():
+                category, _ = AdminCategory.objects.get_or_create(
+                    group=group, name=category_name, defaults={'image': f'categories/{category_name.lower()}.jpg'},
+                )
+                share = CATEGORY_MIX[category_name][0]
+                for rank, (brand_name, models) in enumerate(brands.items()):
+                    brand, _ = AdminBrand.objects.get_or_create(
+                        category=category, name=brand_name, defaults={'image': f'brands/{brand_name.lower()}.jpg'},
+                    )
+                    for model_name in models:
+                        AdminModel.objects.get_or_create(
+                            brand=brand, name=model_name, defaults={'image': f'models/{model_name.lower()}.jpg'},
+                        )
+                        # Leading brands sell more; spread the category's share accordingly
+                        self.catalog.append((category_name, brand_name, model_name, share / (rank + 1) / len(models)))
+        self._catalog_weights = self._cumulative(row[3] for row in self.catalog)
+        self.counts['catalog_models'] = len(self.catalog)
+
+    def create_pincodes(self):
+        """PINCODES_PER_CITY pincodes around each metro; real rows already in the table win"""
+        rows = []
+        for city, state, lat, lng, prefix, _ in METROS:
+            for n in range(1, PINCODES_PER_CITY + 1):
+                rows.append(Pincode(
+                    code=f'{prefix}{n:03d}', city=city, state=state,
+                    latitude=round(lat + self.rng.uniform(-0.2, 0.2), 4),
+                    longitude=round(lng + self.rng.uniform(-0.2, 0.2), 4),
+                ))
+        Pincode.objects.bulk_create(rows, ignore_conflicts=True, batch_size=self.batch_size)
+        stored = dict(
+            (code, (lat, lng)) for code, lat, lng
+            in Pincode.objects.filter(code__in=[row.code for row in rows]).values_list('code', 'latitude', 'longitude')
+        )
+
+        # Listings follow city size, then a Zipf-like skew inside each city
+        self.pincodes, weights = [], []
+        for city, state, _, _, prefix, share in METROS:
+            codes = [f'{prefix}{n:03d}' for n in range(1, PINCODES_PER_CITY + 1)]
+            self.rng.shuffle(codes)
+            skew = [1 / (rank + 1) ** 0.9 for rank in range(len(codes))]
+            total = sum(skew)
+            for code, weight in zip(codes, skew):
+                self.pincodes.append((code, state, *stored[code]))
+                weights.append(share * weight / total)
+        self._pincode_weights = self._cumulative(weights)
+        self.counts['pincodes'] = len(rows)
+
+    @staticmethod
+    def _cumulative(weights):
+        running, total = [], 0.0
+        for weight in weights:
+            total += weight
+            running.append(total)
+        return running
+
+    # Vehicles and their activity
+
+    def _vehicle(self, vehicle_id):
+        rng = self.rng
+        category, brand, model, _ = rng.choices(self.catalog, cum_weights=self._catalog_weights)[0]
+        code, state, lat, lng = rng.choices(self.pincodes, cum_weights=self._pincode_weights)[0]
+        low, high = CATEGORY_MIX[category][1]
+        per_day = round(rng.uniform(low, high), -1)
+        pricing_type = 'per-hour' if rng.random() < 0.25 else 'per-day'
+        price = round(per_day / 8, 2) if pricing_type == 'per-hour' else per_day
+        added_by = rng.choices(('seller', 'state_admin', 'super_admin'), cum_weights=(0.8, 0.95, 1.0))[0]
+        vehicle = Vehicle(
+            id=vehicle_id,
+            category_name=category, brand_name=brand, model_name=model,
+            year=min(2025, int(rng.triangular(2005, 2025, 2021))),
+            state=state, price=price, per_day_price=per_day, per_hour_price=round(per_day / 8, 2),
+            pricing_type=pricing_type,
+            seller_phone=self._phone('9', rng.randrange(self.sellers)) if added_by == 'seller' else '',
+            owner_name=rng.choice(OWNER_NAMES),
+            pincode=code, latitude=lat, longitude=lng,
+            available=rng.random() < 0.9,
+            approval_status=rng.choices(('approved', 'pending', 'rejected'), cum_weights=(0.85, 0.95, 1.0))[0],
+            listing_type='rent' if rng.random() < 0.7 else 'sell',
+            promoted=rng.random() < 0.03,
+            sponsored=rng.random() < 0.01,
+            added_by=added_by,
+        )
+        vehicle.normalize_keys()
+        return vehicle
+
+    def _activity(self, vehicle, next_chat_id):
+        """Images, clicks, wishlists, chats and messages for one vehicle"""
+        rng = self.rng
+        images = [
+            VehicleImage(vehicle_id=vehicle.id, image=f'vehicles/seller/synthetic/{vehicle.id}-{n}.jpg')
+            for n in range(rng.randint(1, 4))
+        ]
+        if vehicle.approval_status != 'approved':
+            return images, [], [], [], []
+
+        # Heavy-tailed popularity: most listings get a few views, some get many
+        popularity = min(60, int(rng.paretovariate(1.3)) - 1)
+        clicks = [
+            VehicleClick(vehicle_id=vehicle.id, buyer_phone=self._phone('8', rng.randrange(self.buyers)), buyer_name=rng.choice(OWNER_NAMES))
+            for _ in range(popularity)
+        ]
+        fans = rng.sample(range(self.buyers), min(self.buyers, popularity // 3))
+        wishlists = [
+            Wishlist(user_phone=self._phone('8', buyer), vehicle_id=vehicle.id, created_at=self._past(180))
+            for buyer in fans
+        ]
+        chats, messages = [], []
+        for buyer in fans[:popularity // 5]:
+            buyer_phone = self._phone('8', buyer)
+            seller_phone = vehicle.seller_phone or self._phone('9', 0)
+            started = self._past(180)
+            chat = Chat(
+                id=next_chat_id + len(chats), vehicle_id=vehicle.id, buyer_phone=buyer_phone,
+                seller_phone=seller_phone, created_at=started,
+            )
+            for n in range(rng.randint(1, 10)):
+                messages.append(Message(
+                    chat_id=chat.id, sender_phone=buyer_phone if n % 2 == 0 else seller_phone,
+                    message=rng.choice(MESSAGES), is_read=rng.random() < 0.8,
+                    created_at=started + timedelta(minutes=5 * n),
+                ))
+            chat.last_message = messages[-1].message
+            chats.append(chat)
+        return images, clicks, wishlists, chats, messages
+
+    def create_vehicles(self, log=None):
+        vehicle_id = _next_id(Vehicle)
+        chat_id = _next_id(Chat)
+        started = time.monotonic()
+        for offset in range(0, self.vehicles, self.batch_size):
+            size = min(self.batch_size, self.vehicles - offset)
+            vehicles = [self._vehicle(vehicle_id + n) for n in range(size)]
+            vehicle_id += size
+            related = {'images': [], 'clicks': [], 'wishlists': [], 'chats': [], 'messages': []}
+            for vehicle in vehicles:
+                for name, rows in zip(related, self._activity(vehicle, chat_id)):
+                    related[name].extend(rows)
+                if related['chats']:
+                    chat_id = related['chats'][-1].id + 1
+
+            with transaction.atomic():
+                Vehicle.objects.bulk_create(vehicles, batch_size=self.batch_size)
+                VehicleImage.objects.bulk_create(related['images'], batch_size=self.batch_size)
+                VehicleClick.objects.bulk_create(related['clicks'], batch_size=self.batch_size)
+                Wishlist.objects.bulk_create(related['wishlists'], batch_size=self.batch_size)
+                Chat.objects.bulk_create(related['chats'], batch_size=self.batch_size)
+                Message.objects.bulk_create(related['messages'], batch_size=self.batch_size)
+            self._count('vehicles', vehicles)
+            for name, rows in related.items():
+                self._count(name, rows)
+            if log:
+                done = offset + size
+                log(f'{done}/{self.vehicles} vehicles ({done / (time.monotonic() - started):,.0f}/s)')
+
+    def create_otps(self):
+        total = max(1, self.vehicles // 50)
+        for offset in range(0, total, self.batch_size):
+            rows = [
+                OTP(
+                    phone=self._phone('8', self.rng.randrange(self.buyers)),
+                    otp_hash=hashlib.sha256(str(self.rng.getrandbits(64)).encode()).hexdigest(),
+                    expires_at=self.now + timedelta(minutes=self.rng.randint(-60 * 24, 5)),
+                    attempts=self.rng.randint(0, 3),
+                    is_used=self.rng.random() < 0.6,
+                )
+                for _ in range(min(self.batch_size, total - offset))
+            ]
+            OTP.objects.bulk_create(rows, batch_size=self.batch_size)
+            self._count('otps', rows)
+
+    def finish(self, rebuild=True, log=None):
+        """Reset sequences, rebuild derived tables and invalidate caches"""
+        # Explicit ids leave PostgreSQL sequences behind
+        statements = connection.ops.sequence_reset_sql(no_style(), [Vehicle, Chat])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+        if rebuild:
+            from .read_model import rebuild_listings
+            from .search import rebuild_index
+            if log:
+                log('Rebuilding search index')
+            rebuild_index(batch_size=self.batch_size)
+            if log:
+                log('Rebuilding listing read model')
+            rebuild_listings(batch_size=self.batch_size)
+        bump_catalog_version()
+        for namespace in (VEHICLES, MEDIA, PINCODES):
+            namespace.bump()
+
+    def run(self, rebuild=True, log=None):
+        self.create_catalog()
+        self.create_pincodes()
+        self.create_vehicles(log=log)
+        self.create_otps()
+        self.finish(rebuild=rebuild, log=log)
+        return self.counts
@@ -0,0 +1,113 @@
+"""
+Resumable chunked video upload endpoints
+Thin HTTP layer over chunked_upload.py; see its docstring for the protocol.
+"""
+
+from django.http import JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_http_methods
+from .chunked_upload import (
+    UploadError, append_chunk, chunk_bytes, discard_upload, finish_upload, received_bytes, start_upload,
+)
+from .models import Vehicle, VideoUpload
+import json
+
+
+def _error(exc):
+    body = {'success': False, 'error': str(exc)}
+    if exc.offset is not None:
+        body['offset'] = exc.offset
+    return JsonResponse(body, status=exc.status)
+
+
+def _progress(upload, offset):
+    response = JsonResponse({
+        'success': True,
+        'upload_id': str(upload.pk),
+        'offset': offset,
+        'size': upload.size,
+        'complete': offset == upload.size,
+    })
+    response['Upload-Offset'] = str(offset)
+    patch_cache_control(response, private=True, no_store=True)
+    return response
+
+
+def _own_upload(request, upload_id):
+    """(upload, None) for the logged-in seller's upload, else (None, error response)"""
+    phone = request.session.get('phone')
+    if not phone:
+        return None, JsonResponse({'success': False, 'error': 'Not logged in'}, status=401)
+    upload = VideoUpload.objects.filter(pk=upload_id, uploader_phone=phone).first()
+    if upload is None:
+        return None, JsonResponse({'success': False, 'error': 'Upload not found'}, status=404)
+    return upload, None
+
+
+@require_http_methods(['POST'])
+def start_video_upload(request):
+    """Open an upload for one of the seller's vehicles; body: {vehicle_id, filename, size}"""
+    phone = request.session.get('phone')
+    if not phone:
+        return JsonResponse({'success': False, 'error': 'Not logged in'}, status=401)
+    try:
+        data = json.loads(request.body or b'{}')
+        vehicle = Vehicle.objects.filter(id=int(data.get('vehicle_id')), seller_phone=phone).first()
+    except (TypeError, ValueError):
+        return JsonResponse({'success': False, 'error': 'vehicle_id is required'}, status=400)
+    if vehicle is None:
+        return JsonResponse({'success': False, 'error': 'Vehicle not found or not authorized'}, status=404)
+    try:
+        upload = start_upload(vehicle, phone, data.get('filename'), data.get('size'))
+    except UploadError as exc:
+        return _error(exc)
+    response = _progress(upload, 0)
+    response.status_code = 201
+    response['Location'] = f'/api/uploads/videos/{upload.pk}/'
+    # Chunk size the client should use; the server accepts up to MAX_UPLOAD_CHUNK_BYTES
+    response['Upload-Chunk-Size'] = str(chunk_bytes())
+    return response
+
+
+@require_http_methods(['GET', 'PUT', 'DELETE'])
+def video_upload(request, upload_id):
+    """
+    GET: current offset, for resuming
+    PUT: append the raw request body at Upload-Offset (header) or ?offset=
+    DELETE: abort and discard the bytes
+    """
+    upload, error = _own_upload(request, upload_id)
+    if error:
+        return error
+
+    if request.method == 'GET':
+        return _progress(upload, received_bytes(upload))
+
+    if request.method == 'DELETE':
+        discard_upload(upload.pk)
+        return JsonResponse({'success': True})
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', request.GET.get('offset', '')))
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Upload-Offset header or offset parameter is required'}, status=400)
+    try:
+        # request is read as a stream, never loaded into memory as request.body
+        offset = append_chunk(upload, offset, request, length)
+    except UploadError as exc:
+        return _error(exc)
+    return _progress(upload, offset)
+
+
+@require_http_methods(['POST'])
+def finalize_video_upload(request, upload_id):
+    """Attach the completed upload to its vehicle as a VehicleVideo"""
+    upload, error = _own_upload(request, upload_id)
+    if error:
+        return error
+    try:
+        video = finish_upload(upload)
+    except UploadError as exc:
+        return _error(exc)
+    return JsonResponse({'success': True, 'video_id': video.id, 'video': video.video.url}, status=201)
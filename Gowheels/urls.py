@@ -1,7 +1,7 @@
 from django.urls import path
 from django.shortcuts import render
 from django.views.generic import TemplateView
-from . import views, api_views, auth_views, oauth_views, chat_views, referral_views, wishlist_views
+from . import views, api_views, auth_views, oauth_views, chat_views, referral_views, wishlist_views, upload_views
 
 urlpatterns = [
     # Auth API Endpoints (JWT, RBAC, MFA)
@@ -51,6 +51,11 @@ urlpatterns = [
     path('edit-vehicle/<int:vehicle_id>/', views.edit_vehicle, name='edit_vehicle'),
     path('toggle-vehicle-status/<int:vehicle_id>/', views.toggle_vehicle_status, name='toggle_vehicle_status'),
     path('get-vehicles/', views.get_vehicles, name='get_vehicles'),
+    path('get-vehicle-facets/', views.get_vehicle_facets, name='get_vehicle_facets'),
+    path('search-vehicles/', views.search_vehicles, name='search_vehicles'),
+    path('api/autocomplete/', views.catalog_autocomplete, name='catalog_autocomplete'),
+    path('get-vehicles-map/', views.get_vehicles_map, name='get_vehicles_map'),
+    path('api/map/tiles/<int:zoom>/<int:x>/<int:y>/', views.get_map_tile, name='get_map_tile'),
     path('track-vehicle-click/', views.track_vehicle_click, name='track_vehicle_click'),
     path('seller-vehicles/', views.seller_vehicles, name='seller_vehicles'),
     path('seller-promote/<int:vehicle_id>/', views.seller_promote_vehicle, name='seller_promote_vehicle'),
@@ -80,6 +85,8 @@ urlpatterns = [
     
     # Admin Ads Management URLs
     path('admin/ads/', views.admin_ads_list, name='admin_ads_list'),
+    path('api/admin/export/users.<str:fmt>', views.export_users, name='export_users'),
+    path('api/admin/export/vehicles.<str:fmt>', views.export_vehicles, name='export_vehicles'),
     path('admin/ads/promote/<int:vehicle_id>/', views.toggle_promote, name='toggle_promote'),
     path('admin/ads/sponsor/<int:vehicle_id>/', views.toggle_sponsor, name='toggle_sponsor'),
     
@@ -106,6 +113,7 @@ urlpatterns = [
     path('chat/<int:chat_id>/', chat_views.chat_detail, name='chat_detail'),
     path('send-message/', chat_views.send_message, name='send_message'),
     path('get-messages/<int:chat_id>/', chat_views.get_messages, name='get_messages'),
+    path('wait-messages/<int:chat_id>/', chat_views.wait_messages, name='wait_messages'),
     
     # Referral URLs
     path('referral/', referral_views.referral_page, name='referral_page'),
@@ -118,6 +126,11 @@ urlpatterns = [
     path('api/get-wishlist/', wishlist_views.get_wishlist, name='get_wishlist'),
     path('api/check-wishlist/', wishlist_views.check_wishlist, name='check_wishlist'),
     
+    # Resumable video uploads
+    path('api/uploads/videos/', upload_views.start_video_upload, name='start_video_upload'),
+    path('api/uploads/videos/<uuid:upload_id>/', upload_views.video_upload, name='video_upload'),
+    path('api/uploads/videos/<uuid:upload_id>/finalize/', upload_views.finalize_video_upload, name='finalize_video_upload'),
+    
     # Resale Prediction URL
     path('resale-prediction/', TemplateView.as_view(template_name='resale_prediction_full.html'), name='resale_prediction'),
 ]
\ No newline at end of file
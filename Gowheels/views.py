@@ -3,10 +3,25 @@ from django.http import JsonResponse, HttpResponse
 from .models import Vehicle, UserProfile, BrandImage, ModelImage, VehicleImage, VehicleVideo, OTP
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Q, Count
+from django.views.decorators.cache import cache_control
+from django.db.models import Q, Count, F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from datetime import timedelta
 from .otp_service import OTPService
+from .serializers import VehicleListingSerializer
+from .pagination import CursorPaginator, InvalidCursor, MAX_PAGE_SIZE
+from .search import ranked_matches, vehicles_in_order, MIN_QUERY_LENGTH, RANK_ORDERING
+from .facets import BrowseFilters, facet_counts
+from .read_model import listing_cards
+from .map_clusters import bbox_clusters, tile_clusters
+from .exports import (
+    stream_export, stream_json_list, user_queryset, user_records, vehicle_queryset, vehicle_records,
+    USER_FIELDS, VEHICLE_FIELDS,
+)
+from .autocomplete import suggest, KINDS as AUTOCOMPLETE_KINDS, MAX_SUGGESTIONS
+from .catalog import get_catalog_json
+from .cache import cache_response, VEHICLES, MEDIA
 import json
 import random
 
@@ -474,18 +489,16 @@ def get_all_vehicles(request):
             return JsonResponse({'error': 'Unauthorized'}, status=401)
             
         vehicles = Vehicle.objects.filter(added_by='super_admin').order_by('-id')
-        vehicles_data = []
-        for vehicle in vehicles:
-            vehicles_data.append({
-                'id': vehicle.id,
-                'category_name': vehicle.category_name,
-                'brand_name': vehicle.brand_name,
-                'model_name': vehicle.model_name,
-                'year': vehicle.year,
-                'price': str(vehicle.price),
-                'pricing_type': vehicle.pricing_type.replace('per-', '')
-            })
-        return JsonResponse({'vehicles': vehicles_data})
+        fields = ('id', 'category_name', 'brand_name', 'model_name', 'year', 'price', 'pricing_type')
+        
+        def records():
+            for chunk in vehicle_records(vehicles, fields):
+                for record in chunk:
+                    record['pricing_type'] = record['pricing_type'].replace('per-', '')
+                yield chunk
+        
+        # Streamed so the list never sits in worker memory as a whole
+        return stream_json_list(records(), 'vehicles')
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -630,139 +643,76 @@ def seller_form(request):
         'truck_model_images': json.dumps([f'/media/{img}' for img in truck_model_images])
     })
 
+BROWSE_PARAMS = ('cat', 'br', 'mod', 'pincode', 'listing_type', 'distance', 'year_band', 'price_band', 'sort')
+
+@cache_response(VEHICLES, timeout=60, vary_on=BROWSE_PARAMS + ('limit', 'cursor', 'include_total'))
 def get_vehicles(request):
     vehicles_data = []
     try:
-        category_name = str(request.GET.get('cat', ''))
-        brand_name = str(request.GET.get('br', '')) 
-        model_name = str(request.GET.get('mod', ''))
-        pincode = str(request.GET.get('pincode', ''))
-        listing_type = str(request.GET.get('listing_type', 'rent'))
-        distance_km = int(request.GET.get('distance', 25))
-        
-        vehicles = Vehicle.objects.filter(available=True, approval_status='approved', listing_type=listing_type)
-        
-        if category_name:
-            vehicles = vehicles.filter(category_name__iexact=category_name)
-        if brand_name:
-            vehicles = vehicles.filter(brand_name__iexact=brand_name)
-        if model_name:
-            vehicles = vehicles.filter(model_name__iexact=model_name)
-        if pincode:
-            # Chennai pincode-based mapping (600001-600120)
-            try:
-                base_pincode = int(pincode)
-                # For Chennai pincodes (600xxx), show vehicles within +/- 10 pincode range
-                if 600001 <= base_pincode <= 600120:
-                    min_pincode = max(600001, base_pincode - 10)
-                    max_pincode = min(600120, base_pincode + 10)
-                else:
-                    # For other areas, use distance-based range
-                    range_size = distance_km
-                    min_pincode = base_pincode - range_size
-                    max_pincode = base_pincode + range_size
-                
-                vehicles = vehicles.filter(
-                    pincode__gte=str(min_pincode),
-                    pincode__lte=str(max_pincode)
-                )
-            except (ValueError, TypeError):
-                vehicles = vehicles.filter(pincode__exact=pincode)
-        
-        for vehicle in vehicles:
-            try:
-                vehicle_images = []
-                for img in vehicle.images.all():
-                    vehicle_images.append('/media/' + str(img.image))
-                
-                # Calculate approximate distance for mapping
-                distance = 0
-                if pincode:
-                    try:
-                        base_pin = int(pincode)
-                        vehicle_pin = int(vehicle.pincode)
-                        distance = abs(vehicle_pin - base_pin)  # Approximate distance
-                    except:
-                        distance = 0
-                
-                vehicles_data.append({
-                    'id': int(vehicle.id),
-                    'category_name': str(vehicle.category_name),
-                    'brand_name': str(vehicle.brand_name),
-                    'model_name': str(vehicle.model_name),
-                    'year': int(vehicle.year),
-                    'price': str(vehicle.price),
-                    'per_day_price': str(vehicle.per_day_price or 0),
-                    'per_hour_price': str(vehicle.per_hour_price or 0),
-                    'pricing_type': str(vehicle.pricing_type),
-                    'listing_type': str(vehicle.listing_type),
-                    'unit_type': str(vehicle.unit_type or 'unit_price'),
-                    'seller_phone': str(vehicle.get_seller_phone() or ''),
-                    'pincode': str(vehicle.pincode or ''),
-                    'village': str(vehicle.village or ''),
-                    'owner_name': str(vehicle.get_owner_name() or ''),
-                    'distance_km': distance,
-                    'location': f"{vehicle.village or ''}, {vehicle.pincode}".strip(', '),
-                    'manual_maintenance_cost': str(vehicle.manual_maintenance_cost or ''),
-                    'manual_fuel_cost': str(vehicle.manual_fuel_cost or ''),
-                    'manual_insurance_cost': str(vehicle.manual_insurance_cost or ''),
-                    'images': vehicle_images
-                })
-            except:
-                continue
-                
-    except:
-        pass
+        filters = BrowseFilters(request.GET)
+        # VehicleListing is keyed by the vehicle id, so cursors match the old -id order
+        paginator = CursorPaginator(request, ordering=filters.ordering())
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    try:
+        # Pre-rendered cards from the VehicleListing read model
+        page = paginator.paginate(filters.listing_queryset())
+        page_meta = page.meta()
+        for listing, vehicle_data in zip(page.items, listing_cards(page.items)):
+            # Great-circle distance from the searched pincode; unknown pincodes have none
+            if filters.origin:
+                vehicle_data['distance_km'] = round(listing.distance_km, 2)
+            else:
+                vehicle_data['distance_km'] = None if filters.pincode else 0
+            vehicles_data.append(vehicle_data)
+    except Exception as e:
+        # A 5xx is never cached, so the next request tries again
+        return JsonResponse({'vehicles': [], 'error': str(e)}, status=500)
         
-    return JsonResponse({'vehicles': vehicles_data})
+    return JsonResponse({'vehicles': vehicles_data, **page_meta})
+
+@cache_response(VEHICLES, timeout=60, vary_on=BROWSE_PARAMS)
+def get_vehicle_facets(request):
+    """Per-facet vehicle counts for the browse filter chips"""
+    try:
+        return JsonResponse(facet_counts(BrowseFilters(request.GET)))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
 
 def vehicle_map(request):
     return render(request, 'vehicle_map.html')
 
+# Whole of India, for map requests that send no bounding box
+DEFAULT_MAP_BOUNDS = (6.5, 68.0, 37.5, 97.5)
+MAP_TILE_MAX_AGE = 300
+
 def get_vehicles_map(request):
-    vehicles_data = []
+    """Vehicle clusters for the visible map area (south, west, north, east, zoom)"""
     try:
-        lat = float(request.GET.get('lat', 20.5937))
-        lng = float(request.GET.get('lng', 78.9629))
-        radius_km = float(request.GET.get('radius', 50))
-        
-        vehicles = Vehicle.objects.filter(available=True, approval_status='approved')
-        
-        for vehicle in vehicles:
-            try:
-                # Convert pincode to approximate lat/lng
-                if vehicle.pincode:
-                    pin_int = int(vehicle.pincode)
-                    # Simple pincode to coordinate conversion
-                    vehicle_lat = 20.5937 + (pin_int % 1000) * 0.01
-                    vehicle_lng = 78.9629 + (pin_int // 1000) * 0.01
-                    
-                    # Check if within radius (simplified distance)
-                    distance = ((vehicle_lat - lat) ** 2 + (vehicle_lng - lng) ** 2) ** 0.5
-                    if distance <= radius_km * 0.01:  # Approximate conversion
-                        vehicle_images = []
-                        for img in vehicle.images.all():
-                            vehicle_images.append('/media/' + str(img.image))
-                        
-                        vehicles_data.append({
-                            'id': int(vehicle.id),
-                            'brand_name': str(vehicle.brand_name),
-                            'model_name': str(vehicle.model_name),
-                            'price': str(vehicle.price),
-                            'pricing_type': str(vehicle.pricing_type),
-                            'seller_phone': str(vehicle.seller_phone or ''),
-                            'location': f"{vehicle.village or ''}, {vehicle.pincode}".strip(', '),
-                            'lat': vehicle_lat,
-                            'lng': vehicle_lng,
-                            'images': vehicle_images
-                        })
-            except:
-                continue
-                
-    except:
-        pass
-        
-    return JsonResponse({'vehicles': vehicles_data})
+        bounds = [
+            float(request.GET.get(name, default))
+            for name, default in zip(('south', 'west', 'north', 'east'), DEFAULT_MAP_BOUNDS)
+        ]
+        zoom = int(request.GET.get('zoom', 5))
+        clusters = bbox_clusters(BrowseFilters(request.GET).listing_queryset(), *bounds, zoom)
+        return JsonResponse({'clusters': clusters, 'zoom': zoom})
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+@cache_control(public=True, max_age=MAP_TILE_MAX_AGE)
+@cache_response(VEHICLES, timeout=MAP_TILE_MAX_AGE, vary_on=BROWSE_PARAMS)
+def get_map_tile(request, zoom, x, y):
+    """Vehicle clusters for one XYZ map tile; cached per tile and filter set"""
+    try:
+        return JsonResponse(tile_clusters(BrowseFilters(request.GET).listing_queryset(), zoom, x, y))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
 
 def create_state_admin(request):
     return render(request, 'create_state_admin.html')
@@ -948,16 +898,14 @@ def state_admin_add_vehicle(request):
 def search_vehicles(request):
     try:
         query = request.GET.get('q', '')
-        if len(query) < 2:
-            return JsonResponse({'vehicles': []})
+        paginator = CursorPaginator(request, ordering=RANK_ORDERING)
+        matches = ranked_matches(query) if len(query.strip()) >= MIN_QUERY_LENGTH else None
+        if matches is None:
+            return JsonResponse({'vehicles': [], 'next_cursor': None, 'has_more': False, 'limit': paginator.limit})
         
-        vehicles = Vehicle.objects.filter(
-            Q(brand_name__icontains=query) |
-            Q(model_name__icontains=query) |
-            Q(category_name__icontains=query) |
-            Q(year__icontains=query) |
-            Q(state__icontains=query)
-        ).order_by('-id')
+        # Keyset on (score, vehicle_id), so later pages cost the same as the first
+        page = paginator.paginate(matches)
+        vehicles = vehicles_in_order([row['vehicle_id'] for row in page.items])
         
         vehicles_data = []
         for vehicle in vehicles:
@@ -973,7 +921,9 @@ def search_vehicles(request):
                 'available': vehicle.available
             })
         
-        return JsonResponse({'vehicles': vehicles_data})
+        return JsonResponse({'vehicles': vehicles_data, **page.meta()})
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -983,10 +933,11 @@ def get_pending_approvals(request):
         vehicles = Vehicle.objects.filter(
             approval_status='pending', 
             added_by='state_admin'
-        ).order_by('-id')
+        )
+        page = CursorPaginator(request).paginate(vehicles)
         
         vehicles_data = []
-        for vehicle in vehicles:
+        for vehicle in page.items:
             vehicles_data.append({
                 'id': vehicle.id,
                 'category_name': vehicle.category_name,
@@ -998,7 +949,9 @@ def get_pending_approvals(request):
                 'pricing_type': vehicle.pricing_type
             })
         
-        return JsonResponse({'vehicles': vehicles_data})
+        return JsonResponse({'vehicles': vehicles_data, **page.meta()})
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -1033,10 +986,11 @@ def reject_vehicle(request, vehicle_id):
 def get_state_admin_vehicles(request):
     try:
         # Only show vehicles added by state_admin
-        vehicles = Vehicle.objects.filter(added_by='state_admin').order_by('-id')
+        vehicles = Vehicle.objects.filter(added_by='state_admin')
+        page = CursorPaginator(request).paginate(vehicles)
         
         vehicles_data = []
-        for vehicle in vehicles:
+        for vehicle in page.items:
             vehicles_data.append({
                 'id': vehicle.id,
                 'category_name': vehicle.category_name,
@@ -1049,7 +1003,9 @@ def get_state_admin_vehicles(request):
                 'approval_status': vehicle.approval_status
             })
         
-        return JsonResponse({'vehicles': vehicles_data})
+        return JsonResponse({'vehicles': vehicles_data, **page.meta()})
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -1284,7 +1240,8 @@ def seller_dashboard_form(request):
                 
                 VehicleVideo.objects.create(vehicle=vehicle, video=video_file)
             
-            return JsonResponse({'success': True, 'message': 'Vehicle listed successfully'})
+            # vehicle_id lets clients send a large video afterwards through the chunked upload API
+            return JsonResponse({'success': True, 'message': 'Vehicle listed successfully', 'vehicle_id': vehicle.id})
         except Exception as e:
             return JsonResponse({'success': False, 'error': str(e)})
     
@@ -1373,14 +1330,25 @@ def get_seller_vehicles(request):
         total_count = vehicles.count()
         active_count = vehicles.filter(available=True).count()
         
+        listing = VehicleListingSerializer(VehicleListingSerializer.prepare(vehicles, videos=True))
+        
+        # Latest 5 clicks per vehicle for the whole page in one query
+        recent_clicks_by_vehicle = {}
+        if VEHICLE_CLICK_AVAILABLE and listing.vehicles:
+            recent_clicks = VehicleClick.objects.filter(
+                vehicle_id__in=[vehicle.id for vehicle in listing.vehicles]
+            ).annotate(
+                row_number=Window(RowNumber(), partition_by=[F('vehicle_id')], order_by=F('clicked_at').desc())
+            ).filter(row_number__lte=5).order_by('vehicle_id', '-clicked_at')
+            for click in recent_clicks:
+                recent_clicks_by_vehicle.setdefault(click.vehicle_id, []).append({
+                    'buyer_name': click.buyer_name,
+                    'buyer_phone': click.buyer_phone,
+                    'clicked_at': click.clicked_at.strftime('%Y-%m-%d %H:%M')
+                })
+        
         vehicles_data = []
-        for vehicle in vehicles:
-            # Get vehicle images (max 4)
-            vehicle_images = [f'/media/{img.image}' for img in vehicle.images.all()[:4]]
-            
-            # Get vehicle videos (max 1)
-            vehicle_videos = [f'/media/{video.video}' for video in vehicle.videos.all()[:1]]
-            
+        for vehicle in listing.vehicles:
             vehicle_data = {
                 'id': vehicle.id,
                 'category_name': vehicle.category_name,
@@ -1401,21 +1369,15 @@ def get_seller_vehicles(request):
                 'promoted': getattr(vehicle, 'promoted', False),
                 'click_count': 0,
                 'recent_clicks': [],
-                'images': vehicle_images,
-                'videos': vehicle_videos
+                'images': listing.images(vehicle, limit=4),
+                'image_srcsets': listing.image_srcsets(vehicle, limit=4),
+                'videos': listing.videos(vehicle, limit=1),
+                'video_posters': listing.video_posters(vehicle, limit=1)
             }
             
             if VEHICLE_CLICK_AVAILABLE:
-                # Get recent clicks for this vehicle
-                recent_clicks = VehicleClick.objects.filter(vehicle=vehicle).order_by('-clicked_at')[:5]
-                clicks_data = [{
-                    'buyer_name': click.buyer_name,
-                    'buyer_phone': click.buyer_phone,
-                    'clicked_at': click.clicked_at.strftime('%Y-%m-%d %H:%M')
-                } for click in recent_clicks]
-                
                 vehicle_data['click_count'] = getattr(vehicle, 'click_count', 0)
-                vehicle_data['recent_clicks'] = clicks_data
+                vehicle_data['recent_clicks'] = recent_clicks_by_vehicle.get(vehicle.id, [])
             
             vehicles_data.append(vehicle_data)
         
@@ -1447,6 +1409,7 @@ def toggle_vehicle_status(request, vehicle_id):
             return JsonResponse({'success': False, 'error': str(e)})
     return JsonResponse({'success': False, 'error': 'Invalid request method'})
 
+@cache_response(MEDIA, timeout=600, vary_on=())
 def get_brand_images(request):
     try:
         brands = {}
@@ -1482,6 +1445,7 @@ def get_brand_images(request):
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+@cache_response(MEDIA, timeout=600, vary_on=())
 def get_model_images(request):
     try:
         # Get model images by category with IDs (including Super Admin categories)
@@ -1925,56 +1889,29 @@ def get_admin_groups(request):
 @csrf_exempt
 def get_all_admin_data(request):
     try:
-        from .models import AdminGroup, AdminCategory, AdminBrand, AdminModel
-        
-        # Get all groups with their hierarchical data
-        all_groups = AdminGroup.objects.all()
-        
-        categories = {}
-        brands = {}
-        models = {}
-        
-        for group in all_groups:
-            categories[group.name] = []
-            # Get categories for this group
-            group_categories = AdminCategory.objects.filter(group=group)
-            for category in group_categories:
-                categories[group.name].append({
-                    'name': category.name,
-                    'image': f'/media/{category.image}' if category.image else ''
-                })
-                
-                # Get brands for this category
-                category_brands = AdminBrand.objects.filter(category=category)
-                brand_key = f"{group.name}_{category.name}"
-                brands[brand_key] = []
-                
-                for brand in category_brands:
-                    brands[brand_key].append({
-                        'name': brand.name,
-                        'image': f'/media/{brand.image}' if brand.image else ''
-                    })
-                    
-                    # Get models for this brand
-                    brand_models = AdminModel.objects.filter(brand=brand)
-                    model_key = f"{group.name}_{category.name}_{brand.name}"
-                    models[model_key] = []
-                    
-                    for model in brand_models:
-                        models[model_key].append({
-                            'name': model.name,
-                            'image': f'/media/{model.image}' if model.image else ''
-                        })
-        
-        return JsonResponse({
-            'success': True,
-            'categories': categories,
-            'brands': brands,
-            'models': models
-        })
+        # Built from four flat queries and cached until the catalog changes
+        return HttpResponse(get_catalog_json(), content_type='application/json')
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
+def catalog_autocomplete(request):
+    """Top-k category/brand/model suggestions for a typed prefix"""
+    try:
+        prefix = request.GET.get('q', '')
+        kind = request.GET.get('type') or None
+        if kind is not None and kind not in AUTOCOMPLETE_KINDS:
+            return JsonResponse({'error': f"type must be one of {', '.join(AUTOCOMPLETE_KINDS)}"}, status=400)
+        try:
+            k = int(request.GET.get('k', MAX_SUGGESTIONS))
+        except ValueError:
+            k = MAX_SUGGESTIONS
+        
+        if not prefix.strip():
+            return JsonResponse({'suggestions': []})
+        return JsonResponse({'suggestions': suggest(prefix, kind, k)})
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
 def user_browse_categories(request):
     return render(request, 'user_browse_categories.html')
 
@@ -1984,21 +1921,8 @@ def get_all_users_api(request):
         if not request.session.get('super_admin_logged_in'):
             return JsonResponse({'success': False, 'error': 'Unauthorized'})
         
-        users = UserProfile.objects.all().order_by('-id')
-        users_data = []
-        
-        for user_profile in users:
-            user = user_profile.user
-            users_data.append({
-                'id': user.id,
-                'name': f"{user.first_name}".strip() or 'Not provided',
-                'phone': user_profile.phone or 'Not provided',
-                'pincode': user_profile.pincode or 'Not provided',
-                'unique_id': user_profile.unique_id or 'Not provided',
-                'blocked': user_profile.blocked
-            })
-        
-        return JsonResponse({'success': True, 'users': users_data})
+        # Streamed so the list never sits in worker memory as a whole
+        return stream_json_list(user_records(user_queryset(request.GET)), 'users', {'success': True})
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 def seller_vehicles(request):
@@ -2196,7 +2120,34 @@ def admin_ads_list(request):
             Q(category_name__icontains=search)
         )
     
-    return render(request, 'admin/ads_list.html', {'vehicles': vehicles, 'search': search})
+    try:
+        page = CursorPaginator(request, default_limit=MAX_PAGE_SIZE).paginate(vehicles)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return render(request, 'admin/ads_list.html', {
+        'vehicles': page.items,
+        'search': search,
+        'next_cursor': page.next_cursor,
+    })
+
+def export_users(request, fmt):
+    """Stream the admin user list as NDJSON or CSV; same filters as the users screen"""
+    if not request.session.get('super_admin_logged_in'):
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    try:
+        return stream_export(user_records(user_queryset(request.GET)), USER_FIELDS, fmt, 'users')
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+def export_vehicles(request, fmt):
+    """Stream the admin vehicle list as NDJSON or CSV; same filters as the ads screen"""
+    if not request.session.get('super_admin_logged_in'):
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    try:
+        return stream_export(vehicle_records(vehicle_queryset(request.GET)), VEHICLE_FIELDS, fmt, 'vehicles')
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
 @csrf_exempt
 def toggle_promote(request, vehicle_id):
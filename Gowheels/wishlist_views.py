@@ -2,6 +2,7 @@ from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
 from .models import Wishlist, Vehicle
+from .serializers import VehicleListingSerializer
 import json
 
 def wishlist_page(request):
@@ -36,11 +37,11 @@ def get_wishlist(request):
     if not user_phone:
         return JsonResponse({'error': 'Not logged in'}, status=401)
     
-    wishlists = Wishlist.objects.filter(user_phone=user_phone).select_related('vehicle')
+    wishlisted = Vehicle.objects.filter(wishlists__user_phone=user_phone).order_by('-wishlists__created_at')
+    listing = VehicleListingSerializer(VehicleListingSerializer.prepare(wishlisted))
     vehicles = []
     
-    for w in wishlists:
-        v = w.vehicle
+    for v in listing.vehicles:
         vehicles.append({
             'id': v.id,
             'brand_name': v.brand_name,
@@ -50,9 +51,9 @@ def get_wishlist(request):
             'per_day_price': str(v.per_day_price),
             'pincode': v.pincode,
             'village': v.village,
-            'owner_name': v.get_owner_name(),
-            'seller_phone': v.get_seller_phone(),
-            'images': [img.image.url for img in v.images.all()],
+            'owner_name': listing.owner_name(v),
+            'seller_phone': listing.seller_phone(v),
+            'images': listing.images(v),
         })
     
     return JsonResponse({'success': True, 'vehicles': vehicles})
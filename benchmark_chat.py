@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+Chat Delivery Benchmark
+Compares the 3-second polling path (get_messages) with long-poll push
+(wait_messages) on request rate and message latency.
+
+Run with: python benchmark_chat.py [--messages 20] [--poll-interval 3]
+
+Uses the configured database and CHAT_BUS_BACKEND. Creates a throwaway
+vehicle/chat and deletes it afterwards.
+"""
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gowheels_project.settings')
+django.setup()
+
+from django.test import Client
+from django.test.utils import setup_test_environment
+from gowheels.models import Vehicle, Chat
+
+BUYER_PHONE = '9000000001'
+SELLER_PHONE = '9000000002'
+
+
+def logged_in_client(phone):
+    client = Client()
+    session = client.session
+    session['phone'] = phone
+    session.save()
+    return client
+
+
+def create_chat():
+    vehicle = Vehicle.objects.create(
+        category_name='Benchmark', brand_name='Bench', model_name='Mark',
+        year=2024, state='Test', price=1, pricing_type='per-day',
+        seller_phone=SELLER_PHONE, approval_status='approved',
+    )
+    chat = Chat.objects.create(vehicle=vehicle, buyer_phone=BUYER_PHONE, seller_phone=SELLER_PHONE)
+    return vehicle, chat
+
+
+def run_delivery(mode, chat_id, num_messages, poll_interval):
+    """Seller sends messages at random gaps; buyer receives via mode"""
+    sent_at = {}
+    received_at = {}
+    requests_made = [0]
+    done = threading.Event()
+    ready = threading.Event()
+
+    def receiver():
+        client = logged_in_client(BUYER_PHONE)
+        last_id = client.get(f'/get-messages/{chat_id}/').json().get('last_id', 0)
+        ready.set()
+        while not done.is_set():
+            if mode == 'poll':
+                response = client.get(f'/get-messages/{chat_id}/', {'since_id': last_id})
+            else:
+                response = client.get(f'/wait-messages/{chat_id}/', {'since_id': last_id, 'timeout': 5})
+            requests_made[0] += 1
+            now = time.perf_counter()
+            if response.status_code == 200:
+                for msg in response.json()['messages']:
+                    received_at.setdefault(msg['message'], now)
+                    last_id = max(last_id, msg['id'])
+            if len(received_at) >= num_messages:
+                done.set()
+            elif mode == 'poll':
+                done.wait(poll_interval)
+
+    thread = threading.Thread(target=receiver, daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    ready.wait()
+
+    sender = logged_in_client(SELLER_PHONE)
+    for i in range(num_messages):
+        time.sleep(random.uniform(0.2, 1.5))
+        text = f'{mode}-{i}'
+        sent_at[text] = time.perf_counter()
+        sender.post('/send-message/', {'chat_id': chat_id, 'message': text}, content_type='application/json')
+
+    done.wait(poll_interval + 10)
+    done.set()
+    thread.join(timeout=10)
+    duration = time.perf_counter() - start
+
+    latencies = [(received_at[text] - sent) * 1000 for text, sent in sent_at.items() if text in received_at]
+    return {
+        'requests': requests_made[0],
+        'req_per_sec': requests_made[0] / duration,
+        'delivered': len(latencies),
+        'latencies': latencies,
+    }
+
+
+def run_throughput(chat_id, num_requests=200):
+    """Back-to-back idle requests: conditional poll vs zero-timeout wait"""
+    client = logged_in_client(BUYER_PHONE)
+    first = client.get(f'/get-messages/{chat_id}/')
+    etag = first.get('ETag', '')
+    last_id = first.json().get('last_id', 0)
+
+    results = {}
+    for name, call in [
+        ('poll (304)', lambda: client.get(f'/get-messages/{chat_id}/', HTTP_IF_NONE_MATCH=etag)),
+        ('wait (timeout=0)', lambda: client.get(f'/wait-messages/{chat_id}/', {'since_id': last_id, 'timeout': 0})),
+    ]:
+        start = time.perf_counter()
+        for _ in range(num_requests):
+            call()
+        results[name] = num_requests / (time.perf_counter() - start)
+    return results
+
+
+def print_delivery(mode, result):
+    print(f"\n{mode}:")
+    print(f"  Requests: {result['requests']} ({result['req_per_sec']:.2f} req/s per client)")
+    print(f"  Delivered: {result['delivered']}")
+    latencies = sorted(result['latencies'])
+    if latencies:
+        print(f"  Latency avg: {statistics.mean(latencies):.1f}ms")
+        print(f"  Latency p50: {statistics.median(latencies):.1f}ms")
+        print(f"  Latency p95: {latencies[int(len(latencies) * 0.95) - 1]:.1f}ms")
+        print(f"  Latency max: {latencies[-1]:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=20)
+    parser.add_argument('--poll-interval', type=float, default=3.0)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    vehicle, chat = create_chat()
+
+    print("=" * 60)
+    print("Chat Delivery Benchmark")
+    print("=" * 60)
+
+    try:
+        for mode in ('poll', 'push'):
+            print_delivery(mode, run_delivery(mode, chat.id, args.messages, args.poll_interval))
+
+        print("\nIdle request throughput:")
+        for name, rps in run_throughput(chat.id).items():
+            print(f"  {name}: {rps:.1f} req/s")
+    finally:
+        vehicle.delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -24,11 +24,20 @@ done
 echo "📦 Applying migrations..."
 python manage.py migrate --noinput
 
-echo "🎨 Collecting static files..."
-python manage.py collectstatic --noinput
+echo "🗂️  Building listing read model (first deploy only)..."
+python manage.py rebuild_listings --if-empty
+
+# Images collect static files at build time; only collect here when the
+# manifest is missing (source mounted into the container) or forced
+if [ ! -f staticfiles/staticfiles.json ] || [ "${COLLECTSTATIC:-0}" = "1" ]; then
+  echo "🎨 Collecting static files..."
+  python manage.py collectstatic --noinput
+fi
 
 echo "🔥 Starting Gunicorn..."
 exec gunicorn gowheels_project.wsgi:application \
   --bind 0.0.0.0:8000 \
   --workers "${GUNICORN_WORKERS:-3}" \
+  --worker-class gthread \
+  --threads "${GUNICORN_THREADS:-8}" \
   --timeout 120
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'gowheels.static_assets.StaticFilesMiddleware',  # Hashed, precompressed static files
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,6 +90,13 @@ DATABASES = {
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# collectstatic writes content-hashed names plus .gz/.br copies; served by
+# gowheels.static_assets.StaticFilesMiddleware with far-future caching
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'gowheels.static_assets.CompressedManifestStaticFilesStorage'},
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -199,13 +207,64 @@ LOGIN_URL = '/login/'
 LOGOUT_REDIRECT_URL = '/login/'
 
 
-# Cache Configuration - Disabled for now
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Chat push delivery (long-poll fan-out)
+# 'inprocess' only wakes waiters inside one process; use 'redis' with
+# several gunicorn workers so every worker sees every publish.
+CHAT_BUS_BACKEND = config('CHAT_BUS_BACKEND', default='inprocess')
+# With 'inprocess', long-polls return after this many seconds so messages
+# sent through another worker still arrive within the old 3s poll interval.
+# 0 lifts the cap; only do that when a single process serves every request.
+CHAT_BUS_INPROCESS_MAX_WAIT = config('CHAT_BUS_INPROCESS_MAX_WAIT', default=3, cast=float)
+REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+
+# Cache Configuration
+# 'locmem' keeps a private cache per worker process; 'redis' shares cached
+# responses, rate-limit counters and sessions across all gunicorn workers
+# and survives restarts. Bump CACHE_VERSION to orphan every existing key.
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+CACHE_KEY_PREFIX = config('CACHE_KEY_PREFIX', default='gowheels')
+CACHE_VERSION = config('CACHE_VERSION', default=1, cast=int)
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('CACHE_REDIS_URL', default=REDIS_URL),
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'VERSION': CACHE_VERSION,
+        }
     }
-}
+    # Sessions read from the shared cache and write through to the database
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'VERSION': CACHE_VERSION,
+        }
+    }
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
+# Rate limiting engine for RateLimitMiddleware
+# 'cache' counts fixed windows with the default cache's atomic incr();
+# 'redis' runs a GCRA script on REDIS_URL (exact, one round-trip);
+# 'local' keeps per-process GCRA state (dev/tests only).
+RATE_LIMIT_BACKEND = config('RATE_LIMIT_BACKEND', default='cache')
+
+# Background jobs (see gowheels/jobs.py)
+# Run "python manage.py run_jobs" next to the web server. JOBS_EAGER runs
+# each job in the request process after commit instead (dev without a worker).
+JOBS_EAGER = config('JOBS_EAGER', default=False, cast=bool)
+FFMPEG_BINARY = config('FFMPEG_BINARY', default='ffmpeg')
+FFPROBE_BINARY = config('FFPROBE_BINARY', default='ffprobe')
 
-# Session backend
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Resumable video uploads (see gowheels/chunked_upload.py)
+# Partial files live under CHUNKED_UPLOAD_DIR (default MEDIA_ROOT/uploads/partial);
+# keep it on the media filesystem so finalizing is a rename, not a copy.
+CHUNKED_UPLOAD_DIR = config('CHUNKED_UPLOAD_DIR', default='')
+MAX_VIDEO_UPLOAD_BYTES = config('MAX_VIDEO_UPLOAD_BYTES', default=500 * 1024 * 1024, cast=int)
+UPLOAD_CHUNK_BYTES = config('UPLOAD_CHUNK_BYTES', default=1024 * 1024, cast=int)
+MAX_UPLOAD_CHUNK_BYTES = config('MAX_UPLOAD_CHUNK_BYTES', default=8 * 1024 * 1024, cast=int)
+UPLOAD_EXPIRY_HOURS = config('UPLOAD_EXPIRY_HOURS', default=24, cast=int)
@@ -0,0 +1,148 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from gowheels import autocomplete
+from gowheels.cache import CATALOG, VEHICLES
+from gowheels.models import Vehicle
+
+from .test_listing_queries import make_vehicles
+from .test_search import make_vehicle
+
+
+class PrefixTrieTests(SimpleTestCase):
+
+    def setUp(self):
+        self.ranks = {}
+        self.trie = autocomplete.PrefixTrie(self.ranks.__getitem__, k=2)
+
+    def insert(self, entry_id, key, rank):
+        self.ranks[entry_id] = rank
+        self.trie.insert(entry_id, key)
+
+    def test_top_k_by_rank(self):
+        self.insert('car', 'car', 3)
+        self.insert('cart', 'cart', 1)
+        self.insert('cab', 'cab', 2)
+        self.assertEqual(self.trie.top('ca'), ['cart', 'cab'])
+        self.assertEqual(self.trie.top('car'), ['cart', 'car'])
+        self.assertEqual(self.trie.top('ca', 1), ['cart'])
+        self.assertEqual(self.trie.top('x'), [])
+
+    def test_remove_refills_from_children_and_prunes(self):
+        self.insert('car', 'car', 3)
+        self.insert('cart', 'cart', 1)
+        self.insert('cab', 'cab', 2)
+        self.trie.remove('cart', 'cart')
+        self.assertEqual(self.trie.top('ca'), ['cab', 'car'])
+        self.assertEqual(self.trie.top('cart'), [])
+        self.assertNotIn('t', self.trie.root.children['c'].children['a'].children['r'].children)
+
+        self.trie.remove('cab', 'cab')
+        self.trie.remove('car', 'car')
+        self.assertEqual(self.trie.root.children, {})
+
+
+class AutocompleteIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        self.index = autocomplete.AutocompleteIndex()
+        self.index.add_catalog_row(('category', 1), 'category', 'Car', '')
+        self.index.add_catalog_row(('brand', 1), 'brand', 'Toyota', 'Car')
+        self.index.add_catalog_row(('model', 1), 'model', 'Corolla Altis', 'Toyota')
+        self.index.add_listing(('car', 'TOYOTA', 'Innova'), 4)
+        self.index.add_listing(('Car', 'Tata', 'Tiago'), 1)
+
+    def texts(self, prefix, kind=None, k=10):
+        return [s['text'] for s in self.index.suggest(prefix, kind, k)]
+
+    def test_suggestions_rank_by_use_and_match_word_starts(self):
+        self.assertEqual(self.texts('t'), ['Toyota', 'Tata', 'Tiago'])
+        self.assertEqual(self.texts('alt'), ['Corolla Altis'])
+        self.assertEqual(self.texts('  CAR '), ['Car'])
+        self.assertEqual(self.texts('t', kind='model'), ['Tiago'])
+        self.assertEqual(self.texts('t', k=1), ['Toyota'])
+
+    def test_entries_merge_case_and_admin_spelling_wins(self):
+        toyota = self.index.suggest('toy')[0]
+        self.assertEqual((toyota['text'], toyota['parent'], toyota['listings']), ('Toyota', 'Car', 4))
+        self.assertEqual(self.index.suggest('car')[0]['listings'], 5)
+
+    def test_entries_drop_when_nothing_references_them(self):
+        self.index.add_listing(('Car', 'Tata', 'Tiago'), -1)
+        self.assertEqual(self.texts('t'), ['Toyota'])
+        self.index.remove_catalog_row(('model', 1))
+        self.assertEqual(self.texts('alt'), [])
+        self.index.add_listing(None, -1)
+
+
+@mock.patch.object(autocomplete, 'REFRESH_INTERVAL', 0)
+class IndexHolderTests(TestCase):
+
+    def setUp(self):
+        self.vehicles = make_vehicles(3)
+        holder = autocomplete._IndexHolder()
+        holder.start_refresh = mock.Mock(side_effect=holder.refresh)
+        patcher = mock.patch.object(autocomplete, '_holder', holder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.holder = holder
+        autocomplete.get_index()
+
+    def listings(self, prefix):
+        return {s['text']: s['listings'] for s in autocomplete.suggest(prefix)}
+
+    def test_vehicle_saves_update_counts_without_rebuilding(self):
+        with mock.patch.object(autocomplete, 'build_index', wraps=autocomplete.build_index) as build:
+            self.assertEqual(self.listings('toy'), {'Toyota': 3})
+
+            moved = self.vehicles[0]
+            moved.brand_name, moved.model_name = 'Honda', 'City'
+            moved.save()
+            self.vehicles[1].approval_status = 'rejected'
+            self.vehicles[1].save(update_fields=['approval_status'])
+            self.vehicles[2].delete()
+            make_vehicle('Toyota', 'Model 10')
+
+            self.assertEqual(self.listings('toy'), {'Toyota': 1})
+            self.assertEqual(self.listings('cit'), {'City': 1})
+            self.assertEqual(self.listings('model 1'), {'Model 10': 1})
+            self.assertEqual(self.listings('model'), {'Model 10': 1})
+            build.assert_not_called()
+            self.holder.start_refresh.assert_not_called()
+
+    def test_other_workers_vehicle_writes_refresh_in_the_background(self):
+        Vehicle.objects.filter(pk=self.vehicles[0].pk).update(available=False)
+        VEHICLES.bump()
+        self.assertEqual(self.listings('toy'), {'Toyota': 2})
+        self.holder.start_refresh.assert_called_once()
+
+    def test_catalog_changes_rebuild_before_answering(self):
+        with mock.patch.object(autocomplete, 'build_index', wraps=autocomplete.build_index) as build:
+            CATALOG.bump()
+            autocomplete.get_index()
+            build.assert_called_once()
+        self.holder.start_refresh.assert_not_called()
+
+
+class AutocompleteViewTests(TestCase):
+
+    def setUp(self):
+        make_vehicles(2)
+        autocomplete._holder.invalidate()
+        self.addCleanup(autocomplete._holder.invalidate)
+
+    def get(self, **params):
+        return self.client.get(reverse('catalog_autocomplete'), params)
+
+    def test_suggestions(self):
+        data = self.get(q='toy').json()
+        self.assertEqual(data, {'suggestions': [{'text': 'Toyota', 'type': 'brand', 'parent': 'Car', 'listings': 2}]})
+        models = self.get(q='mod', type='model', k='1').json()['suggestions']
+        self.assertEqual([s['text'] for s in models], ['Model 0'])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.get(q='').json(), {'suggestions': []})
+        self.assertEqual(self.get(q='toy', type='colour').status_code, 400)
+        self.assertEqual(len(self.get(q='mod', k='lots').json()['suggestions']), 2)
@@ -0,0 +1,110 @@
+import threading
+import time
+import unittest
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from gowheels.chat_bus import InProcessMessageBus, MessageBusFactory, RedisMessageBus, set_message_bus
+from gowheels.models import Chat, Message
+
+from .test_listing_queries import BUYER_PHONE, SELLER_PHONE, make_vehicles
+
+try:
+    import fakeredis
+except ImportError:  # test-only dependency
+    fakeredis = None
+
+
+class BusContract:
+    """Behaviour every MessageBus backend must share; subclasses provide make_bus()"""
+
+    def setUp(self):
+        self.bus = self.make_bus()
+
+    def publish_later(self, chat_id, message_id, delay=0.05):
+        thread = threading.Timer(delay, self.bus.publish, args=(chat_id, message_id))
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_returns_at_once_when_already_published(self):
+        self.bus.publish(1, 5)
+        started = time.monotonic()
+        self.assertEqual(self.bus.wait(1, 4, timeout=5), 5)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_times_out_without_a_newer_message(self):
+        self.bus.publish(1, 5)
+        self.assertIsNone(self.bus.wait(1, 5, timeout=0.1))
+        self.assertIsNone(self.bus.wait(2, 0, timeout=0.1))
+
+    def test_publish_wakes_a_waiter(self):
+        self.publish_later(1, 7)
+        started = time.monotonic()
+        self.assertEqual(self.bus.wait(1, 0, timeout=5), 7)
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_other_chats_do_not_wake_a_waiter(self):
+        self.publish_later(2, 7)
+        self.assertIsNone(self.bus.wait(1, 0, timeout=0.3))
+
+
+class InProcessMessageBusTests(BusContract, SimpleTestCase):
+
+    def make_bus(self):
+        return InProcessMessageBus()
+
+    def test_waiter_bookkeeping_is_released(self):
+        self.publish_later(1, 3)
+        self.bus.wait(1, 0, timeout=5)
+        self.bus.wait(2, 0, timeout=0.01)
+        self.assertEqual((self.bus._conditions, self.bus._waiters), ({}, {}))
+
+    def test_factory_caps_inprocess_waits(self):
+        self.assertEqual(MessageBusFactory.create('inprocess', inprocess_max_wait=3).max_wait, 3)
+        self.assertIsNone(MessageBusFactory.create('inprocess', inprocess_max_wait=0).max_wait)
+        with self.assertRaises(ValueError):
+            MessageBusFactory.create('carrier-pigeon')
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class RedisMessageBusTests(BusContract, SimpleTestCase):
+
+    def make_bus(self):
+        return RedisMessageBus(fakeredis.FakeRedis())
+
+    def test_latest_id_is_shared_between_clients(self):
+        server = fakeredis.FakeServer()
+        publisher = RedisMessageBus(fakeredis.FakeRedis(server=server))
+        waiter = RedisMessageBus(fakeredis.FakeRedis(server=server))
+        publisher.publish(1, 9)
+        self.assertEqual(waiter.wait(1, 0, timeout=1), 9)
+        self.assertIsNone(waiter.max_wait)
+
+
+class WaitMessagesViewTests(TestCase):
+
+    def setUp(self):
+        vehicle = make_vehicles(1)[0]
+        self.chat = Chat.objects.create(vehicle=vehicle, buyer_phone=BUYER_PHONE, seller_phone=SELLER_PHONE)
+        session = self.client.session
+        session['phone'] = BUYER_PHONE
+        session.save()
+        self.addCleanup(set_message_bus, None)
+
+    def wait(self, **params):
+        return self.client.get(reverse('wait_messages', args=[self.chat.id]), params)
+
+    def test_inprocess_waits_are_capped(self):
+        set_message_bus(InProcessMessageBus(max_wait=0.1))
+        started = time.monotonic()
+        response = self.wait(timeout=25)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(response.json(), {'messages': [], 'last_id': 0})
+
+    def test_returns_stored_messages_without_waiting(self):
+        set_message_bus(InProcessMessageBus())
+        message = Message.objects.create(chat=self.chat, sender_phone=SELLER_PHONE, message='Still available?')
+        data = self.wait(since_id=0, timeout=25).json()
+        self.assertEqual(data['last_id'], message.id)
+        self.assertEqual([m['message'] for m in data['messages']], ['Still available?'])
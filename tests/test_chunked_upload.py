@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from gowheels import chunked_upload, jobs
+from gowheels.models import Job, VehicleVideo, VideoUpload
+
+from .test_image_variants import MEDIA_ROOT
+from .test_listing_queries import BUYER_PHONE, SELLER_PHONE, make_vehicles
+
+VIDEO = bytes(range(256)) * 40  # 10 KiB
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, UPLOAD_CHUNK_BYTES=4096, MAX_UPLOAD_CHUNK_BYTES=4096)
+class ChunkedUploadTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.vehicle = make_vehicles(1)[0]
+        Job.objects.all().delete()
+        self.login(SELLER_PHONE)
+
+    def login(self, phone):
+        session = self.client.session
+        session['phone'] = phone
+        session.save()
+
+    def start(self, size=len(VIDEO), filename='walkaround.mp4'):
+        return self.client.post(
+            reverse('start_video_upload'),
+            data=json.dumps({'vehicle_id': self.vehicle.id, 'filename': filename, 'size': size}),
+            content_type='application/json',
+        )
+
+    def put(self, upload_id, offset, data):
+        return self.client.put(
+            reverse('video_upload', args=[upload_id]), data=data,
+            content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_upload_resume_and_finalize(self):
+        response = self.start()
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        upload_id = body['upload_id']
+        self.assertEqual((body['offset'], body['size']), (0, len(VIDEO)))
+        self.assertEqual(response['Upload-Chunk-Size'], '4096')
+        self.assertTrue(Job.objects.filter(name='media.expire_upload', payload={'upload_id': upload_id}).exists())
+
+        self.assertEqual(self.put(upload_id, 0, VIDEO[:4096]).json()['offset'], 4096)
+
+        # A retried chunk the server already has is refused with the real offset
+        response = self.put(upload_id, 0, VIDEO[:4096])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 4096)
+
+        status = self.client.get(reverse('video_upload', args=[upload_id])).json()
+        self.assertEqual((status['offset'], status['complete']), (4096, False))
+
+        # Finalizing early is refused
+        response = self.client.post(reverse('finalize_video_upload', args=[upload_id]))
+        self.assertEqual(response.status_code, 409)
+
+        self.put(upload_id, 4096, VIDEO[4096:8192])
+        response = self.put(upload_id, 8192, VIDEO[8192:])
+        self.assertEqual(response.json(), {
+            'success': True, 'upload_id': upload_id, 'offset': len(VIDEO), 'size': len(VIDEO), 'complete': True,
+        })
+
+        response = self.client.post(reverse('finalize_video_upload', args=[upload_id]))
+        self.assertEqual(response.status_code, 201)
+        video = VehicleVideo.objects.get(pk=response.json()['video_id'])
+        self.assertEqual(video.vehicle_id, self.vehicle.id)
+        with video.video.open('rb') as handle:
+            self.assertEqual(handle.read(), VIDEO)
+        self.assertFalse(VideoUpload.objects.exists())
+        self.assertFalse(os.path.exists(chunked_upload.part_path(upload_id)))
+        queued = set(Job.objects.values_list('name', flat=True))
+        self.assertLessEqual({'media.video_duration', 'media.video_poster'}, queued)
+
+    def test_limits(self):
+        self.assertEqual(self.start(filename='notes.txt').status_code, 400)
+        with self.settings(MAX_VIDEO_UPLOAD_BYTES=1024):
+            self.assertEqual(self.start().status_code, 413)
+
+        upload_id = self.start(size=100).json()['upload_id']
+        self.assertEqual(self.put(upload_id, 0, b'x' * 101).status_code, 413)
+        self.assertEqual(self.put(upload_id, 0, b'').status_code, 411)
+
+    def test_only_the_seller_can_upload(self):
+        upload_id = self.start().json()['upload_id']
+        self.login(BUYER_PHONE)
+        self.assertEqual(self.start().status_code, 404)
+        self.assertEqual(self.put(upload_id, 0, VIDEO[:10]).status_code, 404)
+        self.assertEqual(self.client.post(reverse('finalize_video_upload', args=[upload_id])).status_code, 404)
+
+        self.client.session.flush()
+        self.client.cookies.clear()
+        self.assertEqual(self.start().status_code, 401)
+
+    def test_abort_and_expiry(self):
+        aborted = self.start().json()['upload_id']
+        self.put(aborted, 0, VIDEO[:4096])
+        self.assertEqual(self.client.delete(reverse('video_upload', args=[aborted])).status_code, 200)
+        self.assertFalse(os.path.exists(chunked_upload.part_path(aborted)))
+
+        expired = self.start().json()['upload_id']
+        self.put(expired, 0, VIDEO[:4096])
+        Job.objects.filter(name='media.expire_upload').update(run_after=timezone.now() - timedelta(seconds=1))
+        jobs.run_pending()
+        self.assertFalse(VideoUpload.objects.exists())
+        self.assertFalse(os.path.exists(chunked_upload.part_path(expired)))
+        self.assertEqual(self.put(expired, 4096, VIDEO[4096:8192]).status_code, 404)
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from gowheels import exports, views
+from gowheels.encryption import get_cipher
+from gowheels.models import UserProfile, Vehicle
+
+from .test_listing_queries import SELLER_PHONE, make_vehicles
+
+
+class ExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        make_vehicles(5)
+        Vehicle.objects.filter(model_name='Model 0').update(
+            seller_phone=get_cipher().encrypt(SELLER_PHONE), added_by='super_admin', approval_status='pending',
+        )
+        for i in range(3):
+            user = User.objects.create(username=f'user{i}', first_name=f'User {i}')
+            UserProfile.objects.create(user=user, phone=f'90000000{i:02d}', pincode='600001', blocked=i == 0)
+
+    def setUp(self):
+        session = self.client.session
+        session['super_admin_logged_in'] = True
+        session.save()
+
+    def body(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_vehicle_ndjson_decrypts_and_filters(self):
+        response = self.client.get(reverse('export_vehicles', args=('ndjson',)), {'approval_status': 'pending'})
+        lines = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['seller_phone'], SELLER_PHONE)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="vehicles.ndjson"')
+
+    def test_vehicle_csv(self):
+        response = self.client.get(reverse('export_vehicles', args=('csv',)), {'search': 'model 3'})
+        rows = list(csv.reader(io.StringIO(self.body(response))))
+        self.assertEqual(rows[0], list(exports.VEHICLE_FIELDS))
+        self.assertEqual([row[3] for row in rows[1:]], ['Model 3'])
+
+    def test_csv_neutralizes_formulas(self):
+        Vehicle.objects.filter(model_name='Model 3').update(model_name='=HYPERLINK("http://x.test")', state='@SUM(A1)')
+        Vehicle.objects.filter(model_name='Model 4').update(model_name='-2+3', state='+91 Kerala')
+        response = self.client.get(reverse('export_vehicles', args=('csv',)), {'approval_status': 'approved'})
+        rows = {row[0]: row for row in csv.reader(io.StringIO(self.body(response)))}
+        state = exports.VEHICLE_FIELDS.index('state')
+        cells = sorted((row[3], row[state]) for row in rows.values() if row[3][:1] == "'")
+        self.assertEqual(cells, [("'-2+3", "'+91 Kerala"), ("'=HYPERLINK(\"http://x.test\")", "'@SUM(A1)")])
+        # Numbers and ordinary text are left alone
+        self.assertIn(['Model 1', '1000.00'], [[row[3], row[5]] for row in rows.values()])
+
+        ndjson = self.client.get(reverse('export_vehicles', args=('ndjson',)), {'search': 'hyperlink'})
+        self.assertEqual(json.loads(self.body(ndjson))['model_name'], '=HYPERLINK("http://x.test")')
+
+    def test_user_export_filters(self):
+        response = self.client.get(reverse('export_users', args=('ndjson',)), {'blocked': '0'})
+        names = [json.loads(line)['name'] for line in self.body(response).splitlines()]
+        self.assertEqual(names, ['User 2', 'User 1'])
+
+    def test_list_endpoints_keep_their_json_shape(self):
+        users = json.loads(self.body(self.client.get(reverse('get_all_users_api'))))
+        self.assertEqual(users['success'], True)
+        self.assertEqual(len(users['users']), 3)
+
+        request = RequestFactory().get('/')
+        request.session = self.client.session
+        vehicles = json.loads(self.body(views.get_all_vehicles(request)))
+        self.assertEqual(vehicles, {'vehicles': [{
+            'id': Vehicle.objects.get(added_by='super_admin').id, 'category_name': 'Car',
+            'brand_name': 'Toyota', 'model_name': 'Model 0', 'year': 2020, 'price': '1000.00',
+            'pricing_type': 'day',
+        }]})
+
+    def test_rejects_unknown_format_and_anonymous_users(self):
+        self.assertEqual(self.client.get(reverse('export_users', args=('xml',))).status_code, 400)
+        self.client.session.flush()
+        self.client.cookies.clear()
+        self.assertEqual(self.client.get(reverse('export_users', args=('csv',))).status_code, 401)
+
+    def test_memory_does_not_grow_with_rows(self):
+        def peak_for(rows):
+            Vehicle.objects.bulk_create([
+                Vehicle(category_name='Car', brand_name='Tata', model_name=f'Nexon {i}', year=2021,
+                        state='TN', price=900, pricing_type='per-day', pincode='600001')
+                for i in range(rows - Vehicle.objects.count())
+            ])
+            response = self.client.get(reverse('export_vehicles', args=('ndjson',)))
+            tracemalloc.start()
+            lines = sum(part.count(b'\n') for part in response.streaming_content)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertEqual(lines, rows)
+            return peak
+
+        small, large = peak_for(exports.EXPORT_CHUNK_SIZE), peak_for(exports.EXPORT_CHUNK_SIZE * 4)
+        # One chunk in flight at a time: 4x the rows, about the same peak
+        self.assertLess(large, small * 1.5)
@@ -0,0 +1,77 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from gowheels.facets import FACETS, BrowseFilters, facet_counts
+from gowheels.models import Vehicle
+
+# Facet param each facet row is selected by
+PARAMS = {'category': 'cat', 'brand': 'br', 'listing_type': 'listing_type', 'year_band': 'year_band', 'price_band': 'price_band'}
+
+
+def list_vehicle(category, brand, year, price, listing_type='rent', **fields):
+    return Vehicle.objects.create(
+        category_name=category, brand_name=brand, model_name='Model', year=year, price=price,
+        listing_type=listing_type, state='Tamil Nadu', pricing_type='per-day', seller_phone='9123456780',
+        owner_name='Ravi', pincode='600001', approval_status=fields.pop('approval_status', 'approved'), **fields,
+    )
+
+
+class FacetCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        list_vehicle('Car', 'Toyota', 2009, 400)
+        list_vehicle('Car', 'Toyota', 2010, 500)
+        list_vehicle('car', 'Honda', 2018, 1500)
+        list_vehicle('Bike', 'Hero', 2021, 499)
+        list_vehicle('Bike', 'Hero', 2021, 5000, listing_type='sell')
+        # Never counted
+        list_vehicle('Car', 'Honda', 2015, 2000, approval_status='pending')
+        list_vehicle('Car', 'Tata', 2020, 999, available=False)
+
+    def counts(self, **params):
+        data = facet_counts(BrowseFilters(params))
+        return data['total'], {
+            facet: {option['value']: option['count'] for option in options}
+            for facet, options in data['facets'].items()
+        }
+
+    def test_unfiltered_counts_and_band_edges(self):
+        total, facets = self.counts()
+        self.assertEqual(total, 4)
+        self.assertEqual(facets['category'], {'car': 3, 'bike': 1})
+        self.assertEqual(facets['brand'], {'toyota': 2, 'hero': 1, 'honda': 1})
+        # listing_type is counted without its own 'rent' default
+        self.assertEqual(facets['listing_type'], {'rent': 4, 'sell': 1})
+        self.assertEqual(facets['year_band'], {'before-2010': 1, '2010-2014': 1, '2015-2019': 1, '2020-plus': 1})
+        self.assertEqual(facets['price_band'], {'under-500': 2, '500-1000': 1, '1000-2000': 1, '2000-5000': 0, '5000-plus': 0})
+
+    def test_each_facet_ignores_only_its_own_filter(self):
+        total, facets = self.counts(cat='Car', price_band='under-500')
+        self.assertEqual(total, 1)
+        self.assertEqual(facets['category'], {'car': 1, 'bike': 1})
+        self.assertEqual(facets['brand'], {'toyota': 1})
+        self.assertEqual(facets['listing_type'], {'rent': 1, 'sell': 0})
+        self.assertEqual(facets['year_band']['before-2010'], 1)
+        self.assertEqual(sum(facets['year_band'].values()), 1)
+        self.assertEqual(facets['price_band'], {'under-500': 1, '500-1000': 1, '1000-2000': 1, '2000-5000': 0, '5000-plus': 0})
+
+        data = facet_counts(BrowseFilters({'cat': 'Car', 'price_band': 'under-500'}))
+        self.assertEqual([o['value'] for o in data['facets']['category'] if o['selected']], ['car'])
+
+    def test_counts_match_the_filtered_listing(self):
+        """Every option's count is what selecting it (keeping the other filters) would list"""
+        for params in ({}, {'cat': 'car'}, {'br': 'hero', 'listing_type': 'sell'}, {'year_band': '2020-plus', 'price_band': 'under-500'}):
+            total, facets = self.counts(**params)
+            with self.subTest(params=params):
+                self.assertEqual(total, BrowseFilters(params).queryset().count())
+                for facet in FACETS:
+                    for value, count in facets[facet].items():
+                        selected = {**params, PARAMS[facet]: value}
+                        self.assertEqual(count, BrowseFilters(selected).queryset().count(), (facet, value))
+
+    def test_view(self):
+        response = self.client.get(reverse('get_vehicle_facets'), {'br': 'Toyota', 'year_band': '2010-2014'})
+        data = response.json()
+        self.assertEqual(data['total'], 1)
+        self.assertEqual({o['value']: o['count'] for o in data['facets']['brand']}, {'toyota': 1})
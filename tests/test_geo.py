@@ -0,0 +1,253 @@
+import io
+from contextlib import contextmanager, nullcontext
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.constants import OnConflict
+from django.test import TestCase
+from django.urls import reverse
+
+from gowheels.cache import VEHICLES
+from gowheels.pincode_import import import_pincodes
+from gowheels.models import Pincode, PincodeMapping, Vehicle, VehicleListing
+
+from .test_map_clusters import PINCODES, list_vehicle
+
+
+def add_pincodes():
+    for code, (lat, lng) in PINCODES.items():
+        Pincode.objects.create(code=code, city='City', state='State', latitude=lat, longitude=lng)
+
+
+class VehicleCoordinateTests(TestCase):
+
+    def test_save_resolves_pincode_coordinates(self):
+        add_pincodes()
+        vehicle = list_vehicle('600001')
+        self.assertEqual((vehicle.latitude, vehicle.longitude), PINCODES['600001'])
+        self.assertEqual(VehicleListing.objects.get(pk=vehicle.pk).latitude, PINCODES['600001'][0])
+
+        vehicle.pincode = '560001'
+        vehicle.save(update_fields=['pincode'])
+        vehicle.refresh_from_db()
+        self.assertEqual((vehicle.latitude, vehicle.longitude), PINCODES['560001'])
+
+        vehicle.pincode = '999999'
+        vehicle.save()
+        vehicle.refresh_from_db()
+        self.assertIsNone(vehicle.latitude)
+
+    def test_backfill_command_and_pincode_edits(self):
+        vehicle = list_vehicle('600001')
+        self.assertIsNone(vehicle.latitude)
+
+        Pincode.objects.bulk_create([Pincode(code='600001', city='Chennai', state='TN', latitude=13.08, longitude=80.27)])
+        call_command('backfill_vehicle_coordinates', stdout=open('/dev/null', 'w'))
+        vehicle.refresh_from_db()
+        self.assertEqual((vehicle.latitude, vehicle.longitude), (13.08, 80.27))
+
+        pincode = Pincode.objects.get(code='600001')
+        pincode.latitude = 13.1
+        pincode.save()
+        self.assertEqual(Vehicle.objects.get(pk=vehicle.pk).latitude, 13.1)
+        self.assertEqual(VehicleListing.objects.get(pk=vehicle.pk).latitude, 13.1)
+
+
+class RadiusSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        add_pincodes()
+        cls.central = [list_vehicle('600001') for _ in range(3)]
+        cls.south = list_vehicle('600020')
+        list_vehicle('560001')
+
+    def setUp(self):
+        VEHICLES.bump()
+
+    def browse(self, **params):
+        response = self.client.get(reverse('get_vehicles'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_radius_uses_true_distance(self):
+        expected = Pincode.haversine_distance(*PINCODES['600001'], *PINCODES['600020'])
+        self.assertEqual(len(self.browse(pincode='600001', distance=5)['vehicles']), 3)
+
+        vehicles = self.browse(pincode='600001', distance=10, sort='distance')['vehicles']
+        self.assertEqual([v['distance_km'] for v in vehicles], [0.0, 0.0, 0.0, round(expected, 2)])
+        self.assertEqual(vehicles[-1]['id'], self.south.id)
+
+    def test_distance_sort_paginates(self):
+        first = self.browse(pincode='600020', distance=10, sort='distance', limit=2)
+        self.assertEqual(first['vehicles'][0]['id'], self.south.id)
+        second = self.browse(pincode='600020', distance=10, sort='distance', limit=2, cursor=first['next_cursor'])
+        ids = [v['id'] for v in first['vehicles'] + second['vehicles']]
+        self.assertEqual(sorted(ids), sorted([self.south.id] + [v.id for v in self.central]))
+        self.assertFalse(second['has_more'])
+
+    def test_facets_count_the_radius(self):
+        response = self.client.get(reverse('get_vehicle_facets'), {'pincode': '600001', 'distance': 10})
+        self.assertEqual(response.json()['total'], 4)
+
+    def test_unknown_pincode_falls_back_to_numeric_window(self):
+        # 600005 +/- 10 covers 600001 but not 600020
+        vehicles = self.browse(pincode='600005')['vehicles']
+        self.assertEqual(len(vehicles), 3)
+        self.assertIsNone(vehicles[0]['distance_km'])
+
+
+@contextmanager
+def without_conflict_target():
+    """Make SQLite upsert like MySQL: no ON CONFLICT target, any unique key triggers the update"""
+    suffix_sql = connection.ops.on_conflict_suffix_sql
+
+    def mysql_style(fields, on_conflict, update_fields, unique_fields):
+        if on_conflict != OnConflict.UPDATE:
+            return suffix_sql(fields, on_conflict, update_fields, unique_fields)
+        assignments = ', '.join(f'{name} = EXCLUDED.{name}' for name in map(connection.ops.quote_name, update_fields))
+        return f'ON CONFLICT DO UPDATE SET {assignments}'
+
+    with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+            mock.patch.object(connection.ops, 'on_conflict_suffix_sql', mysql_style):
+        yield
+
+
+class PincodeNeighborTests(TestCase):
+
+    def setUp(self):
+        add_pincodes()
+        # ~8.6 km south of 600001
+        self.distance = Pincode.haversine_distance(*PINCODES['600001'], *PINCODES['600020'])
+
+    def precompute(self, workers):
+        call_command('precompute_pincode_neighbors', workers=workers, stdout=open('/dev/null', 'w'))
+
+    def test_precompute_tags_each_pair_with_its_radius(self):
+        self.precompute(workers=2)
+        pairs = {
+            (m.main_pincode, m.nearby_pincode): m.radius_km
+            for m in PincodeMapping.objects.all()
+        }
+        self.assertEqual(pairs, {
+            ('600001', '600001'): 5, ('600020', '600020'): 5, ('560001', '560001'): 5,
+            ('600001', '600020'): 10, ('600020', '600001'): 10,
+        })
+
+    def test_lookups_use_the_table(self):
+        self.precompute(workers=1)
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 5), ['600001'])
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 25), ['600001', '600020'])
+        with self.assertNumQueries(0):
+            Pincode.get_nearby_pincodes('600001', 25)
+
+    def test_recompute_upserts_and_prunes(self):
+        self.precompute(workers=1)
+        Pincode.objects.filter(code='600020').update(latitude=12.0, longitude=79.0)
+        self.precompute(workers=1)
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 50), ['600001'])
+        self.assertEqual(PincodeMapping.objects.count(), 3)
+
+    def test_recompute_without_conflict_target(self):
+        self.precompute(workers=1)
+        Pincode.objects.filter(code='600020').update(latitude=13.0500, longitude=80.2650)
+        with without_conflict_target():
+            self.precompute(workers=1)
+        self.assertEqual(PincodeMapping.objects.count(), 5)
+        self.assertEqual(PincodeMapping.objects.get(main_pincode='600001', nearby_pincode='600020').radius_km, 5)
+
+    def test_unknown_pincode(self):
+        self.assertEqual(Pincode.get_nearby_pincodes('999999', 10), ['999999'])
+
+    def test_pincode_edits_rewrite_their_pairs(self):
+        self.precompute(workers=1)
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 25), ['600001', '600020'])
+
+        moved = Pincode.objects.get(code='600020')
+        moved.latitude, moved.longitude = 12.0, 79.0
+        moved.save()
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 25), ['600001'])
+        self.assertEqual(PincodeMapping.objects.count(), 3)
+
+        moved.latitude, moved.longitude = 13.0500, 80.2650
+        moved.save()
+        self.assertEqual(PincodeMapping.objects.get(main_pincode='600020', nearby_pincode='600001').radius_km, 5)
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 5), ['600001', '600020'])
+
+        moved.code = '600021'
+        moved.save()
+        self.assertFalse(PincodeMapping.objects.filter(nearby_pincode='600020').exists())
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 5), ['600001', '600021'])
+
+        moved.delete()
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 25), ['600001'])
+        self.assertEqual(PincodeMapping.objects.count(), 2)
+
+    def test_pincode_edits_before_precompute_write_nothing(self):
+        Pincode.objects.get(code='600020').save()
+        self.assertFalse(PincodeMapping.objects.exists())
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 25), ['600001', '600020'])
+
+
+POSTAL_CSV = """CircleName,Pincode,OfficeName,District,StateName,Latitude,Longitude
+Tamilnadu Circle,600001,Parrys S.O,Chennai,TAMIL NADU,13.0827,80.2707
+Tamilnadu Circle,600001,Flower Bazaar S.O,Chennai,TAMIL NADU,13.0900,80.2800
+Tamilnadu Circle,600020,Adyar S.O,Chennai,TAMIL NADU,13.0067,80.2573
+Karnataka Circle,560001,Bangalore G.P.O.,Bengaluru,KARNATAKA,NA,NA
+"""
+
+
+class PincodeImportTests(TestCase):
+
+    def run_import(self, text=POSTAL_CSV):
+        return import_pincodes(io.StringIO(text))
+
+    def test_first_row_per_pincode_wins_and_bad_rows_are_skipped(self):
+        stats = self.run_import()
+        self.assertEqual((stats.rows, stats.skipped, stats.pincodes, stats.inserted), (4, 1, 2, 2))
+        self.assertEqual(Pincode.objects.get(code='600001').latitude, 13.0827)
+
+    def test_reimport_only_touches_changed_rows(self):
+        self.run_import()
+        stats = self.run_import()
+        self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (0, 0, 2))
+
+        vehicle = list_vehicle('600020')
+        stats = self.run_import(POSTAL_CSV.replace('13.0067,80.2573', '13.0100,80.2600'))
+        self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (0, 1, 1))
+        vehicle.refresh_from_db()
+        self.assertEqual((vehicle.latitude, vehicle.longitude), (13.01, 80.26))
+
+    def test_reimport_with_and_without_conflict_target(self):
+        moved = POSTAL_CSV.replace('13.0067,80.2573', '13.0100,80.2600')
+        for upsert in (nullcontext, without_conflict_target):
+            with self.subTest(upsert=upsert.__name__):
+                Pincode.objects.all().delete()
+                with upsert():
+                    self.run_import()
+                    stats = self.run_import(moved)
+                self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (0, 1, 1))
+                self.assertEqual(Pincode.objects.get(code='600020').latitude, 13.01)
+
+    def test_reimport_rewrites_neighbor_pairs(self):
+        self.run_import()
+        call_command('precompute_pincode_neighbors', stdout=io.StringIO())
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 10), ['600001', '600020'])
+
+        # 600020 moves away and a new pincode appears next to 600001
+        moved = POSTAL_CSV.replace('13.0067,80.2573', '12.0000,79.0000')
+        moved += 'Tamilnadu Circle,600005,Chintadripet S.O,Chennai,TAMIL NADU,13.0750,80.2650\n'
+        stats = self.run_import(moved)
+        self.assertEqual((stats.inserted, stats.updated), (1, 1))
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 10), ['600001', '600005'])
+        self.assertEqual(Pincode.get_nearby_pincodes('600020', 50), ['600020'])
+
+        # Same pairs as a full recompute
+        pairs = set(PincodeMapping.objects.values_list('main_pincode', 'nearby_pincode', 'radius_km'))
+        call_command('precompute_pincode_neighbors', stdout=io.StringIO())
+        self.assertEqual(set(PincodeMapping.objects.values_list('main_pincode', 'nearby_pincode', 'radius_km')), pairs)
+
+    def test_missing_columns(self):
+        with self.assertRaises(ValueError):
+            self.run_import('Pincode,Latitude\n600001,13.0\n')
@@ -0,0 +1,98 @@
+import io
+import json
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from gowheels.image_variants import VARIANT_WIDTHS
+from gowheels.jobs import run_pending
+from gowheels.models import Vehicle, VehicleImage
+
+from .test_listing_queries import make_vehicles
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+GPS_IFD = 0x8825
+ORIENTATION = 0x0112
+
+
+def phone_photo(width=2000, height=1500, orientation=6):
+    """JPEG with a rotation tag and GPS EXIF, like a phone camera upload"""
+    exif = Image.Exif()
+    exif[ORIENTATION] = orientation
+    exif[0x010F] = 'PhoneMaker'
+    exif.get_ifd(GPS_IFD)[2] = (13.0, 4.0, 57.0)
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(buffer, 'JPEG', exif=exif.tobytes())
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageVariantTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def upload(self, vehicle, **kwargs):
+        image = VehicleImage.objects.create(vehicle=vehicle, image=phone_photo(**kwargs))
+        self.assertEqual(image.variants, {})
+        run_pending()
+        image.refresh_from_db()
+        return image
+
+    def test_upload_generates_upright_variants_without_exif(self):
+        vehicle = make_vehicles(1)[0]
+        image = self.upload(vehicle)
+
+        self.assertEqual(set(image.variants), set(VARIANT_WIDTHS))
+        for variant, width in VARIANT_WIDTHS.items():
+            entry = image.variants[variant]
+            # Orientation 6 turns the 2000x1500 landscape into a portrait
+            self.assertEqual((entry['width'], entry['height']), (width, round(width * 4 / 3)))
+            for fmt, expected in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+                self.assertTrue(entry[fmt].startswith('vehicles/seller/'))
+                with image.image.storage.open(entry[fmt]) as handle:
+                    stored = Image.open(handle)
+                    self.assertEqual(stored.format, expected)
+                    self.assertEqual(len(stored.getexif()), 0)
+
+    def test_small_originals_are_not_upscaled(self):
+        image = self.upload(make_vehicles(1)[0], width=300, height=200, orientation=1)
+        self.assertEqual(image.variants['thumb']['width'], 160)
+        self.assertEqual(image.variants['detail']['width'], 300)
+
+    def test_listing_json_has_srcsets(self):
+        vehicle = make_vehicles(1)[0]
+        self.upload(vehicle)
+
+        response = self.client.get(reverse('get_vehicles'))
+        card = json.loads(response.content)['vehicles'][0]
+        self.assertEqual(len(card['image_srcsets']), len(card['images']))
+        # make_vehicles images have no files behind them: originals only
+        self.assertEqual(card['image_srcsets'][0], {
+            'src': card['images'][0], 'webp': '', 'jpeg': '', 'width': None, 'height': None,
+        })
+        uploaded = card['image_srcsets'][-1]
+        self.assertTrue(uploaded['src'].endswith('-card.jpg'))
+        self.assertEqual(uploaded['webp'].count('w,'), 2)
+        self.assertIn('-detail.webp 1200w', uploaded['webp'])
+        self.assertEqual((uploaded['width'], uploaded['height']), (1200, 1600))
+
+    def test_backfill_command(self):
+        vehicle = make_vehicles(1)[0]
+        stored = VehicleImage.objects.create(vehicle=vehicle, image=phone_photo())
+        self.assertEqual(stored.variants, {})  # no worker has run
+
+        out = io.StringIO()
+        call_command('generate_image_variants', stdout=out)
+        self.assertIn('Generated variants for 1 images (2 skipped)', out.getvalue())
+        stored.refresh_from_db()
+        self.assertEqual(set(stored.variants), set(VARIANT_WIDTHS))
+        self.assertEqual(Vehicle.objects.get(pk=vehicle.pk).listing.card['image_srcsets'][-1]['width'], 1200)
@@ -0,0 +1,175 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from gowheels import jobs, media_jobs
+from gowheels.models import DeadJob, Job, VehicleVideo
+
+from .test_image_variants import MEDIA_ROOT
+from .test_listing_queries import make_vehicles
+
+calls = []
+
+
+@jobs.job('test.record', max_attempts=3)
+def record(value):
+    calls.append(value)
+
+
+@jobs.job('test.flaky', max_attempts=3)
+def flaky(fail_times):
+    calls.append('flaky')
+    if len(calls) <= fail_times:
+        raise RuntimeError('try again')
+
+
+@jobs.job('test.slow')
+def slow(value):
+    """Outlast the lock timeout, then let another worker's release_stale() run"""
+    calls.append(value)
+    Job.objects.filter(status=Job.RUNNING).update(
+        locked_at=timezone.now() - timedelta(seconds=jobs.LOCK_TIMEOUT_SECONDS + 1),
+    )
+    calls.append(('released', jobs.release_stale()))
+
+
+@jobs.job('test.broken')
+def broken():
+    raise jobs.PermanentJobError('bad payload')
+
+
+def make_due():
+    Job.objects.update(run_after=timezone.now() - timedelta(seconds=1))
+
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_run_once_and_are_removed(self):
+        jobs.enqueue('test.record', value=1)
+        jobs.enqueue('test.record', value=2)
+        self.assertEqual(jobs.run_pending(), (2, 0))
+        self.assertEqual(calls, [1, 2])
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(jobs.run_pending(), (0, 0))
+
+    def test_unknown_job_name_is_rejected(self):
+        with self.assertRaises(jobs.PermanentJobError):
+            jobs.enqueue('test.missing')
+
+    def test_failures_retry_with_backoff_then_succeed(self):
+        jobs.enqueue('test.flaky', fail_times=2)
+        self.assertEqual(jobs.run_pending(), (0, 1))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn('try again', job.last_error)
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=jobs.RETRY_BASE_SECONDS - 5))
+        # Not due yet
+        self.assertEqual(jobs.run_pending(), (0, 0))
+
+        make_due()
+        self.assertEqual(jobs.run_pending(), (0, 1))
+        self.assertEqual(jobs.retry_delay(2), 2 * jobs.RETRY_BASE_SECONDS)
+        make_due()
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertFalse(Job.objects.exists())
+        self.assertFalse(DeadJob.objects.exists())
+
+    def test_exhausted_and_permanent_failures_are_dead_lettered(self):
+        jobs.enqueue('test.flaky', fail_times=10)
+        jobs.enqueue('test.broken')
+        for _ in range(3):
+            make_due()
+            jobs.run_pending()
+        self.assertFalse(Job.objects.exists())
+        dead = {row.name: row for row in DeadJob.objects.all()}
+        self.assertEqual(dead['test.flaky'].attempts, 3)
+        self.assertEqual(dead['test.flaky'].payload, {'fail_times': 10})
+        self.assertEqual(dead['test.broken'].attempts, 1)
+        self.assertIn('bad payload', dead['test.broken'].error)
+
+        self.assertEqual(jobs.requeue_dead('test.flaky'), 1)
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.attempts, job.max_attempts), ('test.flaky', 0, 3))
+        self.assertEqual(DeadJob.objects.get().name, 'test.broken')
+
+    def test_claimed_jobs_are_not_claimed_twice_and_stale_locks_are_released(self):
+        jobs.enqueue('test.record', value=1)
+        self.assertEqual(len(jobs.claim('worker-a')), 1)
+        self.assertEqual(jobs.claim('worker-b'), [])
+
+        self.assertEqual(jobs.release_stale(), 0)
+        later = timezone.now() + timedelta(seconds=jobs.LOCK_TIMEOUT_SECONDS + 1)
+        self.assertEqual(jobs.release_stale(later), 1)
+        self.assertEqual(jobs.run_pending('worker-b'), (1, 0))
+
+    def test_jobs_behind_a_slow_one_stay_unlocked(self):
+        jobs.enqueue('test.slow', value=1)
+        jobs.enqueue('test.record', value=2)
+        make_due()
+        self.assertEqual(jobs.run_pending('worker-a', limit=10), (2, 0))
+        # Only the slow job itself was locked, so the queued one was not released
+        self.assertEqual(calls, [1, ('released', 1), 2])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_mode_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(jobs.enqueue('test.record', value=5))
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [5])
+        self.assertFalse(Job.objects.exists())
+
+    def test_run_jobs_command(self):
+        jobs.enqueue('test.record', value=7)
+        call_command('run_jobs', once=True, stdout=mock.Mock())
+        self.assertEqual(calls, [7])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class VideoJobTests(TestCase):
+
+    def upload(self):
+        vehicle = make_vehicles(1)[0]
+        Job.objects.filter(name='media.image_variants').delete()
+        return VehicleVideo.objects.create(vehicle=vehicle, video=ContentFile(b'not really a video', name='clip.mp4'))
+
+    def test_upload_queues_video_jobs(self):
+        video = self.upload()
+        queued = list(Job.objects.order_by('id').values_list('name', 'payload'))
+        self.assertIn(('media.video_duration', {'video_id': video.pk}), queued)
+        self.assertIn(('media.video_poster', {'video_id': video.pk}), queued)
+
+    def test_duration_and_poster(self):
+        video = self.upload()
+
+        def fake_run(args):
+            if args[0] == 'ffprobe':
+                return json.dumps({'format': {'duration': '12.345'}}).encode()
+            self.assertIn('1.00', args)
+            return b'\xff\xd8jpeg-bytes'
+
+        with mock.patch.object(media_jobs, '_run', side_effect=fake_run):
+            jobs.run_pending()
+        video.refresh_from_db()
+        self.assertEqual(video.duration, 12.35)
+        self.assertTrue(video.poster.name.startswith('vehicles/seller/videos/posters/clip'))
+        with video.poster.open('rb') as handle:
+            self.assertEqual(handle.read(), b'\xff\xd8jpeg-bytes')
+
+    def test_unprobeable_video_is_retried(self):
+        self.upload()
+        with mock.patch.object(media_jobs, '_run', side_effect=RuntimeError('ffprobe exited 1')):
+            self.assertEqual(jobs.run_pending(), (0, 2))
+        self.assertEqual(set(Job.objects.values_list('attempts', flat=True)), {1})
+
+    def test_deleted_video_is_skipped(self):
+        self.upload().delete()
+        self.assertEqual(jobs.run_pending(), (2, 0))
@@ -0,0 +1,184 @@
+import json
+from unittest import mock
+
+from cryptography.fernet import Fernet
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from gowheels import views
+from gowheels.cache import VEHICLES
+from gowheels.encryption import Cipher
+from gowheels.models import Pincode, Vehicle, VehicleImage, VehicleClick, VehicleListing, Wishlist
+from gowheels.read_model import listing_cards, rebuild_listings, refresh_listing
+from gowheels.serializers import VehicleListingSerializer
+
+BUYER_PHONE = '9876543210'
+SELLER_PHONE = '9123456780'
+
+
+def make_vehicles(count, start=0):
+    vehicles = []
+    for i in range(start, start + count):
+        vehicle = Vehicle.objects.create(
+            category_name='Car',
+            brand_name='Toyota',
+            model_name=f'Model {i}',
+            year=2020,
+            state='Tamil Nadu',
+            price=1000,
+            pricing_type='per-day',
+            seller_phone=SELLER_PHONE,
+            owner_name='Ravi',
+            pincode='600001',
+            approval_status='approved',
+            added_by='seller',
+        )
+        VehicleImage.objects.create(vehicle=vehicle, image=f'vehicles/seller/{i}-a.jpg')
+        VehicleImage.objects.create(vehicle=vehicle, image=f'vehicles/seller/{i}-b.jpg')
+        VehicleClick.objects.create(vehicle=vehicle, buyer_phone=BUYER_PHONE, buyer_name='Buyer')
+        Wishlist.objects.create(user_phone=BUYER_PHONE, vehicle=vehicle)
+        vehicles.append(vehicle)
+    return vehicles
+
+
+class ListingQueryCountTests(TestCase):
+    """Listing endpoints must cost the same number of queries for 2 or 20 rows"""
+
+    def setUp(self):
+        session = self.client.session
+        session['phone'] = SELLER_PHONE
+        session.save()
+
+    def count_queries(self, fetch):
+        with CaptureQueriesContext(connection) as ctx:
+            response = fetch()
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), json.loads(response.content)
+
+    def assert_constant_queries(self, url_name=None, view=None, params=None, key='vehicles'):
+        if view is not None:
+            fetch = lambda: view(RequestFactory().get('/', params or {}))
+        else:
+            fetch = lambda: self.client.get(reverse(url_name), params or {})
+        make_vehicles(2)
+        small_count, small = self.count_queries(fetch)
+        make_vehicles(18, start=2)
+        large_count, large = self.count_queries(fetch)
+
+        self.assertEqual(len(small[key]), 2)
+        self.assertEqual(len(large[key]), 20)
+        self.assertEqual(small_count, large_count)
+        return large
+
+    def test_get_vehicles(self):
+        data = self.assert_constant_queries('get_vehicles')
+        self.assertEqual(len(data['vehicles'][0]['images']), 2)
+
+    def test_get_vehicles_map(self):
+        Pincode.objects.create(code='600001', city='Chennai', state='Tamil Nadu', latitude=13.0827, longitude=80.2707)
+        fetch = lambda: views.get_vehicles_map(RequestFactory().get('/', {'zoom': 10, 'south': 12.9, 'west': 80.1, 'north': 13.2, 'east': 80.4}))
+        make_vehicles(2)
+        small_count, small = self.count_queries(fetch)
+        make_vehicles(18, start=2)
+        large_count, large = self.count_queries(fetch)
+
+        self.assertEqual([cluster['count'] for cluster in small['clusters']], [2])
+        self.assertEqual([cluster['count'] for cluster in large['clusters']], [20])
+        self.assertEqual(small_count, large_count)
+
+    def test_get_wishlist(self):
+        session = self.client.session
+        session['phone'] = BUYER_PHONE
+        session.save()
+        self.assert_constant_queries('get_wishlist')
+
+    def test_get_seller_vehicles(self):
+        data = self.assert_constant_queries('get_seller_vehicles')
+        self.assertEqual(len(data['vehicles'][0]['recent_clicks']), 1)
+
+
+class GetVehiclesFailureTests(TestCase):
+
+    def test_failures_are_5xx_and_not_cached(self):
+        make_vehicles(2)
+        VEHICLES.bump()
+        url = reverse('get_vehicles')
+        with mock.patch.object(views, 'listing_cards', side_effect=RuntimeError('read model unavailable')):
+            failed = self.client.get(url)
+        self.assertEqual(failed.status_code, 500)
+        self.assertEqual(failed.json(), {'vehicles': [], 'error': 'read model unavailable'})
+
+        retried = self.client.get(url)
+        self.assertEqual((retried.status_code, retried['X-Cache']), (200, 'MISS'))
+        self.assertEqual(len(retried.json()['vehicles']), 2)
+
+
+class VehicleListingSerializerTests(TestCase):
+
+    def test_decrypts_each_ciphertext_once(self):
+        cipher = Cipher()
+        make_vehicles(3)
+        Vehicle.objects.update(seller_phone=cipher.encrypt(SELLER_PHONE))
+
+        calls = []
+        original = cipher.decrypt
+
+        def counting_decrypt(value):
+            calls.append(value)
+            return original(value)
+
+        cipher.decrypt = counting_decrypt
+        listing = VehicleListingSerializer(
+            VehicleListingSerializer.prepare(Vehicle.objects.all()), cipher=cipher
+        )
+
+        self.assertEqual({listing.seller_phone(v) for v in listing.vehicles}, {SELLER_PHONE})
+        self.assertEqual(len(calls), 1)
+
+    def test_undecryptable_values_use_fallbacks(self):
+        make_vehicles(1)
+        other_key = Cipher([Fernet.generate_key()])
+        Vehicle.objects.update(seller_phone=other_key.encrypt(SELLER_PHONE), owner_name='gAAAAbroken')
+
+        listing = VehicleListingSerializer(VehicleListingSerializer.prepare(Vehicle.objects.all()))
+        vehicle = listing.vehicles[0]
+
+        self.assertEqual(listing.seller_phone(vehicle), 'Not Available')
+        self.assertEqual(listing.owner_name(vehicle), 'Owner')
+
+
+class ReadModelQueryCountTests(TestCase):
+
+    def rebuild_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            count = rebuild_listings(batch_size=500)
+        self.assertEqual(count, Vehicle.objects.count())
+        return len(ctx.captured_queries)
+
+    def test_rebuild_costs_the_same_for_3_or_20_vehicles(self):
+        make_vehicles(3)
+        small = self.rebuild_queries()
+        make_vehicles(17, start=3)
+        self.assertEqual(self.rebuild_queries(), small)
+
+    def test_refresh_loads_coordinates_with_the_row(self):
+        vehicle = make_vehicles(1)[0]
+        Vehicle.objects.filter(pk=vehicle.pk).update(latitude=13.08, longitude=80.27)
+        with self.assertNumQueries(6):
+            refresh_listing(vehicle.pk)
+        self.assertEqual(VehicleListing.objects.get(pk=vehicle.pk).longitude, 80.27)
+
+    def test_rebuild_does_not_decrypt_seller_details(self):
+        make_vehicles(3)
+        cipher = Cipher()
+        Vehicle.objects.update(seller_phone=cipher.encrypt(SELLER_PHONE), owner_name=cipher.encrypt('Ravi'))
+        with mock.patch('gowheels.serializers.get_cipher') as get_cipher:
+            rebuild_listings()
+        get_cipher.assert_not_called()
+
+        listings = list(VehicleListing.objects.order_by('pk'))
+        self.assertEqual({(l.card['seller_phone'], l.card['owner_name']) for l in listings}, {('', '')})
+        cards = listing_cards(listings, cipher=cipher)
+        self.assertEqual({(c['seller_phone'], c['owner_name']) for c in cards}, {(SELLER_PHONE, 'Ravi')})
@@ -0,0 +1,98 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from gowheels.cache import VEHICLES
+from gowheels.map_clusters import CLUSTER_GRID, cluster_points, tile_bounds
+from gowheels.models import Pincode, Vehicle
+
+# Two Chennai pincodes ~6 km apart and one in Bengaluru
+PINCODES = {
+    '600001': (13.0827, 80.2707),
+    '600020': (13.0067, 80.2573),
+    '560001': (12.9716, 77.5946),
+}
+
+
+def list_vehicle(pincode, **fields):
+    return Vehicle.objects.create(
+        category_name='Car', brand_name='Toyota', model_name='Innova', year=2020,
+        state='Tamil Nadu', price=1000, pricing_type='per-day', pincode=pincode,
+        approval_status='approved', added_by='seller', **fields,
+    )
+
+
+class MapClusterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for code, (lat, lng) in PINCODES.items():
+            Pincode.objects.create(code=code, city='City', state='State', latitude=lat, longitude=lng)
+        for _ in range(3):
+            list_vehicle('600001')
+        list_vehicle('600020')
+        cls.lone = list_vehicle('560001')
+        list_vehicle('560001', listing_type='sell')
+
+    def setUp(self):
+        VEHICLES.bump()
+
+    def clusters(self, **params):
+        params = {'south': 5, 'west': 70, 'north': 20, 'east': 85, **params}
+        response = self.client.get(reverse('get_vehicles_map'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['clusters']
+
+    def test_nearby_pincodes_merge_when_zoomed_out(self):
+        clusters = self.clusters(zoom=5)
+        self.assertEqual([(c['count'], c['pincodes']) for c in clusters], [(4, 2), (1, 1)])
+        self.assertAlmostEqual(clusters[0]['lat'], (3 * 13.0827 + 13.0067) / 4, places=5)
+
+    def test_pincodes_split_when_zoomed_in(self):
+        clusters = self.clusters(zoom=12, south=12.9, west=80.1, north=13.2, east=80.4)
+        self.assertEqual([c['count'] for c in clusters], [3, 1])
+
+    def test_single_vehicle_cluster_names_the_vehicle(self):
+        lone = [c for c in self.clusters(zoom=5) if c['count'] == 1]
+        self.assertEqual(lone[0]['vehicle_id'], self.lone.id)
+
+    def test_filters_apply(self):
+        clusters = self.clusters(zoom=5, listing_type='sell')
+        self.assertEqual([c['count'] for c in clusters], [1])
+
+    def test_tiles_partition_the_bounding_box(self):
+        # Every zoom-6 tile over south India adds up to the bounding-box total
+        total = 0
+        for x in range(44, 47):
+            for y in range(28, 31):
+                data = self.client.get(reverse('get_map_tile', args=(6, x, y))).json()
+                self.assertLessEqual(len(data['clusters']), CLUSTER_GRID ** 2)
+                total += sum(c['count'] for c in data['clusters'])
+        self.assertEqual(total, 5)
+
+    def test_tile_is_cached(self):
+        url = reverse('get_map_tile', args=(6, 45, 29))
+        first = self.client.get(url)
+        second = self.client.get(url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertIn('max-age', second['Cache-Control'])
+        self.assertEqual(first.content, second.content)
+
+        list_vehicle('600001')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get(reverse('get_map_tile', args=(3, 8, 0))).status_code, 400)
+        self.assertEqual(self.client.get(reverse('get_map_tile', args=(21, 0, 0))).status_code, 400)
+        response = self.client.get(reverse('get_vehicles_map'), {'zoom': 12, 'south': 5, 'west': 70, 'north': 20, 'east': 85})
+        self.assertEqual(response.status_code, 400)
+
+    def test_tile_bounds(self):
+        south, west, north, east = tile_bounds(1, 1, 0)
+        self.assertEqual((west, east), (0.0, 180.0))
+        self.assertAlmostEqual(south, 0.0)
+        self.assertAlmostEqual(north, 85.0511, places=4)
+
+    def test_cluster_points_is_pure(self):
+        clusters = cluster_points([(13.0, 80.0, 2, 7), (13.0, 80.0, 1, 9)], zoom=3)
+        self.assertEqual(clusters, [{'lat': 13.0, 'lng': 80.0, 'count': 3, 'pincodes': 2}])
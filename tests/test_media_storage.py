@@ -0,0 +1,132 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from gowheels import media_storage
+from gowheels.models import BrandImage, Job, MediaBlob, ModelImage
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+LOGO = b'\x89PNG fake logo bytes'
+OTHER = b'\x89PNG another logo'
+
+
+def upload(name, data=LOGO):
+    return SimpleUploadedFile(name, data, content_type='image/png')
+
+
+def later():
+    return timezone.now() + timedelta(seconds=media_storage.COLLECT_GRACE_SECONDS + 1)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(MEDIA_ROOT, name)
+
+    def test_identical_uploads_share_one_blob(self):
+        first = BrandImage.objects.create(category='car', image=upload('toyota.png'))
+        second = ModelImage.objects.create(category='car', image=upload('Toyota copy.PNG'))
+        third = BrandImage.objects.create(category='bike', image=upload('hero.png', OTHER))
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertRegex(first.image.name, r'^cas/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertNotEqual(first.image.name, third.image.name)
+        with open(self.path(first.image.name), 'rb') as handle:
+            self.assertEqual(handle.read(), LOGO)
+        self.assertEqual(MediaBlob.objects.get(name=first.image.name).refs, 2)
+        self.assertEqual(MediaBlob.objects.get(name=third.image.name).refs, 1)
+
+    def test_blob_survives_until_last_reference_is_gone(self):
+        first = BrandImage.objects.create(category='car', image=upload('a.png'))
+        second = BrandImage.objects.create(category='car', image=upload('b.png'))
+        name = first.image.name
+
+        first.delete()
+        self.assertEqual(MediaBlob.objects.get(name=name).refs, 1)
+        self.assertFalse(Job.objects.filter(name='media.collect_blob').exists())
+
+        second.delete()
+        job = Job.objects.get(name='media.collect_blob')
+        self.assertEqual(job.payload, {'blob': name})
+        self.assertGreater(job.run_after, timezone.now())
+        # Inside the grace period nothing is removed
+        self.assertFalse(media_storage.collect(name))
+        self.assertTrue(os.path.exists(self.path(name)))
+
+        self.assertTrue(media_storage.collect(name, now=later()))
+        self.assertFalse(os.path.exists(self.path(name)))
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+
+    def test_reupload_during_grace_period_keeps_blob(self):
+        name = BrandImage.objects.create(category='car', image=upload('a.png')).image.name
+        BrandImage.objects.all().delete()
+        BrandImage.objects.create(category='car', image=upload('again.png'))
+        self.assertFalse(media_storage.collect(name, now=later()))
+        self.assertTrue(os.path.exists(self.path(name)))
+
+    def test_replacing_an_image_moves_the_reference(self):
+        brand = BrandImage.objects.create(category='car', image=upload('a.png'))
+        old = brand.image.name
+        brand.image = upload('b.png', OTHER)
+        brand.save()
+        self.assertEqual(MediaBlob.objects.get(name=old).refs, 0)
+        self.assertEqual(MediaBlob.objects.get(name=brand.image.name).refs, 1)
+        # Saving without touching the image leaves the counts alone
+        brand.name = 'Renamed'
+        brand.save()
+        self.assertEqual(MediaBlob.objects.get(name=brand.image.name).refs, 1)
+
+    def write_legacy(self, name, data):
+        os.makedirs(os.path.dirname(self.path(name)), exist_ok=True)
+        with open(self.path(name), 'wb') as handle:
+            handle.write(data)
+
+    def test_dedupe_command_moves_legacy_files_into_blobs(self):
+        self.write_legacy('brands/a.png', LOGO)
+        self.write_legacy('brands/a_x7Yz.png', LOGO)
+        self.write_legacy('models/b.png', OTHER)
+        BrandImage.objects.create(category='car', image='brands/a.png')
+        BrandImage.objects.create(category='car', image='brands/a_x7Yz.png')
+        ModelImage.objects.create(category='car', image='brands/a.png')
+        ModelImage.objects.create(category='car', image='models/b.png')
+        ModelImage.objects.create(category='car', image='models/missing.png')
+
+        out = io.StringIO()
+        call_command('dedupe_media', dry_run=True, stdout=out)
+        self.assertIn('4 rows moved to 2 new blobs (1 missing files skipped)', out.getvalue())
+        self.assertIn(f'{len(LOGO):,} saved', out.getvalue())
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertTrue(os.path.exists(self.path('brands/a.png')))
+
+        call_command('dedupe_media', stdout=io.StringIO())
+        names = set(BrandImage.objects.values_list('image', flat=True))
+        self.assertEqual(len(names), 1)
+        logo = names.pop()
+        self.assertEqual(MediaBlob.objects.get(name=logo).refs, 3)
+        self.assertEqual(MediaBlob.objects.exclude(name=logo).get().refs, 1)
+        for legacy in ('brands/a.png', 'brands/a_x7Yz.png', 'models/b.png'):
+            self.assertFalse(os.path.exists(self.path(legacy)))
+        self.assertEqual(ModelImage.objects.filter(image='models/missing.png').count(), 1)
+
+    def test_recount_and_gc(self):
+        brand = BrandImage.objects.create(category='car', image=upload('a.png'))
+        MediaBlob.objects.update(refs=5)
+        orphan = media_storage.catalog_storage().save('x.png', upload('x.png', OTHER))
+        self.assertEqual(media_storage.recount_refs(), 1)
+        self.assertEqual(MediaBlob.objects.get(name=brand.image.name).refs, 1)
+        self.assertEqual(media_storage.collect_unreferenced(now=later()), 1)
+        self.assertFalse(os.path.exists(self.path(orphan)))
@@ -0,0 +1,123 @@
+import re
+
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from gowheels import views
+from gowheels.cache import VEHICLES
+from gowheels.models import Pincode, Vehicle, VehicleListing
+
+from .test_listing_queries import SELLER_PHONE, make_vehicles
+
+# Tables that grow with the number of listings and must never be scanned
+LISTING_TABLES = (Vehicle._meta.db_table, VehicleListing._meta.db_table)
+TABLE_RE = '|'.join(LISTING_TABLES)
+
+
+def full_scans(sql):
+    """EXPLAIN sql and return the plan lines that read a whole listing table"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+        columns = [col[0].lower() for col in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    if connection.vendor == 'sqlite':
+        # "SCAN t" and "SCAN t USING [COVERING] INDEX i" both read every row
+        pattern = re.compile(rf'^SCAN (TABLE )?"?({TABLE_RE})"?( USING (COVERING )?INDEX \S+)?$')
+        return [row['detail'] for row in rows if pattern.match(row['detail'])]
+    if connection.vendor == 'mysql':
+        return [str(row) for row in rows if row.get('table') in LISTING_TABLES and row.get('type') == 'ALL']
+    if connection.vendor == 'postgresql':
+        plan = '\n'.join(str(row) for row in rows)
+        return re.findall(rf'Seq Scan on ({TABLE_RE})\b.*', plan)
+    return []
+
+
+class VehicleQueryPlanTests(TestCase):
+    """Every listing query behind the browse and dashboard views must hit an index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        make_vehicles(30)
+        Pincode.objects.create(code='600001', city='Chennai', state='Tamil Nadu', latitude=13.0827, longitude=80.2707)
+        for i in range(30):
+            Vehicle.objects.create(
+                category_name='Bike', brand_name='Honda', model_name=f'Shine {i}',
+                year=2021, state='Kerala', price=500, pricing_type='per-hour',
+                pincode=str(680000 + i), approval_status='pending', added_by='state_admin',
+                listing_type='sell', available=bool(i % 2),
+            )
+
+    def setUp(self):
+        VEHICLES.bump()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+        self.factory = RequestFactory()
+
+    def assert_indexed(self, run_view):
+        with CaptureQueriesContext(connection) as ctx:
+            response = run_view()
+        self.assertEqual(response.status_code, 200)
+
+        listing_selects = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith('SELECT')
+            and re.search(rf'["`]({TABLE_RE})["`]', query['sql'].split(' WHERE ')[0])
+        ]
+        self.assertTrue(listing_selects, 'view issued no listing queries')
+        for sql in listing_selects:
+            self.assertEqual(full_scans(sql), [], f'full table scan in:\n{sql}')
+
+    def test_browse_by_catalog(self):
+        self.assert_indexed(lambda: self.client.get(reverse('get_vehicles'), {
+            'cat': 'CAR', 'br': 'toyota', 'mod': 'Model 3', 'listing_type': 'rent',
+        }))
+
+    def test_browse_by_category_only(self):
+        self.assert_indexed(lambda: self.client.get(reverse('get_vehicles'), {'cat': 'car'}))
+
+    def test_browse_by_pincode_range(self):
+        self.assert_indexed(lambda: self.client.get(reverse('get_vehicles'), {'pincode': '600005'}))
+
+    def test_browse_near_pincode(self):
+        self.assert_indexed(lambda: self.client.get(reverse('get_vehicles'), {
+            'pincode': '600001', 'distance': 10, 'sort': 'distance',
+        }))
+
+    def test_browse_next_page(self):
+        first = self.client.get(reverse('get_vehicles'), {'cat': 'car', 'limit': 5}).json()
+        self.assert_indexed(lambda: self.client.get(reverse('get_vehicles'), {
+            'cat': 'car', 'limit': 5, 'cursor': first['next_cursor'],
+        }))
+
+    def test_vehicle_map(self):
+        self.assert_indexed(lambda: views.get_vehicles_map(self.factory.get('/get-vehicles-map/')))
+
+    def test_map_tile(self):
+        self.assert_indexed(lambda: self.client.get(reverse('get_map_tile', args=(10, 740, 474)), {'cat': 'car'}))
+
+    def test_pending_approvals(self):
+        self.assert_indexed(lambda: views.get_pending_approvals(self.factory.get('/get-pending-approvals/')))
+
+    def test_state_admin_vehicles(self):
+        self.assert_indexed(lambda: views.get_state_admin_vehicles(self.factory.get('/get-state-admin-vehicles/')))
+
+    def test_seller_dashboard(self):
+        session = self.client.session
+        session['phone'] = SELLER_PHONE
+        session.save()
+        self.assert_indexed(lambda: self.client.get(reverse('get_seller_vehicles')))
+
+    def test_facets(self):
+        self.assert_indexed(lambda: self.client.get(reverse('get_vehicle_facets'), {'cat': 'car', 'pincode': '600005'}))
+
+    def test_search(self):
+        self.assert_indexed(lambda: self.client.get(reverse('search_vehicles'), {'q': 'toyota mod'}))
+
+    def test_case_insensitive_match_uses_keys(self):
+        data = self.client.get(reverse('get_vehicles'), {'cat': 'cAr', 'br': 'TOYOTA'}).json()
+        self.assertEqual(len(data['vehicles']), 20)
+        self.assertEqual(data['vehicles'][0]['brand_name'], 'Toyota')
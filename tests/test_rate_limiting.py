@@ -0,0 +1,119 @@
+import threading
+import unittest
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from gowheels.rate_limiting import (
+    CacheRateLimiter,
+    LocalRateLimiter,
+    RateLimitMiddleware,
+    RedisRateLimiter,
+    set_rate_limiter,
+)
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (fakeredis needs it for EVALSHA)
+except ImportError:
+    fakeredis = None
+
+THREADS = 16
+HITS_PER_THREAD = 25
+LIMIT = 100
+WINDOW = 3600  # long enough that no slot frees up during the test
+
+
+def hammer(limiter, key='client'):
+    """Fire THREADS * HITS_PER_THREAD hits at once and count the allowed ones"""
+    allowed = []
+    barrier = threading.Barrier(THREADS)
+
+    def worker():
+        barrier.wait()
+        for _ in range(HITS_PER_THREAD):
+            if limiter.hit(key, LIMIT, WINDOW)[0]:
+                allowed.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(allowed)
+
+
+class ConcurrentLimitTests(SimpleTestCase):
+    """Under contention every engine admits exactly LIMIT requests"""
+
+    def test_local_limiter_is_exact(self):
+        self.assertEqual(hammer(LocalRateLimiter()), LIMIT)
+
+    def test_cache_limiter_is_exact(self):
+        cache = LocMemCache('ratelimit-test', {})
+        self.assertEqual(hammer(CacheRateLimiter(cache)), LIMIT)
+
+    @unittest.skipIf(fakeredis is None, 'fakeredis with Lua support not installed')
+    def test_redis_limiter_is_exact(self):
+        limiter = RedisRateLimiter(fakeredis.FakeRedis())
+        self.assertEqual(hammer(limiter), LIMIT)
+        self.assertEqual(limiter.peek('client', LIMIT, WINDOW), 0)
+
+
+class LimiterBehaviourTests(SimpleTestCase):
+
+    def test_remaining_counts_down_and_peek_does_not_consume(self):
+        limiter = LocalRateLimiter(clock=lambda: 1000.0)
+        self.assertEqual(limiter.hit('k', 5, 60)[1], 4)
+        self.assertEqual(limiter.hit('k', 5, 60)[1], 3)
+        self.assertEqual(limiter.peek('k', 5, 60), 3)
+        self.assertEqual(limiter.peek('k', 5, 60), 3)
+
+    def test_gcra_frees_one_slot_per_interval(self):
+        now = [1000.0]
+        limiter = LocalRateLimiter(clock=lambda: now[0])
+        for _ in range(5):
+            self.assertTrue(limiter.hit('k', 5, 60)[0])
+        allowed, _, retry_at = limiter.hit('k', 5, 60)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_at, 1012.0)
+
+        now[0] = 1012.0
+        self.assertTrue(limiter.hit('k', 5, 60)[0])
+        self.assertFalse(limiter.hit('k', 5, 60)[0])
+
+    def test_cache_limiter_resets_with_window(self):
+        now = [1000.0]
+        limiter = CacheRateLimiter(LocMemCache('ratelimit-window', {}), clock=lambda: now[0])
+        for _ in range(3):
+            self.assertTrue(limiter.hit('k', 3, 60)[0])
+        self.assertEqual(limiter.hit('k', 3, 60), (False, 0, 1020))
+
+        now[0] = 1020.0
+        self.assertEqual(limiter.hit('k', 3, 60), (True, 2, 1080))
+
+
+class MiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        set_rate_limiter(LocalRateLimiter())
+        self.addCleanup(set_rate_limiter, None)
+        self.middleware = RateLimitMiddleware(lambda request: HttpResponse('ok'))
+        self.factory = RequestFactory()
+
+    def test_auth_limit_returns_429_with_retry_after(self):
+        for expected_remaining in range(4, -1, -1):
+            response = self.middleware(self.factory.post('/login/'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['X-RateLimit-Remaining'], str(expected_remaining))
+
+        response = self.middleware(self.factory.post('/login/'))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '12')
+
+    def test_clients_are_limited_independently(self):
+        for _ in range(5):
+            self.middleware(self.factory.post('/login/', REMOTE_ADDR='10.0.0.1'))
+        response = self.middleware(self.factory.post('/login/', REMOTE_ADDR='10.0.0.2'))
+        self.assertEqual(response.status_code, 200)
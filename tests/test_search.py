@@ -0,0 +1,91 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from gowheels import search
+from gowheels.models import Vehicle, VehicleSearchToken
+
+
+def make_vehicle(brand, model, category='Car', state='Kerala', year=2019):
+    return Vehicle.objects.create(
+        category_name=category, brand_name=brand, model_name=model, year=year, state=state,
+        price=1000, pricing_type='per-day', seller_phone='9123456780', owner_name='Ravi',
+        pincode='600001', approval_status='approved', added_by='seller',
+    )
+
+
+class SearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.city = make_vehicle('Honda', 'City')
+        cls.city_bike = make_vehicle('Hero', 'Splendor', category='City Bike', year=2021)
+        cls.cityscape = make_vehicle('Tata', 'Cityscape', state='Delhi')
+        cls.amaze = make_vehicle('Honda', 'Amaze', year=2021)
+        cls.nexon = make_vehicle('Tata', 'Nexon', state='Delhi', year=2021)
+
+    def ids(self, query, **kwargs):
+        vehicles, _ = search.search(query, **kwargs)
+        return [vehicle.id for vehicle in vehicles]
+
+    def test_saving_a_vehicle_indexes_its_fields(self):
+        self.assertEqual(
+            dict(VehicleSearchToken.objects.filter(vehicle=self.city_bike).values_list('token', 'weight')),
+            {'hero': 3, 'splendor': 3, 'city': 2, 'bike': 2, 'kerala': 1, '2021': 1},
+        )
+
+    def test_exact_tokens_outrank_prefixes_then_field_weight(self):
+        # model exact (3 * 2), category exact (2 * 2), model prefix (3)
+        self.assertEqual(self.ids('city'), [self.city.id, self.city_bike.id, self.cityscape.id])
+
+    def test_prefix_matches_partial_words(self):
+        self.assertEqual(self.ids('hon'), [self.amaze.id, self.city.id])
+        self.assertEqual(self.ids('Nex'), [self.nexon.id])
+        self.assertEqual(self.ids('xyz'), [])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.ids('honda 2021'), [self.amaze.id])
+        self.assertEqual(self.ids('tata delhi 2021'), [self.nexon.id])
+        self.assertEqual(self.ids('honda delhi'), [])
+
+    def test_ties_break_newest_first_and_page(self):
+        self.assertEqual(self.ids('2021'), [self.nexon.id, self.amaze.id, self.city_bike.id])
+        vehicles, has_more = search.search('2021', limit=2)
+        self.assertEqual(([v.id for v in vehicles], has_more), ([self.nexon.id, self.amaze.id], True))
+
+    def test_edits_reindex_and_deletes_drop_out(self):
+        self.cityscape.model_name = 'Harrier'
+        self.cityscape.save()
+        self.assertEqual(self.ids('city'), [self.city.id, self.city_bike.id])
+        self.assertEqual(self.ids('harr'), [self.cityscape.id])
+
+        self.city.delete()
+        self.assertEqual(self.ids('city'), [self.city_bike.id])
+
+    def test_view(self):
+        response = self.client.get(reverse('search_vehicles'), {'q': 'tata', 'limit': 1})
+        data = response.json()
+        self.assertEqual([v['model_name'] for v in data['vehicles']], ['Nexon'])
+        self.assertTrue(data['has_more'])
+
+        short = self.client.get(reverse('search_vehicles'), {'q': 'h'}).json()
+        self.assertEqual((short['vehicles'], short['has_more']), ([], False))
+
+    def walk(self, query, limit):
+        pages, cursor = [], None
+        while True:
+            params = {'q': query, 'limit': limit, **({'cursor': cursor} if cursor else {})}
+            data = self.client.get(reverse('search_vehicles'), params).json()
+            pages.append([v['id'] for v in data['vehicles']])
+            cursor = data['next_cursor']
+            self.assertEqual(data['has_more'], cursor is not None)
+            if cursor is None:
+                return pages
+
+    def test_view_pages_through_ranked_results(self):
+        # Pages split across different scores ...
+        self.assertEqual(self.walk('city', 2), [[self.city.id, self.city_bike.id], [self.cityscape.id]])
+        # ... and across ties on the same score
+        self.assertEqual(self.walk('2021', 1), [[self.nexon.id], [self.amaze.id], [self.city_bike.id]])
+
+        bad = self.client.get(reverse('search_vehicles'), {'q': 'city', 'cursor': 'not-a-cursor'})
+        self.assertEqual(bad.status_code, 400)
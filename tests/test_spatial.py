@@ -0,0 +1,85 @@
+import random
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from gowheels import spatial
+from gowheels.models import Pincode
+
+
+def brute_force(points, lat, lng, radius_km):
+    """Every point within radius_km by a full scan, nearest first"""
+    found = []
+    for code, plat, plng in points:
+        distance = Pincode.haversine_distance(lat, lng, plat, plng)
+        if distance <= radius_km:
+            found.append((distance, code))
+    return [code for _, code in sorted(found)]
+
+
+class PincodeGridIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = random.Random(1)
+        # Dense around Chennai, a few far away, and some straddling cell edges
+        self.points = [(f'6{i:05d}', 12.8 + rng.random() * 0.5, 80.0 + rng.random() * 0.5) for i in range(400)]
+        self.points += [('560001', 12.9716, 77.5946), ('110001', 28.6139, 77.2090)]
+        self.points += [('700001', 13.0, 80.1), ('700002', 12.9999, 80.0999)]
+
+    def check_against_brute_force(self, index):
+        for lat, lng, radius in ((13.0827, 80.2707, 5), (13.0, 80.1, 10), (13.0, 80.25, 50), (20.0, 78.0, 5)):
+            with self.subTest(lat=lat, lng=lng, radius=radius):
+                result = index.query(lat, lng, radius)
+                self.assertEqual([code for code, _ in result], brute_force(self.points, lat, lng, radius))
+                for code, distance in result:
+                    self.assertLessEqual(distance, radius)
+
+    def test_matches_a_full_scan(self):
+        self.check_against_brute_force(spatial.PincodeGridIndex(self.points))
+
+    def test_pure_python_fallback_matches(self):
+        with mock.patch.object(spatial, 'np', None):
+            self.check_against_brute_force(spatial.PincodeGridIndex(self.points))
+
+    def test_nearby_and_coordinates(self):
+        index = spatial.PincodeGridIndex(self.points)
+        self.assertEqual(len(index), len(self.points))
+        self.assertEqual(index.nearby('560001', 10), ['560001'])
+        self.assertEqual(index.nearby('700001', 1)[:2], ['700001', '700002'])
+        self.assertIsNone(index.nearby('999999', 10))
+        lat, lng = index.coordinates('110001')
+        self.assertAlmostEqual(lat, 28.6139)
+        self.assertAlmostEqual(lng, 77.2090)
+        self.assertEqual(spatial.PincodeGridIndex([]).query(13.0, 80.0, 50), [])
+
+
+class ProcessIndexTests(TestCase):
+
+    def setUp(self):
+        spatial.invalidate_index()
+        self.addCleanup(spatial.invalidate_index)
+        Pincode.objects.create(code='600001', city='Chennai', state='Tamil Nadu', latitude=13.0827, longitude=80.2707)
+
+    def test_built_once_and_rebuilt_after_edits(self):
+        index = spatial.get_index()
+        with self.assertNumQueries(0):
+            self.assertIs(spatial.get_index(), index)
+
+        # post_save drops the index; the next lookup sees the new row
+        Pincode.objects.create(code='600020', city='Chennai', state='Tamil Nadu', latitude=13.0067, longitude=80.2573)
+        self.assertEqual(spatial.get_index().nearby('600001', 10), ['600001', '600020'])
+
+    def test_bulk_loads_rebuild_through_the_signal(self):
+        spatial.get_index()
+        Pincode.objects.bulk_create([
+            Pincode(code='600020', city='Chennai', state='Tamil Nadu', latitude=13.0067, longitude=80.2573),
+        ])
+        spatial.pincodes_updated.send(sender=Pincode, codes=['600020'])
+        with self.assertNumQueries(0):
+            self.assertEqual(spatial.get_index().coordinates('600020'), (13.0067, 80.2573))
+
+    def test_get_nearby_pincodes_without_precomputed_pairs(self):
+        Pincode.objects.create(code='560001', city='Bengaluru', state='Karnataka', latitude=12.9716, longitude=77.5946)
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 10), ['600001'])
+        self.assertEqual(Pincode.get_nearby_pincodes('600001', 300), ['600001', '560001'])
+        self.assertEqual(Pincode.get_nearby_pincodes('999999', 10), ['999999'])
@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.templatetags.static import static
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from gowheels import static_assets
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'gowheels.static_assets.CompressedManifestStaticFilesStorage'},
+}
+
+STYLESHEET = 'body { background: url("../img/logo.png"); }\n' + '.card { margin: 0 auto; padding: 1rem; }\n' * 50
+
+
+class StaticAssetTests(SimpleTestCase):
+
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        for name, data in (('css/site.css', STYLESHEET.encode()), ('img/logo.png', b'\x89PNG not compressible')):
+            path = os.path.join(self.source, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as handle:
+                handle.write(data)
+        override = override_settings(
+            STATIC_URL='/static/', STATIC_ROOT=self.root, STATICFILES_DIRS=[self.source], STORAGES=STORAGES,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def collect(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(self.root, 'staticfiles.json')) as handle:
+            return json.load(handle)['paths']
+
+    def get(self, path, **headers):
+        middleware = static_assets.StaticFilesMiddleware(lambda request: HttpResponse('app', status=404))
+        return middleware(RequestFactory().get(path, **headers))
+
+    def test_collect_hashes_and_precompresses(self):
+        paths = self.collect()
+        hashed = paths['css/site.css']
+        self.assertRegex(hashed, r'^css/site\.[0-9a-f]{12}\.css$')
+        self.assertEqual(static('css/site.css'), f'/static/{hashed}')
+
+        with open(os.path.join(self.root, hashed), encoding='utf-8') as handle:
+            self.assertIn(paths['img/logo.png'].split('/')[-1], handle.read())
+        with gzip.open(os.path.join(self.root, hashed + '.gz')) as handle:
+            self.assertIn(b'.card', handle.read())
+        if static_assets.brotli is not None:
+            self.assertTrue(os.path.exists(os.path.join(self.root, hashed + '.br')))
+        # Too small and already compressed: no copies
+        self.assertFalse(os.path.exists(os.path.join(self.root, paths['img/logo.png'] + '.gz')))
+
+    def test_serves_precompressed_with_far_future_caching(self):
+        hashed = self.collect()['css/site.css']
+        with open(os.path.join(self.root, hashed), 'rb') as handle:
+            collected = handle.read()
+
+        response = self.get(f'/static/{hashed}', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Cache-Control'], static_assets.IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertTrue(response['Content-Type'].startswith('text/css'))
+        self.assertNotIn('Content-Disposition', response)
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), collected)
+
+        plain = self.get(f'/static/{hashed}', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(b''.join(plain.streaming_content), collected)
+        self.assertNotEqual(plain['ETag'], response['ETag'])
+
+        if static_assets.brotli is not None:
+            self.assertEqual(self.get(f'/static/{hashed}', HTTP_ACCEPT_ENCODING='gzip, br')['Content-Encoding'], 'br')
+
+        cached = self.get(f'/static/{hashed}', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        # Unhashed names can change in place
+        self.assertEqual(self.get('/static/css/site.css')['Cache-Control'], static_assets.DEFAULT_CACHE_CONTROL)
+
+    def test_unknown_paths_fall_through(self):
+        self.collect()
+        self.assertEqual(self.get('/static/css/missing.css').content, b'app')
+        self.assertEqual(self.get('/static/../settings.py').content, b'app')
+        self.assertEqual(self.get('/vehicles/').content, b'app')
+
+    def test_uncollected_names_are_linked_unhashed(self):
+        self.assertEqual(static('css/site.css'), '/static/css/site.css')
@@ -0,0 +1,52 @@
+import io
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from gowheels.models import Chat, Message, Pincode, Vehicle, VehicleListing, VehicleSearchToken, Wishlist
+from gowheels.synthetic import METROS, PINCODES_PER_CITY, DatasetGenerator
+
+
+def snapshot():
+    return list(Vehicle.objects.order_by('pk').values_list(
+        'brand_name', 'model_name', 'pincode', 'price', 'approval_status', 'seller_phone',
+    ))
+
+
+class DatasetGeneratorTests(TestCase):
+
+    def test_generates_consistent_dataset(self):
+        counts = DatasetGenerator(vehicles=300, seed=7, batch_size=64).run()
+
+        self.assertEqual(Vehicle.objects.count(), 300)
+        self.assertEqual(Pincode.objects.count(), len(METROS) * PINCODES_PER_CITY)
+        self.assertEqual(counts['chats'], Chat.objects.count())
+        self.assertEqual(counts['messages'], Message.objects.count())
+        self.assertEqual(counts['wishlists'], Wishlist.objects.count())
+        self.assertFalse(Vehicle.objects.filter(latitude__isnull=True).exists())
+        self.assertFalse(Vehicle.objects.exclude(brand_key__gt='').exists())
+        # bulk_create skips signals, so derived tables are rebuilt at the end
+        listed = Vehicle.objects.filter(approval_status='approved', available=True).count()
+        self.assertEqual(VehicleListing.objects.count(), listed)
+        self.assertTrue(VehicleSearchToken.objects.exists())
+
+    def test_same_seed_same_data(self):
+        DatasetGenerator(vehicles=100, seed=3, batch_size=40).run(rebuild=False)
+        first = snapshot()
+        Vehicle.objects.all().delete()
+        DatasetGenerator(vehicles=100, seed=3, batch_size=40).run(rebuild=False)
+        self.assertEqual(snapshot(), first)
+
+    def test_command_needs_debug_or_force(self):
+        with self.assertRaisesMessage(CommandError, 'pass --force'):
+            call_command('generate_dataset', vehicles=10, stdout=io.StringIO())
+        self.assertFalse(Vehicle.objects.exists())
+
+        out = io.StringIO()
+        call_command('generate_dataset', vehicles=10, force=True, skip_rebuild=True, stdout=out)
+        self.assertIn('Writing synthetic data to sqlite database', out.getvalue())
+        self.assertEqual(Vehicle.objects.count(), 10)
+
+        with self.settings(DEBUG=True):
+            call_command('generate_dataset', vehicles=10, skip_rebuild=True, stdout=io.StringIO())
+        self.assertEqual(Vehicle.objects.count(), 20)